@@ -0,0 +1,95 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Ranking and grouping helpers for the report sections. Top-N picks use partial
+# selection (nlargest / np.argpartition, O(n) per group) rather than sorting the
+# whole frame, and rendering builds the Markdown/CSV lines column-wise instead
+# of walking rows with iterrows. Amounts are written '1,234.56', or '1.234,56'
+# with locale='tr'.
+
+# 'Ocak      - 2025' style monthly columns in the ERP sales/purchase reports
+MONTH_COLUMN = re.compile(r'^\s*(\S+)\s*-\s*(\d{4})\s*$')
+MONTHS = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran', 'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+# locale -> (thousands separator, decimal mark)
+LOCALES = {
+    'en': (',', '.'),
+    'tr': ('.', ','),
+}
+
+
+def top_n(df, value_col, n=None):
+    # n=None ranks the whole frame (a full listing needs the full sort anyway)
+    if n is None or n >= len(df):
+        return df.sort_values(value_col, ascending=False)
+    return df.nlargest(n, value_col)
+
+def grouped_top_n(df, by, value_col, n):
+    # Largest n rows per group, groups in order of first appearance and rows
+    # largest first within each group. Rows without a value are never picked.
+    df = df[df[value_col].notna()]
+    if df.empty:
+        return df
+    values = df[value_col].to_numpy(dtype='float64')
+    picked = []
+    for idx in df.groupby(by, sort=False, observed=True).indices.values():
+        if len(idx) > n:
+            idx = idx[np.argpartition(-values[idx], n - 1)[:n]]
+        picked.append(idx[np.argsort(-values[idx], kind='stable')])
+    return df.iloc[np.concatenate(picked)]
+
+def grouped_sum(df, by, value_cols):
+    by = [by] if isinstance(by, str) else list(by)
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+    return df.groupby(by, sort=False, observed=True, dropna=False)[value_cols].sum().reset_index()
+
+def month_columns(df):
+    # {column: (month number, year)} for the monthly columns present in df
+    found = {}
+    for col in df.columns:
+        m = MONTH_COLUMN.match(str(col))
+        if m and m.group(1) in MONTHS:
+            found[col] = (MONTHS.index(m.group(1)) + 1, int(m.group(2)))
+    return found
+
+def by_month(df, id_cols, value_name='amount'):
+    # Wide monthly report -> long (id..., month, amount) rows, month as 'YYYY-MM'
+    id_cols = [id_cols] if isinstance(id_cols, str) else list(id_cols)
+    months = month_columns(df)
+    long = df.melt(id_vars=id_cols, value_vars=list(months), var_name='month', value_name=value_name)
+    long['month'] = long['month'].map({col: f"{year}-{month:02d}" for col, (month, year) in months.items()})
+    long[value_name] = pd.to_numeric(long[value_name], errors='coerce')
+    return long[long[value_name].fillna(0) != 0].reset_index(drop=True)
+
+def format_amounts(values, decimals=2, locale='en'):
+    # '{:,.2f}' text for a column, marks swapped per locale: an object array,
+    # '' for missing values
+    thousands, decimal = LOCALES[locale]
+    text = pd.to_numeric(pd.Series(values), errors='coerce').map(f"{{:,.{decimals}f}}".format, na_action='ignore')
+    if locale != 'en':
+        text = text.str.translate(str.maketrans(',.', thousands + decimal))
+    return text.fillna('').to_numpy(dtype=object)
+
+def markdown_list(df, label_col, value_col, indent='  ', locale='en'):
+    if df.empty:
+        return []
+    lines = indent + '- ' + df[label_col].astype(str) + ': ' + format_amounts(df[value_col], locale=locale)
+    return lines.tolist()
+
+def markdown_table(df, columns, headers=None, amount_cols=(), locale='en'):
+    headers = headers or columns
+    lines = ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(columns)]
+    if df.empty:
+        return lines
+    cells = [
+        format_amounts(df[col], locale=locale) if col in amount_cols else df[col].astype(str).to_numpy()
+        for col in columns
+    ]
+    body = pd.Series(cells[0], dtype=object)
+    for col in cells[1:]:
+        body = body + ' | ' + col
+    return lines + ('| ' + body + ' |').tolist()
+
+def to_csv(df, path, columns=None):
+    df.to_csv(path, columns=columns, index=False, encoding='utf-8-sig')
@@ -0,0 +1,108 @@
+import pandas as pd
+
+# Vectorized parser for Turkish-formatted amounts ("1.234,56", "1.234,56 TL",
+# "(1.234,56)", "1.234,56-"). String columns are parsed with pyarrow.compute
+# kernels when pyarrow is installed and with pandas string methods otherwise;
+# neither path makes a Python call per cell.
+#
+# Separator rules, applied per value:
+#   - comma and dot both present: whichever comes last is the decimal mark
+#   - only commas: the comma is the decimal mark
+#   - only dots: grouped as thousands when it looks like "1.234" / "12.345.678",
+#     otherwise it is a plain float string such as "1234.56" or "0.500" and
+#     left alone
+#
+# Sign: a leading or trailing minus or enclosing parentheses make the value
+# negative, once ("-(5)" is -5 like "(5)"). Both paths follow the same steps,
+# so they give the same result for every input.
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Everything that is not part of the number: whitespace, TL/TRY/₺/USD/EUR, ...
+NOISE = r'[^\d,.()+\-]'
+LEADING_MARKS = '(+-'
+TRAILING_MARKS = ')-'
+DOT_THOUSANDS = r'^[1-9]\d{0,2}(?:\.\d{3})+$'
+DECIMAL_COMMA = r',[^.]*$'
+DOT_AFTER_COMMA = r'\.[^,]*$'
+PLAIN_NUMBER = r'^-?(?:\d+\.?\d*|\.\d+)$'
+
+
+def _parse_arrow(series):
+    arr = pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    arr = pc.replace_substring_regex(arr, NOISE, '')
+
+    negative = pc.or_(
+        pc.or_(pc.starts_with(arr, '-'), pc.ends_with(arr, '-')),
+        pc.and_(pc.starts_with(arr, '('), pc.ends_with(arr, ')')),
+    )
+    # Plain trims are much cheaper than regex replaces; they also catch "(5-)"
+    arr = pc.utf8_ltrim(pc.utf8_rtrim(arr, characters=TRAILING_MARKS), characters=LEADING_MARKS)
+
+    # Arrow has no rfind, so look for the separators in the reversed string:
+    # the one found first there is the one that comes last in the value
+    reversed_arr = pc.utf8_reverse(arr)
+    comma_from_end = pc.find_substring(reversed_arr, ',')
+    dot_from_end = pc.find_substring(reversed_arr, '.')
+    has_comma = pc.greater_equal(comma_from_end, 0)
+    comma_is_last = pc.or_(pc.less(dot_from_end, 0), pc.less(comma_from_end, dot_from_end))
+    decimal_comma = pc.and_(has_comma, comma_is_last)
+    grouped_dot_comma = pc.and_(has_comma, pc.invert(comma_is_last))
+    dot_thousands = pc.and_(pc.invert(has_comma), pc.match_substring_regex(arr, DOT_THOUSANDS))
+
+    arr = pc.if_else(decimal_comma, pc.replace_substring(pc.replace_substring(arr, '.', ''), ',', '.'), arr)
+    arr = pc.if_else(grouped_dot_comma, pc.replace_substring(arr, ',', ''), arr)
+    arr = pc.if_else(dot_thousands, pc.replace_substring(arr, '.', ''), arr)
+
+    # Arrow's cast refuses bad input instead of coercing, so null it out first
+    arr = pc.if_else(pc.match_substring_regex(arr, PLAIN_NUMBER), arr, pa.scalar(None, pa.string()))
+    values = pc.cast(arr, pa.float64())
+    values = pc.if_else(pc.fill_null(negative, False), pc.negate(values), values)
+    return pd.Series(values.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+
+def _parse_pandas(series):
+    s = series.astype('string')
+    s = s.str.replace(NOISE, '', regex=True)
+
+    negative = (s.str.startswith('-') | s.str.endswith('-') | (s.str.startswith('(') & s.str.endswith(')'))).fillna(False)
+    s = s.str.rstrip(TRAILING_MARKS).str.lstrip(LEADING_MARKS)
+
+    has_comma = s.str.contains(',', regex=False).fillna(False)
+    decimal_comma = s.str.contains(DECIMAL_COMMA).fillna(False)
+    grouped_dot_comma = has_comma & s.str.contains(DOT_AFTER_COMMA).fillna(False)
+    dot_thousands = ~has_comma & s.str.contains(DOT_THOUSANDS).fillna(False)
+
+    s = s.mask(decimal_comma, s.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    s = s.mask(grouped_dot_comma, s.str.replace(',', '', regex=False))
+    s = s.mask(dot_thousands, s.str.replace('.', '', regex=False))
+
+    # The same gate as the arrow path's cast
+    s = s.where(s.str.match(PLAIN_NUMBER).fillna(False))
+    values = pd.to_numeric(s, errors='coerce').astype('float64')
+    return values.mask(negative, -values)
+
+def _parse_strings(series):
+    return _parse_arrow(series) if HAS_ARROW else _parse_pandas(series)
+
+def parse_amounts(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    if kind in ('integer', 'floating', 'mixed-integer-float', 'decimal', 'empty'):
+        return pd.to_numeric(series, errors='coerce').astype('float64')
+    if kind == 'string':
+        return _parse_strings(series)
+
+    # Mixed object column (read_html hands back ints next to "1.234,56"):
+    # real numbers pass through untouched, only the strings get parsed
+    is_str = series.map(type).eq(str)
+    result = pd.to_numeric(series.where(~is_str), errors='coerce').astype('float64')
+    if is_str.any():
+        result[is_str] = _parse_strings(series[is_str])
+    return result
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+import frame_cache
+import readers
+
+# Learned bank statement layouts. The first time a bank's export is seen we scan
+# the preamble for the header row and work out which columns hold the date,
+# amount, description and balance. That profile is saved, and later reads pass
+# header=/usecols= straight to the reader and only check that the header cells
+# still match; a different header is a new layout and triggers re-detection.
+
+HEADER_SCAN_ROWS = 15
+PROFILES_FILE = 'bank_profiles.json'
+
+
+def detect_header(df):
+    # Bank exports put a preamble above the real header; look for the row that
+    # names the amount columns
+    for i in range(min(HEADER_SCAN_ROWS, len(df))):
+        row_values = df.iloc[i].astype(str).str.lower().str.strip().tolist()
+        if any('tutar' in v for v in row_values) or (any('borç' in v for v in row_values) and any('alacak' in v for v in row_values)):
+            return i, row_values
+    return None, None
+
+def pick_columns(columns):
+    columns = [str(c).lower().strip() for c in columns]
+    return {
+        'date': next((c for c in columns if 'tarih' in c), None),
+        'description': next((c for c in columns if 'açıklama' in c), None),
+        'balance': next((c for c in columns if 'bakiye' in c), None),
+        'amount': next((c for c in columns if 'tutar' in c), None),
+        'debit': next((c for c in columns if 'borç' in c and 'alacak' not in c and '/' not in c), None), # Strict Borç
+        'credit': next((c for c in columns if 'alacak' in c and 'borç' not in c and '/' not in c), None), # Strict Alacak
+    }
+
+def profiles_path(data_dir):
+    return os.path.join(frame_cache.cache_dir(data_dir), PROFILES_FILE)
+
+def load_profiles(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_profiles(path, profiles):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+def profile_key(bank, fmt):
+    return f"{bank}:{fmt}"
+
+def _raw_rows(df):
+    # read_html promotes <th> rows to column labels; put them back as row 0 so
+    # row offsets mean the same thing for every format
+    if list(df.columns) == list(range(df.shape[1])):
+        return df
+    header = pd.DataFrame([list(df.columns)], columns=range(df.shape[1]))
+    return pd.concat([header, df.set_axis(range(df.shape[1]), axis=1)], ignore_index=True)
+
+def build_profile(bank, fmt, header_row, header_cells):
+    roles = pick_columns(header_cells)
+    usecols = sorted({header_cells.index(name) for name in roles.values() if name is not None})
+    return {
+        'bank': bank,
+        'format': fmt,
+        'fingerprint': hashlib.sha1(json.dumps([bank, fmt, header_row, header_cells]).encode('utf-8')).hexdigest()[:16],
+        'header_row': header_row,
+        'usecols': usecols,
+        'names': [header_cells[i] for i in usecols],
+    }
+
+def _apply_to_raw(raw, profile):
+    df = raw.iloc[profile['header_row'] + 1:, profile['usecols']].reset_index(drop=True)
+    df.columns = profile['names']
+    return df
+
+def _read_projected(path, profile):
+    frames, info = readers.read_table(path, header=profile['header_row'], usecols=profile['usecols'])
+    df = frames[0]
+    names = [str(c).lower().strip() for c in df.columns]
+    if names != profile['names']:
+        return None, info
+    df.columns = names
+    return df, info
+
+def read_statement(path, bank, profile=None):
+    # Returns (df, profile, info, redetected). df carries only the profiled
+    # columns, already named by their lowercased header cells.
+    fmt = readers.sniff_format(path)
+
+    if profile and profile['format'] == fmt:
+        if fmt in (readers.XLSX, readers.XLS):
+            df, info = _read_projected(path, profile)
+            if df is not None:
+                return df, profile, info, False
+        else:
+            # HTML has no header=/usecols= worth using; check the header row in place
+            frames, info = readers.read_table(path, header=None)
+            raw = _raw_rows(frames[0])
+            row = profile['header_row']
+            if len(raw) > row:
+                cells = raw.iloc[row].astype(str).str.lower().str.strip().tolist()
+                if [cells[i] for i in profile['usecols'] if i < len(cells)] == profile['names']:
+                    return _apply_to_raw(raw, profile), profile, info, False
+
+    frames, info = readers.read_table(path, header=None)
+    raw = _raw_rows(frames[0])
+    header_row, header_cells = detect_header(raw)
+    if header_row is None:
+        return None, None, info, True
+    profile = build_profile(bank, fmt, header_row, header_cells)
+    return _apply_to_raw(raw, profile), profile, info, True
@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import amounts
+
+# Throughput of amounts.parse_amounts against the old per-cell to_float on a
+# synthetic statement column of Turkish-formatted amounts.
+
+def make_column(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 50_000, rows).round(2)
+    # 1234567.89 -> "1.234.567,89", the way the bank exports write it
+    text = pd.Series(values).abs().map('{:,.2f}'.format).str.translate(str.maketrans(',.', '.,'))
+    styles = rng.integers(0, 4, rows)
+    negative = values < 0
+    text = text.mask(negative & (styles == 0), '-' + text)
+    text = text.mask(negative & (styles == 1), text + '-')
+    text = text.mask(negative & (styles == 2), '(' + text + ')')
+    text = text.mask(negative & (styles == 3), '-' + text + ' TL')
+    return text, values
+
+def legacy_to_float(series):
+    return series.astype(str).str.replace('.', '').str.replace(',', '.').apply(pd.to_numeric, errors='coerce')
+
+def bench(label, fn, column, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(column)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<14} {best:8.3f}s  {len(column) / best / 1e6:8.2f} M rows/s")
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-legacy', action='store_true', help="The old parser takes minutes at 10M rows")
+    args = parser.parse_args()
+
+    column, expected = make_column(args.rows)
+    print(f"Rows: {args.rows:,}  arrow kernels: {amounts.HAS_ARROW}")
+
+    parsed = amounts.parse_amounts(column)
+    mismatches = int((~np.isclose(parsed.to_numpy(), expected)).sum())
+    print(f"Mismatches vs generated values: {mismatches}")
+
+    new = bench('parse_amounts', amounts.parse_amounts, column, args.repeat)
+    if not args.skip_legacy:
+        old = bench('legacy', legacy_to_float, column, args.repeat)
+        print(f"Speedup: {old / new:.1f}x")
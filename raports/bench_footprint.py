@@ -0,0 +1,71 @@
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pandas as pd
+
+import config
+import ingest
+import ledger
+import schema
+
+# Memory footprint of the bank transactions at each step: the statement frames
+# as parsed (object columns plus a repeated Source string), the ledger rows in
+# pandas' default dtypes, and the same rows in the compact schema (schema.py).
+# Runs on DATA_DIR, or with --rows on synthetic statements of that size. The
+# ledger is built in memory, so the real bank_ledger.db is never touched.
+
+def synthetic_dir(rows, seed):
+    import synthetic
+
+    data_dir = tempfile.mkdtemp(prefix='raports_footprint_')
+    synthetic.kuveyt_statement(os.path.join(data_dir, 'Kuveyt Hesap Hareketleri (synthetic).xls'), rows, seed)
+    synthetic.ziraat_statement(os.path.join(data_dir, 'Ziraat Hesap_Hareketleri_synthetic.xlsx'), rows, seed)
+    synthetic.akbank_statement(os.path.join(data_dir, 'Akbank HesapHareketleri_synthetic.xlsx'), rows, seed)
+    return data_dir
+
+def measure(data_dir, workers):
+    jobs = ingest.bank_jobs(data_dir)
+    results = ingest.run(jobs, workers=workers)
+    ingest.print_errors(results)
+    parsed = pd.concat([df.assign(Source=r['source']) for r in results for df in r['frames']], ignore_index=True)
+
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(ledger.SCHEMA)
+    ledger.sync(conn, jobs, workers=workers)
+    plain = pd.read_sql_query("SELECT bank, date, amount_kurus, description, balance_kurus, file FROM transactions ORDER BY date, bank", conn)
+    plain['amount'] = plain['amount_kurus'] / 100
+    compact = ledger.transactions(conn)
+    conn.close()
+
+    print(f"{len(jobs)} statement files, {len(parsed):,} parsed rows, {len(compact):,} ledger rows, arrow strings: {schema.HAS_ARROW}\n")
+    table = schema.footprint_table([
+        ('parsed statements', parsed),
+        ('ledger, default dtypes', plain),
+        ('ledger, compact schema', compact),
+    ])
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    print("\nPer column, default dtypes -> compact schema:")
+    print(schema.column_table(plain, compact).to_string(float_format=lambda v: f"{v:,.3f}", na_rep='-'))
+
+    # What the kuruş integers buy: float totals drift once sums get large
+    exact = int(compact['amount_kurus'].sum())
+    drift = plain['amount'].sum() * 100 - exact
+    print(f"\nTotal: {exact / 100:,.2f} TL exact from kuruş, float sum off by {drift:+.4f} kuruş")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data-dir', default=config.DATA_DIR)
+    parser.add_argument('--rows', type=int, default=None, help="Measure synthetic statements with this many rows per bank instead")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    data_dir = synthetic_dir(args.rows, args.seed) if args.rows else args.data_dir
+    try:
+        measure(data_dir, args.workers)
+    finally:
+        if args.rows:
+            shutil.rmtree(data_dir, ignore_errors=True)
@@ -0,0 +1,85 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import frame_cache
+import report_specs
+
+# Full versus column-projected loads. Runs over a synthetic sales report as wide
+# as the ERP export (code, name, currency, twelve months, totals) and, with
+# --data-dir, over the real report files. The frame cache is switched off so
+# every read is a real parse.
+
+MONTHS = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran', 'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+
+def make_sales_report(path, rows, extra_columns=0, seed=42):
+    rng = np.random.default_rng(seed)
+    data = {
+        'Cari hesap kodu': [f"120.{i:05d}" for i in range(rows)],
+        'Cari hesap adı': [f"MÜŞTERİ {i} LTD. ŞTİ." for i in range(rows)],
+        'Döviz': 'TL',
+    }
+    for month in MONTHS:
+        data[f"{month:<10}- 2025"] = rng.uniform(0, 100_000, rows).round(2)
+    for i in range(extra_columns):
+        data[f"Ek kolon {i}"] = rng.uniform(0, 1_000, rows).round(2)
+    data['2025 maliyılı sonrası'] = 0.0
+    df = pd.DataFrame(data)
+    df['Ciro'] = df[[f"{m:<10}- 2025" for m in MONTHS]].sum(axis=1)
+    df.to_excel(path, index=False)
+    return df.shape
+
+def measure(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, df.shape[1], df.memory_usage(deep=True).sum()
+
+def compare(label, full, projected, repeat):
+    f_sec, f_cols, f_mem = measure(full, repeat)
+    p_sec, p_cols, p_mem = measure(projected, repeat)
+    print(f"{label:<32} full {f_sec:7.3f}s {f_cols:3d} cols {f_mem / 1e6:8.2f} MB | "
+          f"projected {p_sec:7.3f}s {p_cols:3d} cols {p_mem / 1e6:8.2f} MB | "
+          f"{f_sec / p_sec:4.1f}x time, {f_mem / max(p_mem, 1):4.1f}x memory")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--extra-columns', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--data-dir', help="Also compare the real report files in this directory")
+    args = parser.parse_args()
+
+    frame_cache.ENABLED = False
+    spec = report_specs.REPORT_SPECS['Sales']
+    columns = report_specs.spec_columns(spec)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic_sales.xlsx')
+        shape = make_sales_report(path, args.rows, args.extra_columns)
+        print(f"Synthetic sales report: {shape[0]:,} rows x {shape[1]} columns")
+        compare(
+            'synthetic Sales',
+            lambda: pd.read_excel(path),
+            lambda: report_specs.project(report_specs._read_xlsx_columns(path, sorted(columns)), spec),
+            args.repeat,
+        )
+
+    if args.data_dir:
+        for name, spec in report_specs.REPORT_SPECS.items():
+            if spec.get('stream'):
+                continue
+            try:
+                compare(
+                    name,
+                    lambda: report_specs.load_report(name, args.data_dir, projected=False),
+                    lambda: report_specs.load_report(name, args.data_dir),
+                    args.repeat,
+                )
+            except Exception as e: print(f"Error loading {name}: {e}")
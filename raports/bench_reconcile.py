@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import reconcile
+
+# reconcile.reconcile on synthetic data: payments to a pool of counterparties,
+# and bank lines that are those payments shifted by a few days with the payee
+# name in the description, plus noise lines that match nothing.
+
+NAMES = ['FKT KOLTUK', 'KAWELCO METAL', 'EMPO OTOMOTİV', 'YAVUZ TİCARİ ARAÇ', 'BURSA LAZER', 'ALAN KALIP', 'C PRES METAL', 'ANLAŞ KALIP']
+
+def make_data(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"{n} {i} SANAYİ VE TİCARET LİMİTED ŞİRKETİ" for i in range(rows // 50 + 1) for n in NAMES])
+    payee = names[rng.integers(0, len(names), rows)]
+    dates = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    # Round amounts repeat a lot, which is what makes name matching necessary
+    amount = np.where(rng.random(rows) < 0.3, rng.integers(1, 200, rows) * 1000.0, rng.uniform(100, 500_000, rows).round(2))
+    payments = pd.DataFrame({
+        'payment_id': [f"p{i}" for i in range(rows)],
+        'invoice_id': [f"i{i}" for i in range(rows)],
+        'invoice_type': 'SALES',
+        'counterparty': payee,
+        'amount': amount,
+        'date': dates,
+    })
+    payments['amount_kurus'] = (payments['amount'] * 100).round().astype('Int64')
+
+    real = rng.random(rows) < 0.8
+    bank = pd.DataFrame({
+        'bank': 'Akbank',
+        'date': dates + pd.to_timedelta(rng.integers(-2, 3, rows), unit='D'),
+        'amount': np.where(real, amount, rng.uniform(100, 500_000, rows).round(2)),
+        'description': np.where(real, 'EFT ' + payee + ' FATURA ÖDEMESİ', 'POS TAHSİLAT'),
+    })
+    bank['amount_kurus'] = (bank['amount'] * 100).round().astype('int64')
+    return bank, payments
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000, help="Bank lines and payments each")
+    args = parser.parse_args()
+
+    bank, payments = make_data(args.rows)
+    start = time.perf_counter()
+    lines, unmatched_payments = reconcile.reconcile(bank, payments)
+    seconds = time.perf_counter() - start
+
+    print(f"{args.rows:,} bank lines x {args.rows:,} payments in {seconds:.2f}s")
+    print(lines['status'].value_counts().to_string())
+    print(f"Unmatched payments: {len(unmatched_payments):,}")
@@ -0,0 +1,75 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import aggregate
+import report_writer
+
+# Writing a large listing: the old way (every Markdown line built in a list,
+# joined and written at once, one file per format) against report_writer
+# streaming chunks to Markdown, CSV, XLSX and Parquet in one pass. Reports
+# wall time and the peak Python allocation (tracemalloc) of each.
+
+def make_listing(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'item': 'STK-' + pd.Series(rng.integers(0, rows // 10 + 1, rows)).astype(str),
+        'warehouse': rng.choice(['Ana Depo', 'Sevkiyat', 'Hurda'], rows),
+        'quantity': rng.normal(100, 400, rows).round(2),
+        'value': rng.normal(0, 250_000, rows).round(2),
+    })
+
+def legacy(df, directory, formats):
+    lines = ["# Listing", ""]
+    lines.extend(aggregate.markdown_table(df, list(df.columns), amount_cols=['quantity', 'value']))
+    with open(os.path.join(directory, 'legacy.md'), 'w') as f:
+        f.write("\n".join(lines))
+    if 'csv' in formats:
+        aggregate.to_csv(df, os.path.join(directory, 'legacy.csv'))
+    if 'xlsx' in formats:
+        df.to_excel(os.path.join(directory, 'legacy.xlsx'), index=False)
+    if 'parquet' in formats:
+        df.to_parquet(os.path.join(directory, 'legacy.parquet'))
+
+def streamed(df, directory, formats, chunk_rows):
+    paths = [os.path.join(directory, f"streamed.{fmt}") for fmt in formats]
+    return report_writer.write(report_writer.chunks_of(df, chunk_rows), paths, list(df.columns),
+                               amount_cols=['quantity', 'value'], preamble=["# Listing", ""])
+
+def measure(label, fn):
+    # Timed on its own run; tracemalloc slows allocation-heavy code down a lot
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:8.2f}s  peak {peak:8.1f} MB")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--chunk-rows', type=int, default=report_writer.CHUNK_ROWS)
+    parser.add_argument('--formats', nargs='+', default=['md', 'csv', 'parquet'], help="xlsx is slow at this size either way")
+    args = parser.parse_args()
+
+    df = make_listing(args.rows)
+    directory = tempfile.mkdtemp(prefix='raports_writer_')
+    try:
+        print(f"Rows: {args.rows:,}  formats: {', '.join(args.formats)}  chunk: {args.chunk_rows:,} rows\n")
+        measure('legacy', lambda: legacy(df, directory, args.formats))
+        seconds = measure('streamed', lambda: streamed(df, directory, args.formats, args.chunk_rows))
+        for path, s in seconds.items():
+            print(f"  {os.path.basename(path):<18} {s:6.2f}s")
+        with open(os.path.join(directory, 'legacy.md')) as a, open(os.path.join(directory, 'streamed.md')) as b:
+            print(f"\nMarkdown identical: {a.read() == b.read()}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,165 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# End-to-end benchmark of analyze_finance on synthetic data. For each row
+# count a dataset is generated (synthetic.py) and the pipeline runs in a fresh
+# interpreter, once cold (no cache, ledger or snapshots) and then warm, timing
+# every stage and how far it raises peak memory. Results go to a JSON file per
+# commit so two commits can be compared with --compare.
+
+STAGES = ['load_bank_data', 'load_report_data', 'analyze_cash_flow', 'generate_report']
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_pipeline(workers, trace_memory=False):
+    # Runs inside the child interpreter; RAPORTS_DATA_DIR is already set
+    import contextlib
+    import io
+    import tracemalloc
+
+    import analyze_finance
+    import tracing
+
+    stages = {}
+    state = {}
+    steps = {
+        'load_bank_data': lambda: state.update(conn=analyze_finance.load_bank_data(workers=workers)),
+        'load_report_data': lambda: state.update(reports=analyze_finance.load_report_data(workers=workers)),
+        'analyze_cash_flow': lambda: state.update(summary=analyze_finance.analyze_cash_flow(state['conn'])),
+        'generate_report': lambda: analyze_finance.generate_report(state['reports'], state['summary']),
+    }
+    if trace_memory:
+        tracemalloc.start()
+    for name in STAGES:
+        if trace_memory:
+            tracemalloc.reset_peak()
+        rss_start = tracing.peak_rss_mb(), tracing.peak_rss_mb(resource.RUSAGE_CHILDREN)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            steps[name]()
+        stages[name] = {
+            'seconds': time.perf_counter() - start,
+            # Growth of the peak over the stage; the peak itself only ever
+            # rises, so it would charge each stage for the ones before it
+            'rss_growth_mb': tracing.peak_rss_mb() - rss_start[0],
+            'children_rss_growth_mb': tracing.peak_rss_mb(resource.RUSAGE_CHILDREN) - rss_start[1],
+        }
+        if trace_memory:
+            stages[name]['python_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+    return stages
+
+def run_child(data_dir, workers, trace_memory):
+    env = dict(os.environ, RAPORTS_DATA_DIR=data_dir)
+    with tempfile.NamedTemporaryFile('r', suffix='.json', delete=False) as out:
+        cmd = [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', out.name, '--workers', str(workers)]
+        if trace_memory:
+            cmd.append('--trace-memory')
+        proc = subprocess.run(cmd, env=env, cwd=HERE, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"pipeline failed:\n{proc.stderr[-2000:]}")
+        stages = json.load(out)
+    os.remove(out.name)
+    return stages
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def environment():
+    import numpy
+    import pandas
+    return {
+        'python': platform.python_version(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def benchmark(sizes, workers, passes, seed, work_dir, trace_memory):
+    import synthetic
+
+    runs = []
+    for rows in sizes:
+        data_dir = os.path.join(work_dir, f"rows_{rows}")
+        shutil.rmtree(data_dir, ignore_errors=True)
+        start = time.perf_counter()
+        synthetic.generate_dataset(data_dir, rows, seed)
+        generate_seconds = time.perf_counter() - start
+        print(f"{rows:>10,} rows: data generated in {generate_seconds:.1f}s")
+
+        for n in range(passes):
+            stages = run_child(data_dir, workers, trace_memory)
+            total = sum(s['seconds'] for s in stages.values())
+            label = 'cold' if n == 0 else f"warm{n}"
+            runs.append({'rows': rows, 'pass': label, 'generate_seconds': generate_seconds, 'total_seconds': total, 'stages': stages})
+            print(f"{'':>12}{label:<6} total {total:8.2f}s  " + "  ".join(
+                f"{name} {s['seconds']:.2f}s/+{s['rss_growth_mb']:.0f}MB" for name, s in stages.items()))
+    return runs
+
+def compare(base, current):
+    # Per (rows, pass, stage) timing ratio current / base
+    def index(results):
+        return {(r['rows'], r['pass'], stage): s['seconds'] for r in results['runs'] for stage, s in r['stages'].items()}
+    old, new = index(base), index(current)
+    print(f"\nCompared with {base['commit'][:10]} ({base['date']}):")
+    print(f"{'rows':>10} {'pass':<6} {'stage':<18} {'base':>9} {'now':>9} {'ratio':>7}")
+    for key in sorted(set(old) & set(new)):
+        ratio = new[key] / old[key] if old[key] else float('inf')
+        flag = '  slower' if ratio > 1.10 else ('  faster' if ratio < 0.90 else '')
+        print(f"{key[0]:>10,} {key[1]:<6} {key[2]:<18} {old[key]:9.3f} {new[key]:9.3f} {ratio:7.2f}{flag}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000], help="Rows per bank statement and stock ledger (1k to 10M)")
+    parser.add_argument('--workers', type=int, default=1, help="Parallel parsers inside the pipeline (1 keeps timings comparable)")
+    parser.add_argument('--passes', type=int, default=2, help="First pass is cold, the rest reuse caches")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--work-dir', default=None, help="Where to generate data (default: a temp dir, removed afterwards)")
+    parser.add_argument('--output', default=None, help="Results JSON (default: benchmark_results/<commit>.json)")
+    parser.add_argument('--compare', default=None, help="Earlier results JSON to compare against")
+    parser.add_argument('--trace-memory', action='store_true', help="Also record Python heap peaks with tracemalloc (slower)")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        with open(args.child, 'w') as f:
+            json.dump(run_pipeline(args.workers, args.trace_memory), f)
+        sys.exit(0)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='raports_bench_')
+    try:
+        runs = benchmark(args.rows, args.workers, args.passes, args.seed, work_dir, args.trace_memory)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'workers': args.workers,
+        'seed': args.seed,
+        'environment': environment(),
+        'runs': runs,
+    }
+    output = args.output or os.path.join(HERE, 'benchmark_results', f"{commit[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
@@ -0,0 +1,305 @@
+import argparse
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+import pandas as pd
+
+import analyze_finance
+import config
+import db
+import report_specs
+import streaming
+
+DATA_DIR = config.DATA_DIR
+
+# Loads the ERP report exports into the app database (Prisma dev.db) in bulk:
+# customers/suppliers, sales and purchase orders with their invoices, expenses
+# as EXPENSE invoices, and the stock ledgers as StockMovement rows. Replaces
+# scripts/seed_real_data_from_files.ts, which made one round trip per row.
+#
+# Rows are matched to what is already stored by what they describe: a party by
+# its name, a product by its stock code, an order by type, party, month and
+# amount, an invoice by its order (or, for expenses, party, month and amount),
+# an item by its parent and amount. A match keeps the stored id, whoever made
+# it (the TS seeders' cuid or legacy_ ids, or an earlier run of this loader);
+# anything new gets an id derived from the same fields. Rows are written with
+# INSERT ... ON CONFLICT(id) DO UPDATE in one transaction, so re-running on the
+# same exports, or on a database the seeder filled, updates rows in place
+# instead of duplicating them, and a failed run leaves nothing behind.
+
+DEFAULT_DB = db.DEFAULT_DB
+WAREHOUSE_ID = 'default_warehouse'
+WAREHOUSE_NAME = 'Main Warehouse'
+BATCH_ROWS = 10_000
+DUE_DAYS = 30
+STOCK_COLUMNS = ['STOK KODU', 'STOK İSMİ', 'TARİH', 'MİKTAR', 'EVRAK TİPİ']
+
+# (report, order type, order status, invoice type, invoice status, party flag)
+ORDER_REPORTS = [
+    ('Sales', 'SALE', 'COMPLETED', 'SALES', 'PAID', 'isCustomer'),
+    ('Purchases', 'PURCHASE', 'PENDING', 'PURCHASE', 'PENDING', 'isSupplier'),
+]
+STOCK_REPORTS = [('Stock_In', 'IN'), ('Stock_Out', 'OUT')]
+WHITESPACE = re.compile(r'\s+')
+LOADED_TABLES = ['Warehouse', 'ThirdParty', 'Product', 'Order', 'OrderItem', 'Invoice', 'InvoiceItem', 'StockMovement']
+
+
+def make_id(prefix, *parts):
+    key = '|'.join(str(p) for p in parts)
+    return f"{prefix}_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]}"
+
+def seeder_id(prefix, name):
+    # scripts/seed_real_data_from_files.ts: `${prefix}_${name.replace(/\s+/g, '_').substring(0, 20)}`
+    return prefix + '_' + WHITESPACE.sub('_', name)[:20]
+
+def epoch_ms(values):
+    # Prisma keeps DateTime in SQLite as epoch milliseconds
+    return pd.to_datetime(pd.Series(values)).astype('datetime64[ms]').astype('int64')
+
+def occurrence(df, keys):
+    # 0, 1, 2... among rows with the same keys, so repeated rows get distinct ids
+    return df.groupby(keys, sort=False).cumcount()
+
+def month_of(ms):
+    return pd.to_datetime(pd.Series(ms, dtype='float64'), unit='ms').dt.strftime('%Y-%m').fillna('')
+
+def kurus_of(amounts):
+    return (pd.Series(amounts, dtype='float64') * 100).round().fillna(0).astype('int64')
+
+def row_counts(conn):
+    return {name: conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] for name in LOADED_TABLES}
+
+def connect(path):
+    # The one writable connection in raports; everything else goes through db.connect
+    conn = sqlite3.connect(path, timeout=30.0)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def upsert(conn, table, df, merge=None, keep=('createdAt',)):
+    # Insert df's rows into table keyed by id; existing rows get every column
+    # except id and `keep` overwritten, or the expression given in merge
+    if df.empty:
+        return 0
+    columns = list(df.columns)
+    merge = merge or {}
+    quoted = ', '.join(f'"{c}"' for c in columns)
+    updates = ', '.join(f'"{c}" = ' + merge.get(c, f'excluded."{c}"') for c in columns if c != 'id' and c not in keep)
+    sql = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(columns))}) ON CONFLICT(id) DO UPDATE SET {updates}'
+    values = df.astype(object).where(df.notna(), None)
+    for start in range(0, len(values), BATCH_ROWS):
+        conn.executemany(sql, values.iloc[start:start + BATCH_ROWS].itertuples(index=False, name=None))
+    return len(df)
+
+# --- Exports -> table frames ---
+
+def order_tables(df, order_type, order_status, invoice_type, invoice_status, flag, as_of, now):
+    df = analyze_finance.clean_df(df, 'Cari hesap adı')
+    df = df[df['Ciro'].notna() & (df['Ciro'] != 0)]
+    names = df['Cari hesap adı'].astype(str)
+    month = as_of.strftime('%Y-%m')
+    created = int(epoch_ms([as_of]).iloc[0])
+    due = int(epoch_ms([as_of + datetime.timedelta(days=DUE_DAYS)]).iloc[0])
+    party_ids = names.map(lambda n: make_id('legacy', n))
+    order_ids = [make_id('legacy_order', order_type, month, n, k) for n, k in zip(names, occurrence(df, ['Cari hesap adı']))]
+    amount = df['Ciro'].astype(float).to_numpy()
+
+    parties = pd.DataFrame({'id': party_ids, 'name': names, 'isCustomer': flag == 'isCustomer',
+                            'isSupplier': flag == 'isSupplier', 'createdAt': now, 'updatedAt': now}).drop_duplicates('id')
+    orders = pd.DataFrame({'id': order_ids, 'type': order_type, 'status': order_status, 'totalAmount': amount,
+                           'createdAt': created, 'updatedAt': now, 'thirdPartyId': party_ids.to_numpy()})
+    items = pd.DataFrame({'id': [make_id('legacy_item', o) for o in order_ids], 'orderId': order_ids,
+                          'quantity': 1, 'unitPrice': amount})
+    invoice_ids = [make_id('legacy_invoice', o) for o in order_ids]
+    invoices = pd.DataFrame({'id': invoice_ids, 'type': invoice_type, 'thirdPartyId': party_ids.to_numpy(), 'orderId': order_ids,
+                             'status': invoice_status, 'issueDate': created, 'dueDate': due, 'totalAmount': amount,
+                             'paidAmount': amount if invoice_status == 'PAID' else 0.0, 'createdAt': now, 'updatedAt': now})
+    invoice_items = pd.DataFrame({'id': [make_id('legacy_invoice_item', i) for i in invoice_ids], 'invoiceId': invoice_ids,
+                                  'description': 'Order Item', 'quantity': 1, 'unitPrice': amount, 'totalPrice': amount})
+    return parties, orders, items, invoices, invoice_items
+
+def expense_tables(df, as_of, now):
+    df = analyze_finance.clean_df(df, 'Hesap adı')
+    df = df[df['TL Borç'] > 0]
+    names = df['Hesap adı'].astype(str)
+    month = as_of.strftime('%Y-%m')
+    issued = int(epoch_ms([as_of]).iloc[0])
+    party_ids = names.map(lambda n: make_id('expense', n))
+    invoice_ids = [make_id('expense_invoice', month, n, k) for n, k in zip(names, occurrence(df, ['Hesap adı']))]
+    amount = df['TL Borç'].astype(float).to_numpy()
+
+    parties = pd.DataFrame({'id': party_ids, 'name': names, 'isCustomer': False, 'isSupplier': True,
+                            'createdAt': now, 'updatedAt': now}).drop_duplicates('id')
+    invoices = pd.DataFrame({'id': invoice_ids, 'type': 'EXPENSE', 'thirdPartyId': party_ids.to_numpy(), 'orderId': None,
+                             'status': 'PAID', 'issueDate': issued, 'dueDate': None, 'totalAmount': amount,
+                             'paidAmount': amount, 'createdAt': now, 'updatedAt': now})
+    invoice_items = pd.DataFrame({'id': [make_id('expense_item', i) for i in invoice_ids], 'invoiceId': invoice_ids,
+                                  'description': names.to_numpy(), 'quantity': 1, 'unitPrice': amount, 'totalPrice': amount})
+    return parties, invoices, invoice_items
+
+def stock_tables(path, source, movement_type, now):
+    # The ledgers' undated footer total is not a movement and is dropped.
+    # StockMovement.quantity is an integer column, so quantities are rounded.
+    frames = [chunk for chunk in streaming.iter_chunks(path, columns=STOCK_COLUMNS)]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=STOCK_COLUMNS)
+    dates = pd.to_datetime(df['TARİH'], errors='coerce')
+    df = df[dates.notna() & df['STOK KODU'].notna()].assign(TARİH=dates[dates.notna()])
+    codes = df['STOK KODU'].astype(str)
+    quantity = pd.to_numeric(df['MİKTAR'], errors='coerce').fillna(0).abs().round().astype('int64')
+    product_ids = codes.map(lambda c: make_id('legacy_prod', c))
+    names = df['STOK İSMİ'].astype('string').fillna(codes) if 'STOK İSMİ' in df.columns else codes
+
+    products = pd.DataFrame({'id': product_ids, 'name': names, 'description': codes, 'createdAt': now,
+                             'updatedAt': now}).drop_duplicates('id')
+    keyed = pd.DataFrame({'code': codes, 'date': df['TARİH'], 'quantity': quantity})
+    movement_ids = [make_id('legacy_move', source, c, d, q, k) for c, d, q, k in
+                    zip(codes, df['TARİH'], quantity, occurrence(keyed, ['code', 'date', 'quantity']))]
+    movements = pd.DataFrame({'id': movement_ids, 'productId': product_ids.to_numpy(), 'warehouseId': WAREHOUSE_ID,
+                              'type': movement_type, 'quantity': quantity.to_numpy(),
+                              'reason': df['EVRAK TİPİ'].to_numpy() if 'EVRAK TİPİ' in df.columns else None,
+                              'createdAt': epoch_ms(df['TARİH']).to_numpy()})
+    return products, movements
+
+# --- Matching stored rows ---
+
+def stored(conn, table, columns):
+    quoted = ', '.join(f'"{c}"' for c in ['id'] + columns)
+    return pd.read_sql_query(f'SELECT {quoted} FROM "{table}" ORDER BY rowid', conn)
+
+def match_ids(df, existing, keys):
+    # df's ids, with the stored id wherever a stored row has the same keys; the
+    # n-th repeat of a key in df takes the n-th stored row with it
+    def keyed(frame):
+        frame = frame[keys].fillna('')
+        return zip(*(frame[k].tolist() for k in keys), occurrence(frame, keys).tolist())
+    ids = dict(zip(keyed(existing), existing['id']))
+    return [ids.get(k, i) for k, i in zip(keyed(df), df['id'])]
+
+def party_ids(conn, parties):
+    # A party is its name. Names the seeder folded together (its ids keep the
+    # first 20 characters) resolve to the row it kept for them.
+    existing = stored(conn, 'ThirdParty', ['name'])
+    by_name = dict(zip(existing['name'][::-1], existing['id'][::-1]))
+    known = set(existing['id'])
+    first = dict(zip(parties['name'][::-1], parties['id'][::-1]))
+    ids = []
+    for name in parties['name']:
+        seeded = [i for i in (seeder_id('legacy', name), seeder_id('expense', name)) if i in known]
+        ids.append(by_name.get(name) or (seeded[0] if seeded else first[name]))
+    return ids
+
+def product_ids(conn, products):
+    # By stock code (kept in description, as seed_real_data.ts does), else by
+    # name among products stored without one
+    existing = stored(conn, 'Product', ['name', 'description'])
+    by_code = dict(zip(existing['description'][::-1], existing['id'][::-1]))
+    nameless = existing[existing['description'].isna()]
+    by_name = dict(zip(nameless['name'][::-1], nameless['id'][::-1]))
+    return [by_code.get(c) or by_name.get(n) or i for i, n, c in zip(products['id'], products['name'], products['description'])]
+
+def with_keys(df, amount_col, date_col=None):
+    # kuruş of amount_col, and month of date_col, to match on
+    df = df.assign(kurus=kurus_of(df[amount_col]).to_numpy())
+    return df.assign(month=month_of(df[date_col]).to_numpy()) if date_col else df
+
+def rename(frames, table, ids, references):
+    # Give table's rows the resolved ids and point references ({table: column}) at them
+    df = frames[table]
+    renamed = dict(zip(df['id'], ids))
+    frames[table] = df.assign(id=ids)
+    for child, column in references.items():
+        if child in frames:
+            frames[child] = frames[child].assign(**{column: frames[child][column].map(lambda v: renamed.get(v, v))})
+
+def resolve_ids(conn, frames):
+    if 'ThirdParty' in frames:
+        rename(frames, 'ThirdParty', party_ids(conn, frames['ThirdParty']), {'Order': 'thirdPartyId', 'Invoice': 'thirdPartyId'})
+    if 'Product' in frames:
+        rename(frames, 'Product', product_ids(conn, frames['Product']), {'StockMovement': 'productId'})
+    if 'Order' in frames:
+        existing = with_keys(stored(conn, 'Order', ['type', 'thirdPartyId', 'createdAt', 'totalAmount']), 'totalAmount', 'createdAt')
+        ids = match_ids(with_keys(frames['Order'], 'totalAmount', 'createdAt'), existing, ['type', 'thirdPartyId', 'month', 'kurus'])
+        rename(frames, 'Order', ids, {'OrderItem': 'orderId', 'Invoice': 'orderId'})
+    if 'OrderItem' in frames:
+        existing = with_keys(stored(conn, 'OrderItem', ['orderId', 'unitPrice']), 'unitPrice')
+        rename(frames, 'OrderItem', match_ids(with_keys(frames['OrderItem'], 'unitPrice'), existing, ['orderId', 'kurus']), {})
+    if 'Invoice' in frames:
+        existing = with_keys(stored(conn, 'Invoice', ['type', 'thirdPartyId', 'orderId', 'issueDate', 'totalAmount']), 'totalAmount', 'issueDate')
+        ids = match_ids(with_keys(frames['Invoice'], 'totalAmount', 'issueDate'), existing, ['type', 'thirdPartyId', 'orderId', 'month', 'kurus'])
+        rename(frames, 'Invoice', ids, {'InvoiceItem': 'invoiceId'})
+    if 'InvoiceItem' in frames:
+        existing = with_keys(stored(conn, 'InvoiceItem', ['invoiceId', 'unitPrice']), 'unitPrice')
+        rename(frames, 'InvoiceItem', match_ids(with_keys(frames['InvoiceItem'], 'unitPrice'), existing, ['invoiceId', 'kurus']), {})
+
+# --- Load ---
+
+def load(db_path, data_dir, as_of, stock=True):
+    now = int(time.time() * 1000)
+    tables = {name: [] for name in ('ThirdParty', 'Product', 'Order', 'OrderItem', 'Invoice', 'InvoiceItem', 'StockMovement')}
+
+    for report, *kinds in ORDER_REPORTS:
+        parties, orders, items, invoices, invoice_items = order_tables(report_specs.load_report(report, data_dir), *kinds, as_of, now)
+        tables['ThirdParty'].append(parties)
+        tables['Order'].append(orders)
+        tables['OrderItem'].append(items)
+        tables['Invoice'].append(invoices)
+        tables['InvoiceItem'].append(invoice_items)
+
+    parties, invoices, invoice_items = expense_tables(report_specs.load_report('Expenses', data_dir), as_of, now)
+    tables['ThirdParty'].append(parties)
+    tables['Invoice'].append(invoices)
+    tables['InvoiceItem'].append(invoice_items)
+
+    if stock:
+        for report, movement_type in STOCK_REPORTS:
+            path = os.path.join(data_dir, report_specs.REPORT_SPECS[report]['file'])
+            products, movements = stock_tables(path, report, movement_type, now)
+            tables['Product'].append(products)
+            tables['StockMovement'].append(movements)
+
+    frames = {name: pd.concat(parts, ignore_index=True) for name, parts in tables.items() if parts}
+
+    counts = {}
+    conn = connect(db_path)
+    try:
+        before = row_counts(conn)
+        with conn:
+            resolve_ids(conn, frames)
+            if 'ThirdParty' in frames:
+                # A name that is both customer and supplier is one party with both flags
+                frames['ThirdParty'] = frames['ThirdParty'].groupby('id', sort=False, as_index=False).agg(
+                    name=('name', 'first'), isCustomer=('isCustomer', 'max'), isSupplier=('isSupplier', 'max'),
+                    createdAt=('createdAt', 'first'), updatedAt=('updatedAt', 'first'))
+            if 'Product' in frames:
+                frames['Product'] = frames['Product'].drop_duplicates('id')
+            counts['Warehouse'] = upsert(conn, 'Warehouse', pd.DataFrame(
+                {'id': [WAREHOUSE_ID], 'name': [WAREHOUSE_NAME], 'createdAt': [now], 'updatedAt': [now]}), keep=('createdAt', 'name'))
+            # Flags only ever get added: a supplier loaded earlier stays a supplier
+            counts['ThirdParty'] = upsert(conn, 'ThirdParty', frames.get('ThirdParty', pd.DataFrame()), merge={
+                'isCustomer': '"isCustomer" OR excluded."isCustomer"', 'isSupplier': '"isSupplier" OR excluded."isSupplier"'},
+                keep=('createdAt', 'name'))
+            for name in ('Product', 'Order', 'OrderItem', 'Invoice', 'InvoiceItem', 'StockMovement'):
+                counts[name] = upsert(conn, name, frames.get(name, pd.DataFrame()))
+        added = {name: n - before[name] for name, n in row_counts(conn).items()}
+    finally:
+        conn.close()
+    # {table: (rows written, rows that were not there before)}
+    return {name: (n, added[name]) for name, n in counts.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', default=DEFAULT_DB, help="ERP SQLite database to write (Prisma dev.db)")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--as-of', default=None, help="Date of the monthly reports (YYYY-MM-DD, default today); orders and invoices are keyed by its month")
+    parser.add_argument('--no-stock', action='store_true', help="Skip the stock ledgers")
+    args = parser.parse_args()
+
+    as_of = pd.Timestamp(args.as_of or datetime.date.today()).to_pydatetime()
+    start = time.perf_counter()
+    counts = load(args.db, args.data_dir, as_of, stock=not args.no_stock)
+    for name, (n, added) in counts.items():
+        print(f"{name:<14} {n:>9,} rows {added:>9,} new")
+    print(f"Loaded into {args.db} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,303 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import config
+import ledger
+import normalize
+
+DATA_DIR = config.DATA_DIR
+LEDGER_FILE = os.path.join(DATA_DIR, 'bank_ledger.db')
+
+# Pre-aggregated cash flow: one row per bank x day x direction x counterparty
+# category with the kuruş total and the transaction count. It lives next to
+# the transactions in bank_ledger.db and is kept current incrementally: only
+# ledger rows added since the last update are classified and added in. Reports
+# then roll the cube up (week, month, per category, ...), compare periods and
+# run balances from a few thousand rows instead of re-reading statements.
+
+CUBE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cashflow_cube (
+    bank TEXT NOT NULL,
+    day TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount_kurus INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (bank, day, direction, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cashflow_cube_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_rowid INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    built_at TEXT NOT NULL
+);
+"""
+
+# The company's full name (through LİMİTED, in any spelling normalize accepts)
+# marks money moving between its own accounts, which is not income or spending.
+# Descriptions that name a sender and a receiver (Kuveyt's 'Gönderen: ...,
+# Alıcı: ...') are internal only when both are the company.
+OWN_COMPANY = normalize.name_pattern(normalize.OWN_COMPANY, words=7)
+INTERNAL = rf'^(?!.*GOND).*{OWN_COMPANY}|GOND(?:EREN)?[\W_]*{OWN_COMPANY}.*ALICI[\W_]*{OWN_COMPANY}'
+
+# Counterparty categories from the bank description, first match wins. Written
+# in Turkish; both the patterns and the descriptions are folded to ASCII
+# uppercase (normalize) before matching, so 'MAAŞ' also finds 'Maas'.
+CATEGORY_RULES = [
+    ('bank_fees', r'KOMİSYON|MESAJ ÜCRETİ|BSMV|HESAP İŞLETİM|KART ÜCRETİ|MASRAF'),
+    ('loan', r'TAKSİTLİ|ANA PARA|KREDİ|FAİZ'),
+    ('payroll', r'MAAŞ|AVANS|HUZUR HAKKI|YEMEK ÖDEMESİ|SGK'),
+    ('tax_utilities', r'VERGİ|GİB|ELEKTRİK|DOĞALGAZ|İSKİ|BUSKİ|TELEKOM|TURKCELL|VODAFONE|İCRA'),
+    ('card', r'TEMASSIZ|XXXX \d{4}|POS '),
+    ('internal', INTERNAL),
+    ('trade', r'EFT|FAST|HAV\.|HAVALE|CARİ|ALIM|BEDELİ|DBS|ÇEK|MBL-'),
+]
+OTHER = 'other'
+DIRECTIONS = ['in', 'out']
+
+
+def rule_patterns():
+    # The rules as matched: patterns are already uppercase, so only folded
+    # (uppercasing would turn \d into \D)
+    return [(name, pattern.translate(normalize.FOLD)) for name, pattern in CATEGORY_RULES]
+
+def rules_key():
+    # Changing the rules invalidates every classified row, so the cube is rebuilt
+    return hashlib.sha1(json.dumps(rule_patterns()).encode('utf-8')).hexdigest()
+
+def categorize(descriptions):
+    text = normalize.fold_series(descriptions)
+    conditions = [text.str.contains(pattern, regex=True).to_numpy(dtype=bool) for _, pattern in rule_patterns()]
+    return np.select(conditions, [name for name, _ in CATEGORY_RULES], default=OTHER)
+
+def cube_rows(df):
+    # df: ledger rows (bank, date, amount_kurus, description) -> cube rows
+    if df.empty:
+        return pd.DataFrame(columns=['bank', 'day', 'direction', 'category', 'amount_kurus', 'rows'])
+    keyed = pd.DataFrame({
+        'bank': df['bank'].astype(str),
+        'day': df['date'].astype(str).str[:10],
+        'direction': np.where(df['amount_kurus'].to_numpy() < 0, 'out', 'in'),
+        'category': categorize(df['description']),
+        'amount_kurus': df['amount_kurus'].astype('int64'),
+    })
+    return keyed.groupby(['bank', 'day', 'direction', 'category'], sort=False).agg(
+        amount_kurus=('amount_kurus', 'sum'), rows=('amount_kurus', 'size')).reset_index()
+
+def _state(conn):
+    return conn.execute("SELECT last_rowid, rules FROM cashflow_cube_state WHERE id = 1").fetchone()
+
+def update(conn, rebuild=False):
+    # Add the ledger rows the cube has not seen yet. rowid only grows while the
+    # transactions table is append-only, so the row count is checked afterwards
+    # and anything unexpected (a VACUUM renumbering rows, a manual delete) falls
+    # back to a full rebuild.
+    conn.executescript(CUBE_SCHEMA)
+    state = _state(conn)
+    rules = rules_key()
+    rebuild = rebuild or state is None or state[1] != rules
+    after = 0 if rebuild else state[0]
+
+    new = pd.read_sql_query(
+        "SELECT rowid AS rid, bank, date, amount_kurus, description FROM transactions WHERE rowid > ? ORDER BY rowid",
+        conn, params=(after,))
+    rows = cube_rows(new)
+    last = int(new['rid'].max()) if len(new) else after
+    with conn:
+        if rebuild:
+            conn.execute("DELETE FROM cashflow_cube")
+        conn.executemany("""
+            INSERT INTO cashflow_cube VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (bank, day, direction, category)
+            DO UPDATE SET amount_kurus = amount_kurus + excluded.amount_kurus, rows = rows + excluded.rows
+        """, rows.itertuples(index=False, name=None))
+        conn.execute("INSERT OR REPLACE INTO cashflow_cube_state VALUES (1, ?, ?, ?)",
+                     (last, rules, datetime.datetime.now().isoformat(timespec='seconds')))
+
+    counted = conn.execute("SELECT COALESCE(SUM(rows), 0) FROM cashflow_cube").fetchone()[0]
+    total = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    if counted != total and not rebuild:
+        return update(conn, rebuild=True)
+    return {'new_rows': len(new), 'cube_rows': len(rows), 'rebuilt': rebuild}
+
+def load_cube(conn, start=None, end=None):
+    df = pd.read_sql_query("""
+        SELECT bank, day, direction, category, amount_kurus, rows FROM cashflow_cube
+        WHERE (? IS NULL OR day >= ?) AND (? IS NULL OR day <= ?)
+    """, conn, params=(start, start, end, end))
+    return df.astype({
+        'bank': 'category',
+        'day': 'datetime64[ns]',
+        'direction': pd.CategoricalDtype(DIRECTIONS),
+        'category': pd.CategoricalDtype([name for name, _ in CATEGORY_RULES] + [OTHER]),
+        'amount_kurus': 'int64',
+        'rows': 'int64',
+    })
+
+# --- Queries over a loaded cube ---
+
+def rollup(cube, freq='M', by=('bank',)):
+    # Inflow, outflow and net in kuruş per `by` group and period ('D', 'W',
+    # 'M', 'Q', 'Y'). Every group gets every period of the cube's range, zero
+    # where it had no movement, so shifts and cumsums line up by period.
+    by = list(by)
+    amount = cube['amount_kurus']
+    df = pd.DataFrame({
+        **{col: cube[col] for col in by},
+        'period': cube['day'].dt.to_period(freq),
+        'inflow_kurus': amount.where(amount > 0, 0),
+        'outflow_kurus': -amount.where(amount < 0, 0),
+        'rows': cube['rows'],
+    })
+    table = df.groupby(by + ['period'], observed=True, sort=True)[['inflow_kurus', 'outflow_kurus', 'rows']].sum()
+    if table.empty:
+        return table.assign(net_kurus=pd.Series(dtype='int64')).reset_index()
+
+    periods = pd.period_range(df['period'].min(), df['period'].max(), freq=freq)
+    if by:
+        groups = table.index.droplevel('period').unique()
+        full = pd.MultiIndex.from_tuples([(*(g if isinstance(g, tuple) else (g,)), p) for g in groups for p in periods], names=by + ['period'])
+    else:
+        full = pd.Index(periods, name='period')
+    table = table.reindex(full, fill_value=0)
+    table['net_kurus'] = table['inflow_kurus'] - table['outflow_kurus']
+    return table.reset_index()
+
+def period_over_period(table, by=('bank',)):
+    # Change against the previous period of the same group, on a rollup() table
+    by = list(by)
+    table = table.sort_values(by + ['period']).copy()
+    grouped = table.groupby(by, observed=True, sort=False) if by else table
+    for col in ('inflow_kurus', 'outflow_kurus', 'net_kurus'):
+        previous = grouped[col].shift(1)
+        table[col.replace('_kurus', '_change_kurus')] = table[col] - previous
+        table[col.replace('_kurus', '_change_pct')] = (table[col] - previous) / previous.abs().where(previous != 0) * 100
+    return table
+
+def running_balance(cube, freq='D', by=('bank',), opening=None):
+    # Net flow accumulated over time per group, starting from the opening
+    # balance of each bank (opening_balances) when given
+    by = list(by)
+    table = rollup(cube, freq, by)
+    if by:
+        table['balance_kurus'] = table.groupby(by, observed=True, sort=False)['net_kurus'].cumsum()
+    else:
+        table['balance_kurus'] = table['net_kurus'].cumsum()
+    if opening and by == ['bank']:
+        table['balance_kurus'] += table['bank'].astype(str).map(opening).fillna(0).astype('int64')
+    elif opening and not by:
+        table['balance_kurus'] += sum(opening.values())
+    return table
+
+def between(table, start=None, end=None):
+    # Rows of a rollup-style table whose period overlaps [start, end]. The
+    # running view is computed over the whole cube and cut afterwards, so the
+    # balances still include everything before start.
+    keep = pd.Series(True, index=table.index)
+    if start:
+        keep &= table['period'].dt.end_time >= pd.Timestamp(start)
+    if end:
+        keep &= table['period'].dt.start_time <= pd.Timestamp(end)
+    return table[keep]
+
+def _balances(conn):
+    return pd.read_sql_query(
+        "SELECT bank, date, amount_kurus, balance_kurus FROM transactions WHERE balance_kurus IS NOT NULL", conn)
+
+def chain_end(day, neighbour, first=True):
+    # Balance a day's rows start (first=True) or end on. Each row takes the
+    # balance from balance - amount to balance, and the statement may list
+    # them in any order, so the start is the balance no row of the day ends on
+    # (the end: none starts from). A day that comes back to where it started
+    # has neither; then it is the one the neighbouring day (the next for the
+    # start, the previous for the end) also starts or ends on.
+    before = (day['balance_kurus'] - day['amount_kurus']).tolist()
+    after = day['balance_kurus'].tolist()
+    this, other = (before, after) if first else (after, before)
+    ends = list((Counter(this) - Counter(other)).elements())
+    if not ends and neighbour is not None:
+        linked = neighbour['balance_kurus'] - neighbour['amount_kurus'] if first else neighbour['balance_kurus']
+        ends = sorted(set(this) & set(linked.tolist()))
+    return int((ends or sorted(this))[0])
+
+def _edge_balances(conn, first):
+    # {bank: chain_end of its first (or last) day with balances}
+    balances = {}
+    for bank, rows in _balances(conn).groupby('bank', sort=True):
+        days = [day for _, day in rows.groupby('date', sort=True)]
+        if not first:
+            days.reverse()
+        balances[bank] = chain_end(days[0], days[1] if len(days) > 1 else None, first)
+    return balances
+
+def opening_balances(conn):
+    # Balance before each bank's first ledger row, from the balance column the
+    # statements carry
+    return _edge_balances(conn, first=True)
+
+def closing_balances(conn):
+    # Balance after each bank's last ledger row, as the statements show it
+    return _edge_balances(conn, first=False)
+
+def balance_mismatches(conn, opening):
+    # {bank: (running balance, statement balance)} where the opening balance
+    # plus every ledger row of the bank does not come to the statement's last
+    # balance: a row missing from (or twice in) the ledger
+    flows = dict(conn.execute("SELECT bank, SUM(amount_kurus) FROM transactions GROUP BY bank").fetchall())
+    mismatches = {}
+    for bank, closing in closing_balances(conn).items():
+        running = opening.get(bank, 0) + flows.get(bank, 0)
+        if running != closing:
+            mismatches[bank] = (running, closing)
+    return mismatches
+
+def print_mismatches(mismatches):
+    for bank, (running, closing) in mismatches.items():
+        print(f"Warning: {bank} running balance ends at {running / 100:,.2f} TL, the statement at "
+              f"{closing / 100:,.2f} TL ({(running - closing) / 100:+,.2f} TL)")
+
+def to_tl(table):
+    # Display copy with the kuruş columns in TL
+    cols = [c for c in table.columns if c.endswith('_kurus')]
+    out = table.copy()
+    out[cols] = out[cols] / 100
+    return out.rename(columns={c: c.replace('_kurus', '') for c in cols})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--freq', default='M', help="D, W, M, Q or Y")
+    parser.add_argument('--by', nargs='*', default=['bank'], help="Any of bank, direction, category (none = all banks together)")
+    parser.add_argument('--view', choices=['rollup', 'compare', 'running'], default='rollup')
+    parser.add_argument('--start', default=None)
+    parser.add_argument('--end', default=None)
+    parser.add_argument('--rebuild', action='store_true', help="Reclassify every ledger row")
+    args = parser.parse_args()
+
+    conn = ledger.connect(LEDGER_FILE)
+    stats = update(conn, rebuild=args.rebuild)
+    print(f"Cube {'rebuilt' if stats['rebuilt'] else 'updated'}: {stats['new_rows']} new ledger rows")
+
+    start = time.perf_counter()
+    if args.view == 'running':
+        cube = load_cube(conn)
+        opening = opening_balances(conn)
+        print_mismatches(balance_mismatches(conn, opening))
+        table = between(running_balance(cube, args.freq, args.by, opening), args.start, args.end)
+    else:
+        cube = load_cube(conn, args.start, args.end)
+        table = rollup(cube, args.freq, args.by)
+        if args.view == 'compare':
+            table = period_over_period(table, args.by)
+    elapsed = time.perf_counter() - start
+
+    pd.set_option('display.width', 200)
+    print(to_tl(table).to_string(index=False, float_format=lambda v: f"{v:,.2f}", na_rep='-'))
+    print(f"\n{len(cube):,} cube rows -> {len(table):,} result rows in {1000 * elapsed:.1f} ms")
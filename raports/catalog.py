@@ -0,0 +1,313 @@
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import bank_profiles
+import config
+import frame_cache
+import ingest
+import readers
+import tracing
+
+DATA_DIR = config.DATA_DIR
+
+# Metadata catalog of every export in DATA_DIR: sniffed format, header row,
+# columns, inferred column types, row count, date range, a few sample rows and
+# the content hash. Files are inspected in parallel, each in one streaming pass
+# (openpyxl's read-only rows, xlrd on demand): the first rows are kept to find
+# the header and infer types, the rest only counted and their dates tracked.
+# The catalog is saved in the cache folder and re-inspects only files whose
+# size or mtime changed and whose content hash then differs, so tools that
+# just need a file's layout can look it up instead of opening the workbook.
+
+CATALOG_FILE = 'catalog.json'
+CATALOG_VERSION = 1
+EXTENSIONS = ('.xls', '.xlsx', '.htm', '.html')
+HEADER_SCAN_ROWS = bank_profiles.HEADER_SCAN_ROWS
+INFER_ROWS = 200
+SAMPLE_ROWS = 3
+DATE_SHARE = 0.9  # share of a text column's values that must look like dates
+DATE_TEXT = re.compile(r'^\s*\d{1,4}[./-]\d{1,2}[./-]\d{1,4}')
+
+# pandas' inferred kind -> catalog type
+KINDS = {
+    'integer': 'int', 'floating': 'float', 'mixed-integer-float': 'float', 'decimal': 'float',
+    'datetime': 'datetime', 'datetime64': 'datetime', 'date': 'datetime',
+    'string': 'text', 'boolean': 'bool', 'empty': 'empty',
+}
+
+
+def catalog_path(data_dir):
+    return os.path.join(frame_cache.cache_dir(data_dir), CATALOG_FILE)
+
+def data_files(data_dir):
+    # Export files, each once (the same workbook can be reachable under two names)
+    seen, files = set(), []
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.*'))):
+        name = os.path.basename(path)
+        if not name.lower().endswith(EXTENSIONS) or name.startswith('~$'):
+            continue
+        real = os.path.realpath(path)
+        if real not in seen:
+            seen.add(real)
+            files.append(path)
+    return files
+
+def load(data_dir):
+    try:
+        with open(catalog_path(data_dir), 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        catalog = None
+    if not catalog or catalog.get('version') != CATALOG_VERSION:
+        catalog = {'version': CATALOG_VERSION, 'files': {}}
+    return catalog
+
+def save(data_dir, catalog):
+    path = catalog_path(data_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+def lookup(path, catalog=None):
+    # The catalog entry for a file, or None when there is none or the file has
+    # changed since it was inspected
+    catalog = catalog or load(os.path.dirname(os.path.abspath(path)))
+    entry = catalog['files'].get(os.path.basename(path))
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+        return entry
+    return None
+
+# --- Row sources: every format as an iterator of raw row tuples ---
+
+def _xlsx_rows(path):
+    import openpyxl
+
+    # File object, as in streaming.py: openpyxl checks the extension of paths
+    fh = open(path, 'rb')
+    wb = openpyxl.load_workbook(fh, read_only=True, data_only=True)
+    try:
+        sheet = wb.worksheets[0]
+        # Some exports record a wrong sheet size; read what is really there
+        sheet.reset_dimensions()
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        wb.close()
+        fh.close()
+
+def _xls_rows(path):
+    import xlrd
+
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        for i in range(sheet.nrows):
+            yield tuple(
+                xlrd.xldate_as_datetime(c.value, book.datemode) if c.ctype == xlrd.XL_CELL_DATE
+                else None if c.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK) else c.value
+                for c in sheet.row(i))
+    finally:
+        book.release_resources()
+
+def _html_rows(path):
+    # HTML cannot be streamed; the parsed table is cached by frame_cache anyway
+    frames, _ = readers.read_table(path, header=None)
+    raw = bank_profiles._raw_rows(frames[0])
+    yield from raw.astype(object).where(raw.notna(), None).itertuples(index=False, name=None)
+
+ROW_SOURCES = {
+    readers.XLSX: _xlsx_rows,
+    readers.XLS: _xls_rows,
+    readers.HTML: _html_rows,
+}
+
+# --- Inspection ---
+
+def _empty(value):
+    return value is None or (isinstance(value, str) and not value.strip()) or (isinstance(value, float) and value != value)
+
+def find_header(rows):
+    # Bank statements: the row naming the amount columns (bank_profiles).
+    # Reports: the first row as wide as the widest in the scan and all text.
+    row, _ = bank_profiles.detect_header(pd.DataFrame(rows))
+    if row is not None:
+        return row
+    widths = [sum(not _empty(v) for v in r) for r in rows]
+    widest = max(widths, default=0)
+    for i, r in enumerate(rows):
+        if widths[i] == widest and all(isinstance(v, str) for v in r if not _empty(v)):
+            return i
+    return 0
+
+def column_names(row, width):
+    row = list(row) + [None] * (width - len(row))
+    return [f"Unnamed: {i}" if _empty(v) else str(v).strip() for i, v in enumerate(row)]
+
+def to_dates(values):
+    values = pd.Series(values, dtype=object)
+    return pd.to_datetime(values, dayfirst=True, errors='coerce', format='mixed')
+
+def infer_type(values):
+    values = [v for v in values if not _empty(v)]
+    kind = KINDS.get(pd.api.types.infer_dtype(values, skipna=True), 'mixed')
+    if kind == 'text' and sum(bool(DATE_TEXT.match(v)) for v in values) >= DATE_SHARE * len(values):
+        # Bank statements keep dates as '16.12.2025 10:42' text
+        return 'datetime'
+    return kind
+
+def _cell(value):
+    if _empty(value):
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value if isinstance(value, (int, float, str)) else str(value)
+
+def inspect_rows(rows):
+    # One pass over raw rows -> the layout part of a catalog entry
+    rows = iter(rows)
+    head = []
+    for row in rows:
+        head.append(row)
+        if len(head) >= HEADER_SCAN_ROWS + INFER_ROWS:
+            break
+    header = find_header(head[:HEADER_SCAN_ROWS])
+    width = max((len(r) for r in head), default=0)
+    columns = column_names(head[header] if head else (), width)
+    data = [r for r in head[header + 1:] if not all(_empty(v) for v in r)]
+
+    types = [infer_type([r[i] if i < len(r) else None for r in data]) for i in range(width)]
+    date_col = types.index('datetime') if 'datetime' in types else None
+    dates = [r[date_col] for r in data if date_col < len(r)] if date_col is not None else []
+    count = len(data)
+    for row in rows:
+        # The rest of the file: counted, and only its date column kept
+        if all(_empty(v) for v in row):
+            continue
+        count += 1
+        if date_col is not None and date_col < len(row):
+            dates.append(row[date_col])
+
+    parsed = to_dates([d for d in dates if not _empty(d)]).dropna() if dates else pd.Series(dtype='datetime64[ns]')
+    return {
+        'header_row': header,
+        'columns': columns,
+        'types': dict(zip(columns, types)),
+        'rows': count,
+        'date_column': None if date_col is None else columns[date_col],
+        'date_min': parsed.min().date().isoformat() if len(parsed) else None,
+        'date_max': parsed.max().date().isoformat() if len(parsed) else None,
+        'sample': [[_cell(v) for v in list(r) + [None] * (width - len(r))] for r in data[:SAMPLE_ROWS]],
+    }
+
+def inspect_file(job):
+    # job: {'path', 'sha256' of the current entry or None}. Hashes first, so a
+    # touched but identical file is not read again.
+    path = job['path']
+    start = time.perf_counter()
+    st = os.stat(path)
+    entry = {'file': os.path.basename(path), 'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'error': None}
+    with tracing.stage(f"inspect {entry['file']}", 'inspect', bytes_read=st.st_size) as span:
+        entry['sha256'] = frame_cache.file_hash(path)
+        if entry['sha256'] == job.get('sha256'):
+            entry['unchanged'] = True
+        else:
+            entry['format'], entry['by_magic'] = readers.sniff(path)
+            try:
+                entry.update(inspect_rows(ROW_SOURCES[entry['format']](path)))
+            except Exception as e:
+                entry['error'] = f"{type(e).__name__}: {e}"
+            entry['inspected_at'] = datetime.datetime.now().isoformat(timespec='seconds')
+            span.set(rows_out=entry.get('rows'))
+    entry['seconds'] = round(time.perf_counter() - start, 4)
+    entry['trace'] = tracing.drain()
+    return entry
+
+def run(jobs, workers=None):
+    workers = workers or ingest.DEFAULT_WORKERS or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        results = [inspect_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(inspect_file, jobs))
+    for r in results:
+        tracing.merge(r.pop('trace', None))
+    return results
+
+def update(data_dir, workers=None, force=False):
+    # Brings the catalog up to date with data_dir; returns (catalog, stats)
+    catalog = load(data_dir)
+    entries = catalog['files']
+    files = data_files(data_dir)
+    jobs = []
+    for path in files:
+        entry = entries.get(os.path.basename(path))
+        st = os.stat(path)
+        if force or not entry or entry['mtime_ns'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            jobs.append({'path': path, 'sha256': None if force or not entry else entry['sha256']})
+
+    stats = {'files': len(files), 'checked': len(jobs), 'inspected': [], 'touched': [], 'removed': []}
+    for result in run(jobs, workers):
+        name = result['file']
+        if result.pop('unchanged', False):
+            entries[name].update(mtime_ns=result['mtime_ns'], size=result['size'])
+            stats['touched'].append(name)
+        else:
+            entries[name] = result
+            stats['inspected'].append(name)
+    current = {os.path.basename(p) for p in files}
+    for name in [n for n in entries if n not in current]:
+        del entries[name]
+        stats['removed'].append(name)
+
+    if jobs or stats['removed']:
+        catalog['updated_at'] = datetime.datetime.now().isoformat(timespec='seconds')
+        save(data_dir, catalog)
+    return catalog, stats
+
+def summary_table(catalog):
+    rows = []
+    for name, e in sorted(catalog['files'].items()):
+        rows.append({
+            'file': name,
+            'format': e.get('format'),
+            'header': e.get('header_row'),
+            'columns': len(e.get('columns') or []),
+            'rows': e.get('rows'),
+            'dates': f"{e['date_min']} - {e['date_max']}" if e.get('date_min') else '',
+            'error': e.get('error') or '',
+        })
+    return pd.DataFrame(rows).astype({'header': 'Int64', 'rows': 'Int64'})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="Parallel inspectors (default: RAPORTS_WORKERS or CPU count, 1 = serial)")
+    parser.add_argument('--force', action='store_true', help="Re-inspect every file")
+    parser.add_argument('--file', default=None, help="Print one file's entry")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog, stats = update(args.data_dir, workers=args.workers, force=args.force)
+    elapsed = time.perf_counter() - start
+    print(f"{stats['files']} files: {len(stats['inspected'])} inspected, {len(stats['touched'])} touched but unchanged, "
+          f"{len(stats['removed'])} removed, {stats['files'] - stats['checked']} up to date ({elapsed:.2f}s)")
+    print(f"Catalog: {catalog_path(args.data_dir)}\n")
+
+    if args.file:
+        print(json.dumps(catalog['files'].get(os.path.basename(args.file)), ensure_ascii=False, indent=2))
+    else:
+        pd.set_option('display.width', 200)
+        print(summary_table(catalog).to_string(index=False))
+    tracing.finish()
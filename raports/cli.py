@@ -0,0 +1,199 @@
+import argparse
+import os
+import sys
+import time
+
+import config
+
+# Single entry point for the raports scripts:
+#
+#   python3 raports/cli.py <command> [script arguments]
+#
+# Only argparse, os, sys, time and config are imported up front. A command's
+# module (and with it pandas, openpyxl, xlrd or lxml) is loaded when that
+# command runs, and so is the rest of the standard library a command needs
+# (urllib for `show`, subprocess for `imports`, runpy to run a script), so
+# `--help` and the `show` command cost little more than starting the
+# interpreter. `show` answers from a running report service (report_service.py)
+# when there is one and only falls back to computing the result itself when
+# there is not, through the service's own endpoint code (report_service.answer),
+# so both print the same. Its options become the endpoint's query parameters.
+#
+# `imports` measures the CLI's own startup against STARTUP_TARGET_MS, next to
+# a bare interpreter's, and prints how long each command's imports take.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STARTUP_TARGET_MS = 100
+SERVICE_TIMEOUT = 0.5
+
+# command -> (module, help)
+COMMANDS = {
+    'analyze-finance': ('analyze_finance', "Build the Financial Analysis Report"),
+    'list-expenses': ('list_expenses', "Write the full expense list"),
+    'inspect-stock-types': ('inspect_stock_types', "Document types in the stock ledgers"),
+    'inspect-data': ('inspect_data', "Header and sample rows of every export"),
+    'catalog': ('catalog', "Update and show the metadata catalog of the exports"),
+    'debug-readers': ('debug_readers', "Try each reader on the bank statements"),
+    'debug-bank-columns': ('debug_bank_columns_full', "Columns and first rows of every statement"),
+    'debug-bank-values': ('debug_bank_values', "Amount columns of the Akbank and Kuveyt statements"),
+    'debug-ziraat': ('debug_ziraat', "Format sniffing and parsing of the Ziraat statements"),
+    'reconcile': ('reconcile', "Match bank lines to ERP payments"),
+    'counterparties': ('counterparties', "Sales, purchases, balances and bank lines per counterparty"),
+    'stock': ('stock_snapshots', "Stock balances on a date"),
+    'cash-flow': ('cashflow_cube', "Cash-flow cube rollups, comparisons and running balances"),
+    'bulk-load': ('bulk_load', "Load the exports into the ERP database"),
+    'serve': ('report_service', "Run the report service"),
+    'db': ('db', "ERP database row counts and indexes"),
+    'synthetic': ('synthetic', "Generate a synthetic data set"),
+    'benchmark': ('benchmark', "End-to-end pipeline benchmark"),
+}
+
+# show target -> (service endpoint, fixed query parameters, options it takes)
+SHOW = {
+    'report': ('/report', {}, []),
+    'expenses': ('/expenses', {}, ['format']),
+    'cash-flow': ('/cash-flow', {'format': 'md'}, ['start', 'end']),
+    'stock': ('/stock', {}, ['as_of', 'source']),
+}
+
+
+def run_command(name, args):
+    # Runs the command's module as if it were started as a script
+    import runpy
+
+    module = COMMANDS[name][0]
+    sys.argv = [os.path.join(HERE, f"{module}.py")] + list(args)
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    runpy.run_module(module, run_name='__main__', alter_sys=True)
+
+def fetch(endpoint, query):
+    # (status, body) from the report service, None when it is not running
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
+    url = f"http://127.0.0.1:{config.SERVICE_PORT}{endpoint}?{urllib.parse.urlencode(query)}"
+    try:
+        with urllib.request.urlopen(url, timeout=SERVICE_TIMEOUT) as resp:
+            return resp.status, resp.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+    except (urllib.error.URLError, OSError):
+        return None
+
+def show(target, query):
+    endpoint, fixed, _ = SHOW[target]
+    query = dict(query, **fixed)
+    answer = fetch(endpoint, query)
+    if answer is None:
+        print(f"(report service not running on port {config.SERVICE_PORT}; computing {target} directly)", file=sys.stderr)
+        if HERE not in sys.path:
+            sys.path.insert(0, HERE)
+        import contextlib
+
+        import report_service
+
+        # Loading progress goes to stderr; stdout carries only the answer
+        with contextlib.redirect_stdout(sys.stderr):
+            status, _, body = report_service.answer(endpoint, query)
+        answer = status, body
+    status, body = answer
+    if status != 200:
+        print(body, file=sys.stderr)
+        sys.exit(1)
+    print(body)
+
+# --- Import-time report ---
+
+def startup_ms(runs, args=('--help',)):
+    # Median wall time of starting this CLI (or, with args=None, a bare interpreter)
+    import statistics
+    import subprocess
+
+    command = [sys.executable, os.path.abspath(__file__), *args] if args is not None else [sys.executable, '-c', 'pass']
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def import_times(module):
+    # (total ms, [(ms, package)] of what the module imports directly) from
+    # -X importtime; the tree is printed children first, one level per indent
+    import subprocess
+
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', f"import {module}"],
+                          cwd=HERE, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None, []
+    children = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        ms = int(cumulative) / 1000
+        if level == 1:
+            children.append((ms, name.strip()))
+        elif level == 0:
+            if name.strip() == module:
+                return ms, sorted(children, reverse=True)
+            children = []
+    return None, []
+
+def import_report(runs):
+    ms = startup_ms(runs)
+    status = 'ok' if ms <= STARTUP_TARGET_MS else 'over target'
+    print(f"CLI startup (--help, median of {runs}): {ms:.0f} ms, target {STARTUP_TARGET_MS} ms: {status}")
+    print(f"Bare interpreter (python -c pass): {startup_ms(runs, args=None):.0f} ms\n")
+    print(f"{'command':<22} {'module':<24} {'imports ms':>10}  heaviest")
+    for name, (module, _) in COMMANDS.items():
+        total, top = import_times(module)
+        if total is None:
+            print(f"{name:<22} {module:<24} {'failed':>10}")
+            continue
+        heaviest = ', '.join(f"{pkg} {t:.0f}" for t, pkg in top[:3])
+        print(f"{name:<22} {module:<24} {total:10.0f}  {heaviest}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(prog='raports', description="Raports report scripts")
+    parser.add_argument('--data-dir', default=None, help=f"Export folder (default: RAPORTS_DATA_DIR or {config.DEFAULT_DATA_DIR})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+    show_parser = sub.add_parser('show', help="Print a report, from the report service when it is running")
+    show_parser.add_argument('target', choices=list(SHOW))
+    show_parser.add_argument('--start', help="cash-flow: first day (YYYY-MM-DD)")
+    show_parser.add_argument('--end', help="cash-flow: last day")
+    show_parser.add_argument('--as-of', help="stock: day for --source balances (default today)")
+    show_parser.add_argument('--source', help="stock: balances of Stock_In, Stock_Out or erp instead of the export totals")
+    show_parser.add_argument('--format', help="expenses: json instead of Markdown")
+    imports_parser = sub.add_parser('imports', help="Startup time and per-command import times")
+    imports_parser.add_argument('--runs', type=int, default=5)
+
+    # Everything after the command goes to the command's own parser
+    args, rest = parser.parse_known_args(argv)
+    if args.data_dir:
+        # Read by config when the command's modules are first imported
+        os.environ['RAPORTS_DATA_DIR'] = os.path.abspath(args.data_dir)
+        config.DATA_DIR = os.environ['RAPORTS_DATA_DIR']
+
+    if args.command == 'show':
+        takes = SHOW[args.target][2]
+        given = {name: getattr(args, name) for name in ('start', 'end', 'as_of', 'source', 'format') if getattr(args, name) is not None}
+        wrong = [f"--{name.replace('_', '-')}" for name in given if name not in takes] + rest
+        if wrong:
+            parser.error(f"show {args.target} does not take {' '.join(wrong)}")
+        show(args.target, given)
+    elif args.command == 'imports':
+        import_report(args.runs)
+    else:
+        run_command(args.command, rest)
+
+if __name__ == "__main__":
+    main()
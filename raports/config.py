@@ -0,0 +1,15 @@
+import os
+
+# Shared settings for the raports scripts, overridable from the environment so
+# the same scripts run against any export folder (and the benchmark's
+# synthetic ones).
+#
+#   RAPORTS_DATA_DIR  folder with the bank statements and ERP report exports
+#   RAPORTS_DB        ERP SQLite database (default: the Prisma dev.db)
+#   RAPORTS_PORT      port report_service.py listens on (localhost only)
+
+DEFAULT_DATA_DIR = '/Users/oakkas/repos/akkademircelik_raporlar'
+
+DATA_DIR = os.environ.get('RAPORTS_DATA_DIR') or DEFAULT_DATA_DIR
+ERP_DB = os.environ.get('RAPORTS_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'prisma', 'dev.db')
+SERVICE_PORT = int(os.environ.get('RAPORTS_PORT') or 8765)
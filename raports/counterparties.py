@@ -0,0 +1,262 @@
+import argparse
+import os
+import time
+from collections import Counter
+
+import pandas as pd
+
+import analyze_finance
+import config
+import ledger
+import normalize
+import report_specs
+
+DATA_DIR = config.DATA_DIR
+LEDGER_FILE = os.path.join(DATA_DIR, 'bank_ledger.db')
+
+# One canonical counterparty per company, however the exports spell it. The
+# sales, purchase and balance reports, the bank descriptions and the old seeder
+# ids (first 20 characters) write the same company as 'AİR LİQUİDE GAZ SANAYİ
+# VE TİCARET ANONİM ŞİRKETİ', 'Air Liquide Gaz Sanayi Ve Ticaret Anonim
+# Şirketi' or 'ANLAŞ KALIPMAK.OTOM.YAN S'. Every name is reduced to a key
+# (normalize.name_key: Turkish-aware uppercase folded to ASCII, punctuation
+# dropped, legal-form words removed). Equal keys are the same counterparty (a
+# dict lookup); the rest are matched on character trigrams, with an inverted
+# gram index so each name is only scored against the few keys it shares rare
+# grams with. A key that starts another one only counts as the same company
+# when it was cut off: the raw name is exactly one of the widths the exports
+# cut names at, or the key ends part way through a word. 'OZTURK METAL' is
+# its own company next to 'OZTURK METAL KAPLAMA'. Joining the reports per
+# counterparty is then a groupby on the key and an index-aligned concat
+# instead of comparing every pair of names.
+
+GRAM = 3
+NAME_SIMILARITY = 0.85    # Dice score for two report names to be one counterparty
+MIN_PREFIX = 12           # a key cut to at least this many characters can be a truncation
+CUT_WIDTHS = (20, 25)     # name lengths the exports and the old seeder ids cut at
+DESCRIPTION_MIN_CHARS = 10  # leading characters of a name a cut-off bank description must carry
+MAX_POSTINGS = 50         # grams shared by more keys than this are not used for blocking
+
+# (report, name column, value column) joined per counterparty
+NAME_REPORTS = [
+    ('Sales', 'Cari hesap adı', 'Ciro'),
+    ('Purchases', 'Cari hesap adı', 'Ciro'),
+    ('Balances', 'Cari hesap adı', 'TL Borç Bakiye'),
+]
+
+
+def grams(key):
+    padded = f" {key} "
+    return frozenset(padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1))
+
+def dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+def keys_of(names):
+    # name_key over a column, computed once per distinct name
+    names = pd.Series(names)
+    uniques = pd.unique(names.dropna())
+    return names.map(dict(zip(uniques, map(normalize.name_key, uniques))))
+
+# --- Index ---
+
+def new_index():
+    # keys[i], names[i], grams[i] describe canonical counterparty i; by_key and
+    # aliases map a key (or a merged key) to i; postings is the gram index
+    return {'keys': [], 'names': [], 'grams': [], 'by_key': {}, 'aliases': {}, 'postings': {}}
+
+def candidates(index, query_grams, min_hits=1):
+    # Canonical ids sharing at least min_hits of the query's selective grams
+    hits = Counter()
+    for g in query_grams:
+        ids = index['postings'].get(g)
+        if ids and len(ids) <= MAX_POSTINGS:
+            hits.update(ids)
+    return [i for i, n in hits.items() if n >= min_hits]
+
+def truncated(short, long, short_name):
+    # Whether key short is key long cut off, short_name being short's raw name
+    if len(short) < MIN_PREFIX or len(long) <= len(short) or not long.startswith(short):
+        return False
+    return long[len(short)] != ' ' or len(str(short_name)) in CUT_WIDTHS
+
+def similar(index, key, key_grams, name):
+    # Best canonical id for a key (raw spelling name) with no exact match, or None
+    best, best_score = None, 0.0
+    for i in candidates(index, key_grams, min_hits=max(1, len(key_grams) // 2)):
+        other = index['keys'][i]
+        if len(key) <= len(other):
+            cut = truncated(key, other, name)
+        else:
+            cut = truncated(other, key, index['names'][i])
+        score = 1.0 if cut else dice(key_grams, index['grams'][i])
+        if score > best_score or (score == best_score and best is not None and len(other) > len(index['keys'][best])):
+            best, best_score = i, score
+    return best if best_score >= NAME_SIMILARITY else None
+
+def add(index, names):
+    # Adds names to the index, longest key first so the complete spelling of a
+    # name becomes the canonical one and truncated variants merge into it
+    keys = keys_of(names)
+    first_name = {}
+    for name, key in zip(pd.Series(names), keys):
+        if key and key not in first_name:
+            first_name[key] = name
+    merged = 0
+    for key in sorted(first_name, key=len, reverse=True):
+        if key in index['by_key'] or key in index['aliases']:
+            continue
+        key_grams = grams(key)
+        i = similar(index, key, key_grams, first_name[key])
+        if i is not None:
+            index['aliases'][key] = i
+            merged += 1
+            continue
+        i = len(index['keys'])
+        index['keys'].append(key)
+        index['names'].append(first_name[key])
+        index['grams'].append(key_grams)
+        index['by_key'][key] = i
+        for g in key_grams:
+            index['postings'].setdefault(g, []).append(i)
+    return merged
+
+def build_index(name_lists):
+    index = new_index()
+    for names in name_lists:
+        add(index, names)
+    return index
+
+def lookup(index, key):
+    i = index['by_key'].get(key)
+    return index['aliases'].get(key) if i is None else i
+
+def resolve(index, names):
+    # Canonical key per name (NA where the index has nothing close)
+    keys = keys_of(names)
+    first_name = dict(zip(keys[::-1], pd.Series(names)[::-1]))
+    ids = {}
+    for key in pd.unique(keys.dropna()):
+        i = lookup(index, key)
+        if i is None and key:
+            i = similar(index, key, grams(key), first_name[key])
+        ids[key] = i
+    return keys.map(lambda k: None if pd.isna(k) or ids.get(k) is None else index['keys'][ids[k]]).astype('string')
+
+def leading_words(key, text_words):
+    # (characters, complete): how much of the key, word by word from the start,
+    # the text contains. Abbreviated words ('MET' for METAL) and words run
+    # together ('CELIKSANA') count, except that the first word must be spelled
+    # out; descriptions are often cut off mid-name, so a long enough leading
+    # part is as good as the whole name.
+    chars = 0
+    for n, word in enumerate(key.split()):
+        if not any(t == word or (n and len(t) >= 3 and word.startswith(t)) or (len(word) >= 4 and t.startswith(word)) for t in text_words):
+            return chars, False
+        chars += len(word) + 1
+    return chars, True
+
+def resolve_descriptions(index, descriptions):
+    # Canonical key named in each bank description: complete names first, then
+    # the longest leading part of at least DESCRIPTION_MIN_CHARS; NA when
+    # nothing fits or two keys fit equally well. The company's own name is left
+    # out, it is on both sides of every transfer.
+    own = lookup(index, normalize.name_key(normalize.OWN_COMPANY))
+    found = {}
+    for text in pd.unique(pd.Series(descriptions).dropna()):
+        text_key = normalize.name_key(text)
+        text_words = set(text_key.split())
+        scored = []
+        for i in candidates(index, grams(text_key), min_hits=2):
+            if i == own:
+                continue
+            chars, complete = leading_words(index['keys'][i], text_words)
+            if complete or chars > DESCRIPTION_MIN_CHARS:
+                scored.append((complete, chars, i))
+        scored.sort(reverse=True)
+        if scored and (len(scored) == 1 or scored[0][:2] != scored[1][:2]):
+            found[text] = index['keys'][scored[0][2]]
+    return pd.Series(descriptions).map(found).astype('string')
+
+# --- Joins ---
+
+def report_frames(reports):
+    # (label, names, values) for each report present, totals rows removed
+    parts = []
+    for name, name_col, value_col in NAME_REPORTS:
+        if name in reports:
+            df = analyze_finance.clean_df(reports[name], name_col)
+            parts.append((name, df[name_col], pd.to_numeric(df[value_col], errors='coerce')))
+    return parts
+
+def join(index, parts, transactions=None):
+    # One row per canonical counterparty with a column per report (and bank
+    # inflow/outflow in TL): each part is summed per key, then the sums are
+    # aligned on the key index
+    columns = []
+    for label, names, values in parts:
+        keyed = pd.DataFrame({'key': resolve(index, names).to_numpy(), label: values.to_numpy()})
+        columns.append(keyed.groupby('key')[label].sum())
+    if transactions is not None and len(transactions):
+        keys = resolve_descriptions(index, transactions['description'])
+        kurus = transactions['amount_kurus'].to_numpy()
+        bank = pd.DataFrame({'key': keys.to_numpy(), 'bank_in': kurus.clip(min=0) / 100, 'bank_out': -kurus.clip(max=0) / 100})
+        columns.append(bank.groupby('key')[['bank_in', 'bank_out']].sum())
+    table = pd.concat(columns, axis=1).fillna(0)
+    table.index.name = 'key'
+    names = pd.Series(index['names'], index=index['keys'], name='name')
+    return table.join(names).reset_index()[['key', 'name'] + [c for c in table.columns]]
+
+def merged_names(index, parts):
+    # Raw spellings that resolved to the same counterparty, for review
+    rows = []
+    for label, names, _ in parts:
+        rows.append(pd.DataFrame({'report': label, 'raw': names.astype(str).to_numpy(), 'key': resolve(index, names).to_numpy()}))
+    df = pd.concat(rows, ignore_index=True).drop_duplicates(['raw', 'key'])
+    spellings = df.groupby('key')['raw'].transform('nunique')
+    return df[spellings > 1].sort_values(['key', 'raw'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=20, help="Counterparties to list, by sales plus purchases")
+    parser.add_argument('--merges', action='store_true', help="List the spellings merged into one counterparty")
+    parser.add_argument('--no-bank', action='store_true', help="Skip matching bank descriptions")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    results = report_specs.load_reports(DATA_DIR, names=[name for name, _, _ in NAME_REPORTS], workers=args.workers)
+    reports = analyze_finance.collect_reports(results, {})
+    parts = report_frames(reports)
+    transactions = None
+    if not args.no_bank:
+        conn = ledger.connect(LEDGER_FILE)
+        try:
+            transactions = ledger.transactions(conn)
+        finally:
+            conn.close()
+
+    start = time.perf_counter()
+    index = build_index([names for _, names, _ in parts])
+    built = time.perf_counter()
+    table = join(index, parts, transactions)
+    joined = time.perf_counter()
+
+    raw = sum(len(names) for _, names, _ in parts)
+    spellings = len(pd.unique(pd.concat([names for _, names, _ in parts]).astype(str)))
+    print(f"{raw:,} report rows, {spellings:,} spellings -> {len(index['keys']):,} counterparties "
+          f"({len(index['aliases']):,} merged by similarity)")
+    if transactions is not None:
+        named = resolve_descriptions(index, transactions['description']).notna().sum()
+        print(f"{named:,} of {len(transactions):,} bank lines name a known counterparty")
+    print(f"Index built in {1000 * (built - start):.1f} ms, joined in {1000 * (joined - built):.1f} ms\n")
+
+    value_cols = [c for c in table.columns if c not in ('key', 'name')]
+    ranked = table.assign(_size=table.reindex(columns=['Sales', 'Purchases'], fill_value=0).sum(axis=1)).nlargest(args.top, '_size')
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_colwidth', 50)
+    print(ranked[['name'] + value_cols].to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+    if args.merges:
+        merges = merged_names(index, parts)
+        print("\nMerged spellings:")
+        print(merges.to_string(index=False) if len(merges) else "  none")
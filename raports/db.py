@@ -0,0 +1,183 @@
+import argparse
+import os
+import sqlite3
+import time
+import urllib.parse
+
+import pandas as pd
+
+import config
+
+# Read-only access to the ERP's SQLite database (Prisma dev.db) for the
+# reports. Connections open with mode=ro and query_only, so a report can never
+# write or take a write lock, and a busy timeout instead of failing while the
+# app holds one; in WAL mode readers never block the app's writers. Results are
+# fetched in batches straight into DataFrames or Arrow tables.
+
+DEFAULT_DB = config.ERP_DB
+BATCH_ROWS = 50_000
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+
+try:
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Indexes the report queries want. Prisma does not know about them, so a
+# `prisma migrate reset` drops them; create_indexes() puts them back. Each one
+# covers the columns its query reads so SQLite never touches the table rows.
+RECOMMENDED_INDEXES = {
+    'raports_StockMovement_material_createdAt': 'StockMovement (materialId, createdAt, type, quantity, warehouseId)',
+    'raports_StockMovement_product_createdAt': 'StockMovement (productId, createdAt, type, quantity, warehouseId)',
+    'raports_StockMovement_createdAt': 'StockMovement (createdAt)',
+    'raports_Payment_date': 'Payment (date, amount, invoiceId)',
+    'raports_Invoice_type_issueDate': 'Invoice (type, issueDate, totalAmount, thirdPartyId)',
+    'raports_Order_type_createdAt': '"Order" (type, createdAt, totalAmount, thirdPartyId)',
+    'raports_OrderItem_orderId': 'OrderItem (orderId, materialId, productId, quantity, unitPrice)',
+}
+
+
+def connect(path=DEFAULT_DB, timeout=5.0):
+    uri = f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=timeout, check_same_thread=False)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")  # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
+
+def parse_dates(values):
+    # Prisma stores DateTime as epoch milliseconds, but the legacy import wrote
+    # Excel serial day numbers into some columns; tell them apart by size
+    values = pd.to_numeric(pd.Series(values), errors='coerce')
+    serial = values < 100_000
+    epoch_ms = values.notna() & ~serial
+    dates = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    dates[epoch_ms] = pd.to_datetime(values[epoch_ms], unit='ms')
+    dates[serial] = EXCEL_EPOCH + pd.to_timedelta(values[serial], unit='D')
+    return dates
+
+def to_epoch_ms(value):
+    return int(pd.Timestamp(value).value // 1_000_000)
+
+def iter_batches(conn, sql, params=(), batch_rows=BATCH_ROWS):
+    # Yields (column names, list of row tuples) batches
+    cur = conn.execute(sql, params)
+    names = [d[0] for d in cur.description]
+    try:
+        while True:
+            rows = cur.fetchmany(batch_rows)
+            if not rows:
+                break
+            yield names, rows
+    finally:
+        cur.close()
+
+def iter_frames(conn, sql, params=(), batch_rows=BATCH_ROWS, dates=()):
+    for names, rows in iter_batches(conn, sql, params, batch_rows):
+        df = pd.DataFrame.from_records(rows, columns=names)
+        for col in dates:
+            df[col] = parse_dates(df[col])
+        yield df
+
+def query_df(conn, sql, params=(), batch_rows=BATCH_ROWS, dates=()):
+    frames = list(iter_frames(conn, sql, params, batch_rows, dates))
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    cur = conn.execute(sql, params)
+    names = [d[0] for d in cur.description]
+    cur.close()
+    return pd.DataFrame(columns=names)
+
+def query_arrow(conn, sql, params=(), batch_rows=BATCH_ROWS):
+    if not HAS_ARROW:
+        raise ImportError("pyarrow is required for query_arrow")
+    batches = []
+    for names, rows in iter_batches(conn, sql, params, batch_rows):
+        batches.append(pa.RecordBatch.from_arrays([pa.array(col) for col in zip(*rows)], names=names))
+    if not batches:
+        return pa.table({})
+    return pa.Table.from_batches(batches)
+
+def existing_indexes(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def missing_indexes(conn):
+    have = existing_indexes(conn)
+    return [name for name in RECOMMENDED_INDEXES if name not in have]
+
+def create_indexes(path=DEFAULT_DB):
+    # The one write this module does, on its own short-lived connection
+    conn = sqlite3.connect(path, timeout=30.0)
+    try:
+        with conn:
+            for name, target in RECOMMENDED_INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return list(RECOMMENDED_INDEXES)
+
+# --- Report queries ---
+
+def stock_movements(conn, start=None, end=None, material_id=None):
+    # start/end filter on createdAt; rows written by the app are epoch ms
+    sql = """
+        SELECT id, materialId, productId, warehouseId, type, quantity, lotNumber, createdAt
+        FROM StockMovement
+        WHERE (? IS NULL OR materialId = ?)
+          AND (? IS NULL OR createdAt >= ?)
+          AND (? IS NULL OR createdAt < ?)
+        ORDER BY createdAt
+    """
+    start = to_epoch_ms(start) if start is not None else None
+    end = to_epoch_ms(end) if end is not None else None
+    return query_df(conn, sql, (material_id, material_id, start, start, end, end), dates=['createdAt'])
+
+def stock_on_hand(conn):
+    return query_df(conn, """
+        SELECT s.warehouseId, w.name AS warehouse, s.materialId, m.name AS material,
+               s.productId, p.name AS product, s.lotNumber, s.quantity
+        FROM Stock s
+        JOIN Warehouse w ON w.id = s.warehouseId
+        LEFT JOIN Material m ON m.id = s.materialId
+        LEFT JOIN Product p ON p.id = s.productId
+    """)
+
+def payments(conn):
+    return query_df(conn, """
+        SELECT p.id AS payment_id, p.amount, p.date, p.method, p.reference,
+               i.id AS invoice_id, i.type AS invoice_type, t.name AS counterparty
+        FROM Payment p
+        JOIN Invoice i ON i.id = p.invoiceId
+        LEFT JOIN ThirdParty t ON t.id = i.thirdPartyId
+    """, dates=['date'])
+
+def payments_by_month(conn):
+    df = payments(conn)
+    df['month'] = df['date'].dt.strftime('%Y-%m')
+    return df.groupby(['month', 'invoice_type'], sort=True)['amount'].agg(['count', 'sum']).reset_index()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', default=DEFAULT_DB)
+    parser.add_argument('--create-indexes', action='store_true', help="Create the recommended report indexes (writes to the database)")
+    args = parser.parse_args()
+
+    if args.create_indexes:
+        print(f"Created/verified {len(create_indexes(args.db))} indexes on {args.db}")
+
+    conn = connect(args.db)
+    for table in ('StockMovement', 'Stock', 'Invoice', 'Payment', 'Order', 'OrderItem'):
+        count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        print(f"{table:<14} {count:>9,} rows")
+    missing = missing_indexes(conn)
+    if missing:
+        print(f"Missing recommended indexes ({len(missing)}): {', '.join(missing)}")
+        print("Run with --create-indexes to add them.")
+
+    for label, fn in (('stock_on_hand', stock_on_hand), ('stock_movements', stock_movements), ('payments_by_month', payments_by_month)):
+        start = time.perf_counter()
+        df = fn(conn)
+        print(f"{label:<18} {len(df):>9,} rows {1000 * (time.perf_counter() - start):8.1f} ms")
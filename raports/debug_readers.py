@@ -1,7 +1,9 @@
-import pandas as pd
+import config
+import frame_cache
+import readers
 import os
 
-DATA_DIR = '/Users/oakkas/repos/akkademircelik_raporlar'
+DATA_DIR = config.DATA_DIR
 
 def debug_kuveyt():
     print("\n--- Debugging Kuveyt (HTML as XLS) ---")
@@ -11,7 +13,7 @@ def debug_kuveyt():
         print(f"Reading {f}...")
         try:
             # Try reading as HTML
-            dfs = pd.read_html(path)
+            dfs = frame_cache.read_html(path)
             print(f"Success! Found {len(dfs)} tables.")
             if dfs:
                 print(dfs[0].head())
@@ -23,21 +25,14 @@ def debug_ziraat():
     files = [f for f in os.listdir(DATA_DIR) if 'Ziraat' in f]
     for f in files:
         path = os.path.join(DATA_DIR, f)
-        print(f"Reading {f}...")
+        print(f"Reading {f} (sniffed: {readers.sniff_format(path)})...")
         try:
-            # Try reading with openpyxl, ignoring styles if possible (pandas doesn't expose this easily, but let's try basic read)
-            df = pd.read_excel(path, engine='openpyxl')
-            print("Success with openpyxl!")
-            print(df.head())
+            # Dispatch on the sniffed format; only falls back if the sniff was wrong
+            dfs, info = readers.read_table(path)
+            print(readers.describe(info))
+            print(dfs[0].head())
         except Exception as e:
-            print(f"Failed with openpyxl: {e}")
-            try:
-                # Maybe it's HTML too?
-                dfs = pd.read_html(path)
-                print("Success as HTML!")
-                print(dfs[0].head())
-            except Exception as e2:
-                print(f"Failed as HTML: {e2}")
+            print(f"Failed: {e}")
 
 def debug_akbank():
     print("\n--- Debugging Akbank (Header Offset) ---")
@@ -47,7 +42,7 @@ def debug_akbank():
         print(f"Reading {f}...")
         try:
             # Try finding the header
-            df = pd.read_excel(path, header=None)
+            df = frame_cache.read_excel(path, header=None)
             print("Raw first 10 rows:")
             print(df.head(10))
         except Exception as e:
@@ -1,8 +1,9 @@
-import pandas as pd
+import config
+import readers
 import os
 import glob
 
-DATA_DIR = '/Users/oakkas/repos/akkademircelik_raporlar'
+DATA_DIR = config.DATA_DIR
 
 def debug_ziraat_only():
     print("--- Debugging Ziraat Files ---")
@@ -11,28 +12,16 @@ def debug_ziraat_only():
     
     for f in files:
         print(f"\nFile: {os.path.basename(f)}")
+        print(f"Sniffed format: {readers.sniff_format(f)}")
         try:
-            # Try HTML
-            print("Attempting read_html...")
-            dfs = pd.read_html(f)
-            if dfs:
-                print(f"Success (HTML)! Found {len(dfs)} tables.")
-                df = dfs[0]
-                print("Columns:", df.columns.tolist())
-                print("Row 0:", df.iloc[0].tolist())
-            else:
-                print("read_html returned empty list.")
-        except Exception as e:
-            print(f"read_html failed: {e}")
-            
-        try:
-            # Try Excel
-            print("Attempting read_excel...")
-            df = pd.read_excel(f)
-            print("Success (Excel)!")
+            dfs, info = readers.read_table(f)
+            print(readers.describe(info))
+            print(f"Found {len(dfs)} tables.")
+            df = dfs[0]
             print("Columns:", df.columns.tolist())
+            print("Row 0:", df.iloc[0].tolist())
         except Exception as e:
-            print(f"read_excel failed: {e}")
+            print(f"Read failed: {e}")
 
 if __name__ == "__main__":
     debug_ziraat_only()
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import pickle
+
+import pandas as pd
+
+# On-disk cache of parsed DataFrames, shared by every loader in raports/.
+# Entries live next to the source files (DATA_DIR/.raports_cache) and are keyed
+# on the file path plus the reader and its arguments. Each entry remembers the
+# mtime, size and sha256 of the file it was built from; a stat mismatch triggers
+# a re-hash, and a content change evicts every cached variant of that file.
+
+CACHE_DIR_NAME = '.raports_cache'
+ENABLED = os.environ.get('RAPORTS_CACHE', '1') != '0'
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+def cache_dir(data_dir):
+    directory = os.environ.get('RAPORTS_CACHE_DIR') or os.path.join(os.path.abspath(data_dir), CACHE_DIR_NAME)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+def cache_dir_for(path):
+    return cache_dir(os.path.dirname(os.path.abspath(path)))
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _key(*parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=repr).encode('utf-8')).hexdigest()[:20]
+
+def _meta_path(directory, path):
+    return os.path.join(directory, _key(os.path.abspath(path)) + '.json')
+
+def _load_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_meta(meta_path, meta):
+    # Write-then-rename so concurrent readers never see a half-written entry
+    tmp = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, meta_path)
+
+def _evict(directory, meta):
+    for variant in meta.get('variants', {}).values():
+        for name in variant['files']:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+def _current_meta(directory, path):
+    meta_path = _meta_path(directory, path)
+    meta = _load_meta(meta_path)
+    st = os.stat(path)
+
+    if meta and meta['mtime_ns'] == st.st_mtime_ns and meta['size'] == st.st_size:
+        return meta_path, meta
+
+    digest = file_hash(path)
+    if meta and meta['sha256'] == digest:
+        # Touched but unchanged (e.g. re-downloaded export): keep the parsed frames
+        meta['mtime_ns'] = st.st_mtime_ns
+        meta['size'] = st.st_size
+        _save_meta(meta_path, meta)
+        return meta_path, meta
+
+    if meta:
+        _evict(directory, meta)
+    meta = {
+        'path': os.path.abspath(path),
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'sha256': digest,
+        'variants': {},
+    }
+    _save_meta(meta_path, meta)
+    return meta_path, meta
+
+def _write_frame(directory, base, df):
+    # Parquet for anything Arrow can represent with the same labels; pickle for
+    # the raw, mixed-type frames that come straight out of bank exports.
+    if HAS_PARQUET and all(isinstance(c, str) for c in df.columns):
+        name = base + '.parquet'
+        try:
+            df.to_parquet(os.path.join(directory, name))
+            return name
+        except Exception:
+            pass
+    name = base + '.pkl'
+    with open(os.path.join(directory, name), 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return name
+
+def _read_frame(directory, name):
+    full = os.path.join(directory, name)
+    if name.endswith('.parquet'):
+        return pd.read_parquet(full)
+    with open(full, 'rb') as f:
+        return pickle.load(f)
+
+def cached_read(reader_name, reader, path, **kwargs):
+    if not ENABLED:
+        return reader(path, **kwargs)
+
+    directory = cache_dir_for(path)
+    meta_path, meta = _current_meta(directory, path)
+    variant_key = _key(reader_name, kwargs)
+    variant = meta['variants'].get(variant_key)
+
+    if variant:
+        try:
+            frames = [_read_frame(directory, name) for name in variant['files']]
+            return frames if variant['is_list'] else frames[0]
+        except (OSError, ValueError, pickle.UnpicklingError):
+            pass  # Damaged entry, fall through and rebuild it
+
+    result = reader(path, **kwargs)
+    is_list = isinstance(result, list)
+    frames = result if is_list else [result]
+    base = f"{_key(meta['path'])}-{meta['sha256'][:12]}-{variant_key}"
+    files = [_write_frame(directory, f"{base}-{i}", df) for i, df in enumerate(frames)]
+
+    # Re-read the entry in case another process added variants meanwhile
+    latest = _load_meta(meta_path)
+    if latest and latest.get('sha256') == meta['sha256']:
+        meta = latest
+    meta['variants'][variant_key] = {'reader': reader_name, 'args': repr(kwargs), 'is_list': is_list, 'files': files}
+    _save_meta(meta_path, meta)
+    return result
+
+def read_excel(path, **kwargs):
+    return cached_read('read_excel', pd.read_excel, path, **kwargs)
+
+def read_html(path, **kwargs):
+    return cached_read('read_html', pd.read_html, path, **kwargs)
+
+def clear_cache(data_dir):
+    directory = cache_dir(data_dir)
+    removed = 0
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+        removed += 1
+    return removed
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3 or sys.argv[1] != '--clear':
+        print("Usage: python frame_cache.py --clear DATA_DIR")
+        sys.exit(1)
+    print(f"Removed {clear_cache(sys.argv[2])} cache files.")
@@ -0,0 +1,102 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bank_profiles
+import readers
+import tracing
+
+# Fans statement parsing out over a process pool. Jobs are plain dicts
+# ({'path', 'source', 'kwargs'}) so they pickle cleanly; results come back in
+# job order no matter which worker finishes first. The parser for each file is
+# picked by readers.read_table from the file's leading bytes.
+
+DEFAULT_WORKERS = int(os.environ.get('RAPORTS_WORKERS', '0')) or None
+
+
+def make_job(path, source, **kwargs):
+    return {'path': path, 'source': source, 'kwargs': kwargs}
+
+def bank_jobs(data_dir):
+    jobs = []
+
+    # Kuveyt (HTML as XLS)
+    for f in sorted(glob.glob(os.path.join(data_dir, '*Kuveyt*.xls'))):
+        jobs.append(make_job(f, 'Kuveyt'))
+
+    # Ziraat (real XLSX, or HTML saved as .xlsx)
+    for f in sorted(glob.glob(os.path.join(data_dir, '*Ziraat*.xlsx'))):
+        jobs.append(make_job(f, 'Ziraat'))
+
+    # Akbank (Header offset); "Akka" exports are Akbank statements too
+    akbank_files = glob.glob(os.path.join(data_dir, '*Akbank*.xlsx')) + glob.glob(os.path.join(data_dir, '*Akka*.xlsx'))
+    for f in sorted(set(akbank_files)):
+        if 'Ziraat' in f: continue # Safety check
+        jobs.append(make_job(f, 'Akbank', header=9))
+
+    return jobs
+
+def read_job(job):
+    start = time.perf_counter()
+    result = {
+        'path': job['path'],
+        'file': os.path.basename(job['path']),
+        'source': job['source'],
+        'frames': [],
+        'parser': None,
+        'error': None,
+    }
+    with tracing.stage(f"parse {result['file']}", 'parse', source=job['source'], bytes_read=os.path.getsize(job['path'])) as span:
+        _read_into(result, job)
+        span.set(rows_out=sum(len(df) for df in result['frames']))
+        if result['error']:
+            span.set(error=result['error']['message'])
+    result['seconds'] = time.perf_counter() - start
+    result['trace'] = tracing.drain()
+    return result
+
+def _read_into(result, job):
+    try:
+        if 'layout' in job:
+            # Bank statement read through its learned layout profile (may be None)
+            df, result['layout'], result['parser'], result['redetected'] = bank_profiles.read_statement(job['path'], job['source'], job['layout'])
+            result['frames'] = [] if df is None else [df]
+        else:
+            result['frames'], result['parser'] = readers.read_table(job['path'], **job['kwargs'])
+    except Exception as e:
+        try:
+            fmt = readers.sniff_format(job['path'])
+        except OSError:
+            fmt = readers.UNKNOWN
+        result['error'] = {
+            'file': result['file'],
+            'source': job['source'],
+            'format': fmt,
+            'type': type(e).__name__,
+            'message': str(e),
+        }
+
+def run(jobs, workers=None):
+    workers = workers or DEFAULT_WORKERS or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        results = [read_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            # map() yields in submission order, which keeps the merge deterministic
+            results = list(pool.map(read_job, jobs))
+    for r in results:
+        tracing.merge(r.pop('trace', None))
+    return results
+
+def errors_of(results):
+    return [r['error'] for r in results if r['error']]
+
+def print_errors(results):
+    for err in errors_of(results):
+        print(f"Error loading {err['file']} ({err['source']}, {err['format']}): {err['type']}: {err['message']}")
+
+def print_parsers(results):
+    for r in results:
+        if r['parser']:
+            print(readers.describe(r['parser']))
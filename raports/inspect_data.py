@@ -1,33 +1,34 @@
+import argparse
+import config
+import catalog
 import pandas as pd
-import os
-import glob
 
-DATA_DIR = '/Users/oakkas/repos/akkademircelik_raporlar'
+DATA_DIR = config.DATA_DIR
 
-def inspect_files():
-    files = glob.glob(os.path.join(DATA_DIR, '*.*'))
-    excel_files = [f for f in files if f.endswith(('.xls', '.xlsx'))]
-    
-    print(f"Found {len(excel_files)} Excel files.")
-    
-    for file_path in excel_files:
+def inspect_files(workers=None):
+    # Columns and sample rows come from the metadata catalog; only files that
+    # changed since the last run are opened again
+    entries = catalog.update(DATA_DIR, workers=workers)[0]['files']
+
+    print(f"Found {len(entries)} Excel files.")
+
+    for name, entry in sorted(entries.items()):
         print(f"\n{'='*50}")
-        print(f"Inspecting: {os.path.basename(file_path)}")
+        print(f"Inspecting: {name}")
         print(f"{'='*50}")
-        
-        try:
-            # Try reading with default engine first, then openpyxl/xlrd if needed
-            if file_path.endswith('.xlsx'):
-                df = pd.read_excel(file_path, engine='openpyxl', nrows=5)
-            else:
-                df = pd.read_excel(file_path, engine='xlrd', nrows=5)
-                
-            print(f"Columns: {list(df.columns)}")
-            print("\nFirst 3 rows:")
-            print(df.head(3).to_string())
-            
-        except Exception as e:
-            print(f"ERROR reading {os.path.basename(file_path)}: {e}")
+
+        if entry['error']:
+            print(f"ERROR reading {name}: {entry['error']}")
+            continue
+
+        print(f"Format: {entry['format']}, header row {entry['header_row']}, {entry['rows']} rows"
+              + (f", {entry['date_min']} - {entry['date_max']}" if entry['date_min'] else ''))
+        print(f"Columns: {entry['columns']}")
+        print("\nFirst 3 rows:")
+        print(pd.DataFrame(entry['sample'], columns=entry['columns']).to_string())
 
 if __name__ == "__main__":
-    inspect_files()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    inspect_files(workers=args.workers)
@@ -1,33 +1,49 @@
-import pandas as pd
+import config
+import streaming
 import os
+import pandas as pd
 
-DATA_DIR = '/Users/oakkas/repos/akkademircelik_raporlar'
+DATA_DIR = config.DATA_DIR
 
 def inspect_stock_types():
     print("--- Inspecting Stock Movement Types ---")
-    
+
     files = {
-        'In (Alış)': 'Genel alış stok hareket föyü.xlsx',
-        'Out (Satış)': 'Genel  satış stok hareket föyü.xlsx'
+        'In (Alış)': 'Genel alış stok hareket föyü.xlsx',
+        'Out (Satış)': 'Genel  satış stok hareket föyü.xlsx'
     }
-    
+    # Check if there are any production related terms
+    prod_terms = ['ÜRETİM', 'SARF', 'İMALAT', 'HAMMADDE']
+
     for label, filename in files.items():
         path = os.path.join(DATA_DIR, filename)
         try:
-            df = pd.read_excel(path)
-            if 'EVRAK TİPİ' in df.columns:
+            # Scan the ledger chunk by chunk, keeping only the distinct types,
+            # a match count and the first few matching rows
+            doc_types = {}
+            found_count = 0
+            samples = []
+            has_column = False
+            for chunk in streaming.iter_chunks(path, columns=['EVRAK TİPİ', 'STOK İSMİ']):
+                if 'EVRAK TİPİ' not in chunk.columns:
+                    break
+                has_column = True
+                doc_types.update(dict.fromkeys(chunk['EVRAK TİPİ'].unique().tolist()))
+                found = chunk[chunk['EVRAK TİPİ'].astype(str).str.upper().str.contains('|'.join(prod_terms), na=False)]
+                found_count += len(found)
+                sample_rows = sum(len(s) for s in samples)
+                if sample_rows < 3 and not found.empty:
+                    samples.append(found.head(3 - sample_rows))
+
+            if has_column:
                 print(f"\n{label} - Unique Document Types:")
-                print(df['EVRAK TİPİ'].unique().tolist())
-                
-                # Check if there are any production related terms
-                prod_terms = ['ÜRETİM', 'SARF', 'İMALAT', 'HAMMADDE']
-                found = df[df['EVRAK TİPİ'].astype(str).str.upper().str.contains('|'.join(prod_terms), na=False)]
-                if not found.empty:
-                    print(f"  Found production-related records: {len(found)}")
-                    print(found[['EVRAK TİPİ', 'STOK İSMİ']].head(3).to_string())
+                print(list(doc_types))
+                if found_count:
+                    print(f"  Found production-related records: {found_count}")
+                    print(pd.concat(samples)[['EVRAK TİPİ', 'STOK İSMİ']].to_string())
             else:
                 print(f"\n{label} - 'EVRAK TİPİ' column not found.")
-                
+
         except Exception as e:
             print(f"Error reading {filename}: {e}")
 
@@ -0,0 +1,179 @@
+import datetime
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+
+import amounts
+import bank_profiles
+import frame_cache
+import ingest
+import readers
+import schema
+import tracing
+
+# Persistent, append-only store of normalized bank transactions. Only statement
+# files that are new or whose content changed get parsed; every row is keyed by
+# a (bank, date, amount, description, balance) fingerprint, so overlapping
+# exports (a monthly Akbank file plus the daily ones inside it) are counted once.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    bank TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    new_rows INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    fingerprint TEXT PRIMARY KEY,
+    bank TEXT NOT NULL,
+    date TEXT,
+    amount_kurus INTEGER NOT NULL,
+    description TEXT,
+    balance_kurus INTEGER,
+    file TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_bank_date ON transactions (bank, date);
+"""
+
+
+def parse_dates(series):
+    dates = pd.to_datetime(series, format='%d.%m.%Y', errors='coerce')
+    missing = dates.isna() & series.notna()
+    if missing.any():
+        dates[missing] = pd.to_datetime(series[missing], dayfirst=True, errors='coerce')
+    return dates
+
+def normalize_bank_frame(df, bank):
+    # df comes from bank_profiles.read_statement: header applied, lowercased
+    cols = bank_profiles.pick_columns(df.columns)
+
+    if cols['amount']:
+        amount = amounts.parse_amounts(df[cols['amount']])
+    elif cols['debit'] and cols['credit']:
+        amount = amounts.parse_amounts(df[cols['credit']]).fillna(0) - amounts.parse_amounts(df[cols['debit']]).fillna(0)
+    else:
+        return None
+
+    out = pd.DataFrame({
+        'bank': bank,
+        'date': parse_dates(df[cols['date']]) if cols['date'] else pd.NaT,
+        'amount_kurus': to_kurus(amount),
+        'description': df[cols['description']].astype(schema.TEXT).str.strip() if cols['description'] else pd.NA,
+        'balance_kurus': to_kurus(amounts.parse_amounts(df[cols['balance']])) if cols['balance'] else pd.NA,
+    })
+    # Drop the trailer/summary rows that carry neither a date nor an amount
+    out = out[out['amount_kurus'].notna() & out['date'].notna()].reset_index(drop=True)
+    return schema.compact(out)
+
+def to_kurus(values):
+    return (values * 100).round().astype('Int64')
+
+def fingerprints(df):
+    key = (
+        df['bank'].astype(str) + '|'
+        + df['date'].dt.strftime('%Y-%m-%d') + '|'
+        + df['amount_kurus'].astype(str) + '|'
+        + df['description'].fillna('').str.upper().str.split().str.join(' ') + '|'
+        + df['balance_kurus'].astype('string').fillna('')
+    )
+    return [hashlib.sha1(k.encode('utf-8')).hexdigest() for k in key]
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _needs_ingest(conn, path):
+    st = os.stat(path)
+    row = conn.execute("SELECT sha256, mtime_ns, size FROM files WHERE path = ?", (path,)).fetchone()
+    if row and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+        return False, row[0]
+    digest = frame_cache.file_hash(path)
+    return not (row and row[0] == digest), digest
+
+def sync(conn, jobs, workers=None, profiles_file=None):
+    profiles = bank_profiles.load_profiles(profiles_file) if profiles_file else {}
+    pending = []
+    for job in jobs:
+        changed, digest = _needs_ingest(conn, job['path'])
+        if changed:
+            key = bank_profiles.profile_key(job['source'], readers.sniff_format(job['path']))
+            pending.append((dict(job, layout=profiles.get(key)), digest))
+        else:
+            # Same content under a new mtime: remember the stat so we skip hashing next time
+            st = os.stat(job['path'])
+            conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", (st.st_mtime_ns, st.st_size, job['path']))
+
+    results = ingest.run([job for job, _ in pending], workers=workers)
+    stats = {'files_seen': len(jobs), 'files_parsed': len(pending), 'rows': 0, 'new_rows': 0, 'redetected': [], 'results': results}
+    now = datetime.datetime.now().isoformat(timespec='seconds')
+
+    for (job, digest), r in zip(pending, results):
+        if r['error']:
+            continue  # Leave it out of `files` so the next run retries it
+        if r.get('redetected') and r.get('layout'):
+            profile = r['layout']
+            profiles[bank_profiles.profile_key(profile['bank'], profile['format'])] = profile
+            stats['redetected'].append(r['file'])
+        with tracing.stage(f"normalize {r['file']}", 'ledger', rows_in=sum(len(f) for f in r['frames'])) as span:
+            df = normalize_bank_frame(r['frames'][0], job['source']) if r['frames'] else None
+            span.set(rows_out=0 if df is None else len(df))
+        if df is None:
+            print(f"  {r['file']}: no amount columns found, skipped")
+            continue
+
+        df['fingerprint'] = fingerprints(df)
+        rows = [
+            (fp, bank, d, int(a), desc if isinstance(desc, str) else None, None if pd.isna(b) else int(b), job['path'], now)
+            for fp, bank, d, a, desc, b in zip(
+                df['fingerprint'], df['bank'], df['date'].dt.strftime('%Y-%m-%d'),
+                df['amount_kurus'], df['description'], df['balance_kurus'],
+            )
+        ]
+        with conn, tracing.stage(f"insert {r['file']}", 'ledger', rows_in=len(rows)) as span:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            new_rows = conn.total_changes - before
+            span.set(rows_out=new_rows)
+            st = os.stat(job['path'])
+            conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job['path'], job['source'], digest, st.st_mtime_ns, st.st_size, len(rows), new_rows, now),
+            )
+        stats['rows'] += len(rows)
+        stats['new_rows'] += new_rows
+
+    conn.commit()
+    if profiles_file and stats['redetected']:
+        bank_profiles.save_profiles(profiles_file, profiles)
+    stats['duplicate_rows'] = stats['rows'] - stats['new_rows']
+    return stats
+
+def bank_totals(conn, start=None, end=None):
+    sql = """
+        SELECT bank,
+               COUNT(*) AS rows,
+               SUM(CASE WHEN amount_kurus > 0 THEN amount_kurus ELSE 0 END) / 100.0 AS inflow,
+               -SUM(CASE WHEN amount_kurus < 0 THEN amount_kurus ELSE 0 END) / 100.0 AS outflow,
+               MIN(date) AS first_date,
+               MAX(date) AS last_date
+        FROM transactions
+        WHERE (? IS NULL OR date >= ?) AND (? IS NULL OR date <= ?)
+        GROUP BY bank
+        ORDER BY bank
+    """
+    return pd.read_sql_query(sql, conn, params=(start, start, end, end))
+
+def transactions(conn, bank=None):
+    # In the compact schema (schema.TRANSACTION_DTYPES); amounts stay in kuruş
+    sql = "SELECT bank, date, amount_kurus, description, balance_kurus, file FROM transactions WHERE (? IS NULL OR bank = ?) ORDER BY date, bank"
+    df = pd.read_sql_query(sql, conn, params=(bank, bank))
+    df['file'] = df['file'].map(os.path.basename)
+    return schema.compact(df)
@@ -1,45 +1,64 @@
-import pandas as pd
+import aggregate
+import config
+import frame_cache
+import report_writer
+import argparse
 import os
 import datetime
 
-DATA_DIR = '/Users/oakkas/repos/akkademircelik_raporlar'
+DATA_DIR = config.DATA_DIR
 OUTPUT_FILE = os.path.join(DATA_DIR, 'Full_Expense_List.md')
 
-def generate_expense_list():
+def clean_expenses(df):
+    if 'Hesap adı' in df.columns:
+        df = df[df['Hesap adı'].notna()]
+        df = df[~df['Hesap adı'].astype(str).str.upper().str.contains('TOPLAM')]
+        df = df[~df['Hesap adı'].astype(str).str.upper().str.contains('RAPOR')]
+
+    # Rank by amount; the full list needs a full sort, so no partial selection here
+    if 'TL Borç' in df.columns:
+        df = aggregate.top_n(df, 'TL Borç')
+    return df
+
+EXPENSE_COLUMNS = ['Hesap adı', 'TL Borç']
+EXPENSE_HEADERS = ['Expense Account', 'Amount (TL)']
+
+def expense_list_preamble(df, locale='en'):
+    return [
+        "# Full Expense List",
+        f"Date: {datetime.datetime.now().strftime('%Y-%m-%d')}",
+        f"Total Items: {len(df)}",
+        f"Total Amount: {aggregate.format_amounts([df['TL Borç'].sum()], locale=locale)[0]} TL",
+        "",
+    ]
+
+def expense_list_lines(df, locale='en'):
+    lines = expense_list_preamble(df, locale)
+    lines.extend(aggregate.markdown_table(df, EXPENSE_COLUMNS, EXPENSE_HEADERS, amount_cols=['TL Borç'], locale=locale))
+    return lines
+
+def generate_expense_list(formats=('md',), locale='en'):
     print("Generating Full Expense List...")
     try:
-        df = pd.read_excel(os.path.join(DATA_DIR, 'Masraf durum raporu.xls'))
+        df = frame_cache.read_excel(os.path.join(DATA_DIR, 'Masraf durum raporu.xls'))
         
         # Clean data
-        if 'Hesap adı' in df.columns:
-            df = df[df['Hesap adı'].notna()]
-            df = df[~df['Hesap adı'].astype(str).str.upper().str.contains('TOPLAM')]
-            df = df[~df['Hesap adı'].astype(str).str.upper().str.contains('RAPOR')]
-        
-        # Sort by amount descending
-        if 'TL Borç' in df.columns:
-            df = df.sort_values('TL Borç', ascending=False)
-        
-        lines = []
-        lines.append("# Full Expense List")
-        lines.append(f"Date: {datetime.datetime.now().strftime('%Y-%m-%d')}")
-        lines.append(f"Total Items: {len(df)}")
-        lines.append(f"Total Amount: {df['TL Borç'].sum():,.2f} TL")
-        lines.append("\n| Expense Account | Amount (TL) |")
-        lines.append("|---|---|")
-        
-        for _, row in df.iterrows():
-            name = row['Hesap adı'] if 'Hesap adı' in df.columns else 'Unknown'
-            amount = row['TL Borç'] if 'TL Borç' in df.columns else 0
-            lines.append(f"| {name} | {amount:,.2f} |")
-            
-        with open(OUTPUT_FILE, 'w') as f:
-            f.write("\n".join(lines))
+        df = clean_expenses(df)
+
+        # Streamed to every requested format in one pass over the rows
+        paths = [os.path.splitext(OUTPUT_FILE)[0] + '.' + fmt for fmt in formats]
+        report_writer.write(report_writer.chunks_of(df), paths, EXPENSE_COLUMNS, EXPENSE_HEADERS,
+                            amount_cols=['TL Borç'], locale=locale, preamble=expense_list_preamble(df, locale))
             
-        print(f"Expense list saved to {OUTPUT_FILE}")
+        for path in paths:
+            print(f"Expense list saved to {path}")
         
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    generate_expense_list()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--formats', nargs='+', default=['md'], choices=['md', 'csv', 'xlsx', 'parquet'])
+    parser.add_argument('--locale', default='en', choices=sorted(aggregate.LOCALES), help="Amount style: en 1,234.56 or tr 1.234,56")
+    args = parser.parse_args()
+    generate_expense_list(args.formats, args.locale)
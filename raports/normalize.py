@@ -0,0 +1,68 @@
+import re
+
+import pandas as pd
+
+# Company and person names as the exports and bank descriptions write them,
+# reduced to one comparable form. Shared by counterparties (joining reports),
+# reconcile (payee names against bank descriptions) and cashflow_cube
+# (categorising descriptions), so the three agree on what a name is.
+#
+#   fold('Çelik Sanayi')                          -> 'CELIK SANAYI'
+#   name_key('AİR LİQUİDE GAZ SAN. VE TİC. A.Ş.')  -> 'AIR LIQUIDE GAZ'
+
+TRANSLITERATE = str.maketrans({'i': 'İ', 'ı': 'I'})
+FOLD = str.maketrans('ÇĞİÖŞÜÂÎÛ', 'CGIOSUAIU')
+# The company itself as the reports write it
+OWN_COMPANY = 'AKKA DEMİR ÇELİK SANAYİ VE TİCARET LİMİTED ŞİRKETİ'
+# Legal form and filler words; they say what kind of company it is, not which
+LEGAL_WORDS = {
+    'VE', 'SANAYI', 'SAN', 'SANAYII', 'TICARET', 'TIC', 'TICARI', 'LIMITED', 'LTD', 'SIRKETI', 'STI', 'SIRK',
+    'ANONIM', 'AS', 'A', 'S', 'TAS', 'KOLLEKTIF', 'KOMANDIT', 'IC', 'DIS', 'ITHALAT', 'IHRACAT', 'ITH', 'IHR',
+    'PAZARLAMA',
+}
+DOTTED_INITIALS = re.compile(r'\b(?:\w\.){2,}')
+NON_WORD = re.compile(r'[\W_]+')
+
+
+def fold(text):
+    # Turkish uppercase (i -> İ, ı -> I), then ASCII: ERP exports uppercase the
+    # Turkish way, bank descriptions often lose the accents
+    return text.translate(TRANSLITERATE).upper().translate(FOLD)
+
+def fold_series(values):
+    # fold over a column, '' for missing values
+    text = pd.Series(values, dtype='string').fillna('')
+    return text.str.translate(TRANSLITERATE).str.upper().str.translate(FOLD)
+
+def name_key(name):
+    # Folded words without punctuation or legal-form words; '' for a non-string
+    if not isinstance(name, str):
+        return ''
+    text = DOTTED_INITIALS.sub(lambda m: m.group(0).replace('.', ''), fold(name))
+    return ' '.join(w for w in NON_WORD.sub(' ', text).split() if w not in LEGAL_WORDS)
+
+def abbreviation(word, min_letters=3):
+    # Regex for a folded word or any shortening of it that keeps the first
+    # letter and the order of the rest: DEMIR, DMR, DEM; LIMITED, LTD
+    rest = ''.join(f"{c}?" for c in word[1:])
+    return f"(?=[A-Z]{{{min(min_letters, len(word))}}}){word[0]}{rest}"
+
+def name_pattern(name, words=None):
+    # Regex over fold()ed text for the first `words` words of a name, each
+    # written out or abbreviated, with any punctuation between them ('AKKA
+    # DMR.ÇELİK SAN.VE TİC.LTD.'); VE may be left out. The last word only
+    # needs its first letter, as descriptions are often cut off mid-word.
+    parts = NON_WORD.sub(' ', fold(name)).split()[:words]
+    pattern = '(?<![A-Z])'
+    for n, word in enumerate(parts):
+        if n == len(parts) - 1:
+            pattern += abbreviation(word, min_letters=1)
+        elif word == 'VE':
+            pattern += r'(?:VE(?![A-Z])[\W_]*)?'
+        else:
+            pattern += abbreviation(word) + r'(?![A-Z])[\W_]*'
+    return pattern
+
+def name_words(name):
+    # The words of name_key as a set, single letters left out
+    return frozenset(w for w in name_key(name).split() if len(w) > 1)
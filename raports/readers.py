@@ -0,0 +1,108 @@
+import os
+import time
+
+import frame_cache
+
+# Reader registry keyed on the sniffed file format. Bank and ERP exports lie
+# about their extension (Kuveyt .xls files are HTML, some Ziraat .xlsx files
+# are real workbooks and some are not), so we look at the leading bytes and go
+# straight to the matching parser instead of trying read_html and catching.
+
+XLSX = 'xlsx'
+XLS = 'xls'
+HTML = 'html'
+UNKNOWN = 'unknown'
+
+ZIP_MAGIC = b'PK\x03\x04'
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+SNIFF_BYTES = 512
+
+
+def sniff(path):
+    # Returns (format, by_magic). by_magic is False when the leading bytes did
+    # not match any signature and we fell back to the file extension.
+    with open(path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+
+    if head.startswith(ZIP_MAGIC):
+        return XLSX, True
+    if head.startswith(OLE2_MAGIC):
+        return XLS, True
+
+    for bom in BOMS:
+        if head.startswith(bom):
+            head = head[len(bom):]
+            break
+    # UTF-16 exports interleave NUL bytes; drop them before looking for markup
+    text = head.replace(b'\x00', b'').lstrip().lower()
+    if text.startswith(b'<'):
+        return HTML, True
+
+    ext = os.path.splitext(path)[1].lower()
+    return {'.xlsx': XLSX, '.xls': XLS, '.htm': HTML, '.html': HTML}.get(ext, UNKNOWN), False
+
+def sniff_format(path):
+    return sniff(path)[0]
+
+def _read_xlsx(path, **kwargs):
+    return [frame_cache.read_excel(path, engine='openpyxl', **kwargs)]
+
+def _read_xls(path, **kwargs):
+    return [frame_cache.read_excel(path, engine='xlrd', **kwargs)]
+
+def _read_html(path, **kwargs):
+    return frame_cache.read_html(path, **kwargs)
+
+PARSERS = {
+    XLSX: _read_xlsx,
+    XLS: _read_xls,
+    HTML: _read_html,
+}
+
+# Tried in this order only when the format came from the extension alone; a
+# matching signature is trusted and goes straight to one parser
+FALLBACKS = {
+    XLSX: [HTML, XLS],
+    XLS: [HTML, XLSX],
+    HTML: [XLSX, XLS],
+    UNKNOWN: [HTML, XLSX, XLS],
+}
+
+def read_table(path, **kwargs):
+    # Returns (frames, info). info records which parser was used so a wrong
+    # guess, and the time it cost, shows up in the load summary.
+    sniffed, by_magic = sniff(path)
+    candidates = [sniffed] if by_magic else ([sniffed] if sniffed in PARSERS else []) + FALLBACKS[sniffed]
+    info = {
+        'file': os.path.basename(path),
+        'sniffed': sniffed,
+        'by_magic': by_magic,
+        'parser': None,
+        'misdetected': False,
+        'wasted_seconds': 0.0,
+    }
+
+    first_error = None
+    for fmt in candidates:
+        start = time.perf_counter()
+        try:
+            frames = PARSERS[fmt](path, **kwargs)
+        except Exception as e:
+            info['wasted_seconds'] += time.perf_counter() - start
+            first_error = first_error or e
+            continue
+        info['parser'] = fmt
+        info['misdetected'] = fmt != sniffed
+        info['seconds'] = time.perf_counter() - start
+        return frames, info
+
+    # The first candidate's error is the meaningful one; later ones are guesses
+    raise first_error
+
+def describe(info):
+    how = 'signature' if info['by_magic'] else 'extension'
+    line = f"  {info['file']}: sniffed {info['sniffed']} ({how}), parsed as {info['parser']}"
+    if info['misdetected']:
+        line += f" (misdetected, {info['wasted_seconds']:.2f}s wasted)"
+    return line
@@ -0,0 +1,172 @@
+import argparse
+import bisect
+import os
+
+import numpy as np
+import pandas as pd
+
+import aggregate
+import bank_profiles
+import config
+import db
+import ingest
+import ledger
+import normalize
+
+DATA_DIR = config.DATA_DIR
+LEDGER_FILE = os.path.join(DATA_DIR, 'bank_ledger.db')
+
+# Matches bank ledger lines to ERP payments. Payments are indexed by direction
+# and amount in kuruş (hash) and, within each key, by date (sorted list), so each
+# bank line only looks at the handful of payments with the same amount, going
+# the same way, inside the date window: O(n log m) instead of comparing every
+# pair. A sales payment is money in, a purchase or expense payment money out
+# (negative amounts, credit notes, the other way round). Counterparty names
+# then break ties: the share of the payee's name words (normalize.name_words)
+# that appear in the bank description. Payments that cannot be matched at all
+# (an invoice type with no known direction, no date) are returned with the
+# unmatched ones under their own reason instead of being dropped.
+
+DATE_WINDOW_DAYS = 3
+MIN_NAME_SCORE = 0.5
+# Invoice type -> sign of the payment as seen on the bank statement
+FLOW_SIGN = {'SALES': 1, 'PURCHASE': -1, 'EXPENSE': -1}
+NO_BANK_LINE = 'no bank line'
+
+
+def name_score(payee_words, description_words):
+    if not payee_words:
+        return 0.0
+    return len(payee_words & description_words) / len(payee_words)
+
+def load_payments(db_path):
+    conn = db.connect(db_path)
+    try:
+        df = db.payments(conn)
+    finally:
+        conn.close()
+    df['date'] = df['date'].dt.normalize()
+    df['amount_kurus'] = signed_kurus(df)
+    return df
+
+def signed_kurus(payments):
+    # Signed like the bank ledger: positive in, negative out; NA for an
+    # unknown invoice type
+    return ledger.to_kurus(payments['amount'] * payments['invoice_type'].map(FLOW_SIGN))
+
+def index_keys(kurus):
+    # (direction, absolute kuruş) per signed amount
+    kurus = np.asarray(kurus, dtype='int64')
+    return list(zip(np.where(kurus < 0, 'out', 'in').tolist(), np.abs(kurus).tolist()))
+
+def build_index(payments):
+    # {(direction, kuruş): (sorted day numbers, payment row positions in the same order)}
+    days = payments['date'].to_numpy(dtype='datetime64[D]').astype('int64')
+    index = {}
+    for kurus, positions in payments.groupby('amount_kurus', sort=False).indices.items():
+        order = positions[np.argsort(days[positions], kind='stable')]
+        index[index_keys([kurus])[0]] = (days[order].tolist(), order.tolist())
+    return index
+
+def reconcile(bank, payments, window_days=DATE_WINDOW_DAYS, min_score=MIN_NAME_SCORE):
+    # Returns (lines, unmatched_payments). lines is the bank frame plus status
+    # (matched / ambiguous / unmatched), payment_id, basis and candidate count;
+    # unmatched_payments has a reason column (NO_BANK_LINE, or why the payment
+    # could not be looked for). A payment is used for at most one bank line;
+    # lines are settled in date order.
+    usable = payments['amount_kurus'].notna() & payments['date'].notna()
+    skipped = payments[~usable].reset_index(drop=True)
+    skipped = skipped.assign(reason=np.where(skipped['amount_kurus'].isna(), 'unknown invoice type', 'no date'))
+    payments = payments[usable].reset_index(drop=True)
+    bank = bank.reset_index(drop=True)
+    index = build_index(payments)
+    payee_words = [normalize.name_words(n) for n in payments['counterparty']]
+    used = np.zeros(len(payments), dtype=bool)
+
+    bank_days = bank['date'].to_numpy(dtype='datetime64[D]').astype('int64')
+    bank_keys = index_keys(bank['amount_kurus'])
+    status = np.full(len(bank), 'unmatched', dtype=object)
+    matched_id = np.full(len(bank), None, dtype=object)
+    basis = np.full(len(bank), '', dtype=object)
+    candidates = np.zeros(len(bank), dtype='int64')
+
+    for i in np.argsort(bank_days, kind='stable'):
+        entry = index.get(bank_keys[i])
+        if entry is None:
+            continue
+        days, rows = entry
+        lo = bisect.bisect_left(days, bank_days[i] - window_days)
+        hi = bisect.bisect_right(days, bank_days[i] + window_days)
+        found = [k for k in range(lo, hi) if not used[rows[k]]]
+        candidates[i] = len(found)
+        if not found:
+            continue
+
+        # Best name score first, then the closest date
+        description = normalize.name_words(bank.at[i, 'description'])
+        scored = sorted(((name_score(payee_words[rows[k]], description), -abs(days[k] - bank_days[i]), rows[k]) for k in found), reverse=True)
+        named = [s for s in scored if s[0] >= min_score]
+        if len(named) == 1 or (len(named) > 1 and named[0][0] > named[1][0]):
+            pick, basis[i] = named[0][2], 'amount+date+name'
+        elif not named and len(found) == 1:
+            pick, basis[i] = rows[found[0]], 'amount+date'
+        else:
+            status[i] = 'ambiguous'
+            continue
+        status[i] = 'matched'
+        matched_id[i] = payments.at[pick, 'payment_id']
+        used[pick] = True
+
+    lines = bank.assign(status=status, payment_id=matched_id, basis=basis, candidates=candidates)
+    lines = lines.merge(payments[['payment_id', 'invoice_id', 'invoice_type', 'counterparty']], on='payment_id', how='left')
+    unmatched = pd.concat([payments[~used].assign(reason=NO_BANK_LINE), skipped], ignore_index=True)
+    return lines, unmatched
+
+def summary_lines(lines, unmatched_payments):
+    out = ["# Bank Reconciliation", ""]
+    counts = lines['status'].value_counts()
+    # Totals are summed in kuruş so they come out exact
+    for name in ('matched', 'ambiguous', 'unmatched'):
+        part = lines[lines['status'] == name]
+        out.append(f"- **{name.capitalize()}**: {counts.get(name, 0)} lines, {part['amount_kurus'].abs().sum() / 100:,.2f} TL")
+    unmatched = unmatched_payments[unmatched_payments['reason'] == NO_BANK_LINE]
+    out.append(f"- **ERP payments without a bank line**: {len(unmatched)}, {unmatched['amount_kurus'].abs().sum() / 100:,.2f} TL")
+    skipped = unmatched_payments[unmatched_payments['reason'] != NO_BANK_LINE]
+    for reason, part in skipped.groupby('reason'):
+        types = ', '.join(sorted(part['invoice_type'].dropna().astype(str).unique())) or 'none'
+        out.append(f"- **ERP payments not reconciled, {reason}**: {len(part)}, {part['amount'].abs().sum():,.2f} TL (invoice types: {types})")
+    for name in ('ambiguous', 'unmatched'):
+        part = lines[lines['status'] == name]
+        part = aggregate.top_n(part.assign(size=part['amount_kurus'].abs(), amount=part['amount_kurus'] / 100), 'size', 20)
+        if len(part):
+            out.append(f"\n## Largest {name} lines")
+            out.extend(aggregate.markdown_table(part, ['bank', 'date', 'description', 'amount'], ['Bank', 'Date', 'Description', 'Amount (TL)'], amount_cols=['amount']))
+    return out
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', default=db.DEFAULT_DB, help="ERP SQLite database (Prisma dev.db)")
+    parser.add_argument('--window', type=int, default=DATE_WINDOW_DAYS, help="Days either side of the bank date")
+    parser.add_argument('--min-score', type=float, default=MIN_NAME_SCORE)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    print("Loading Bank Data...")
+    conn = ledger.connect(LEDGER_FILE)
+    ledger.sync(conn, ingest.bank_jobs(DATA_DIR), workers=args.workers, profiles_file=bank_profiles.profiles_path(DATA_DIR))
+    bank = ledger.transactions(conn)
+    print("Loading ERP Payments...")
+    payments = load_payments(args.db)
+
+    lines, unmatched_payments = reconcile(bank, payments, args.window, args.min_score)
+    csv_lines = lines.assign(amount=lines['amount_kurus'] / 100)
+    for name in ('matched', 'ambiguous', 'unmatched'):
+        aggregate.to_csv(csv_lines[csv_lines['status'] == name], os.path.join(DATA_DIR, f"reconciliation_{name}.csv"))
+    aggregate.to_csv(unmatched_payments, os.path.join(DATA_DIR, 'reconciliation_unmatched_payments.csv'))
+
+    report = os.path.join(DATA_DIR, 'Reconciliation_Report.md')
+    with open(report, 'w') as f:
+        f.write("\n".join(summary_lines(lines, unmatched_payments)))
+    summary = summary_lines(lines, unmatched_payments)
+    print("\n".join(line for line in summary if line.startswith('- ')))
+    print(f"Reconciliation saved to {report}")
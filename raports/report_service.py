@@ -0,0 +1,300 @@
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+import analyze_finance
+import cashflow_cube
+import config
+import db
+import ingest
+import ledger
+import list_expenses
+import report_specs
+import stock_snapshots
+
+# Long-running report service. Loads the bank ledger and the report exports
+# once, keeps the frames in memory and answers report requests from them over
+# a small local HTTP API, so neither the scripts' import cost nor the workbook
+# parsing is paid per request. A watcher thread polls DATA_DIR and reloads only
+# the files whose size or mtime changed.
+#
+#   GET  /health                      what is loaded and when
+#   GET  /cash-flow?start=&end=       per-bank totals (JSON; format=md for text)
+#   GET  /cube?freq=&by=&view=        cash-flow cube rollup, compare or running
+#   GET  /expenses                    full expense list (Markdown; format=json)
+#   GET  /stock?as_of=&source=        stock totals, or balances on a date
+#   GET  /report                      the Financial Analysis Report (Markdown)
+#   POST /refresh                     check DATA_DIR for changes now
+#
+# Binds to 127.0.0.1 only; the Next.js dashboard calls it server-side.
+
+DATA_DIR = config.DATA_DIR
+LEDGER_FILE = analyze_finance.LEDGER_FILE
+SNAPSHOT_FILE = os.path.join(DATA_DIR, stock_snapshots.SNAPSHOT_NAME)
+POLL_SECONDS = 5.0
+STOCK_SOURCES = ('Stock_In', 'Stock_Out')
+NO_BANK_DATA = "No bank statements loaded."
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class ReportState:
+    def __init__(self):
+        self.lock = threading.Lock()  # one reload (or snapshot write) at a time
+        self.files = {}
+        self.bank_totals = None
+        self.cube = None
+        self.opening = {}
+        self.reports = {}
+        self.movements = {}
+        self.loaded_at = None
+
+    def watched_files(self):
+        # path -> ('bank', None) or ('report', report name)
+        files = {job['path']: ('bank', None) for job in ingest.bank_jobs(DATA_DIR)}
+        for name, spec in report_specs.REPORT_SPECS.items():
+            files[os.path.join(DATA_DIR, spec['file'])] = ('report', name)
+        return files
+
+    def refresh(self, workers=1, only=None):
+        # Reload whatever changed since the last look; returns the changed paths.
+        # Reloads after the first one run serially: a file or two at a time, and
+        # no forking from a process that already has server threads. only limits
+        # it to some inputs: a set of report names and/or 'bank'.
+        with self.lock:
+            watched = self.watched_files()
+            if only is not None:
+                watched = {path: w for path, w in watched.items() if (w[1] or w[0]) in only}
+            current = {path: _stat(path) for path in watched}
+            changed = [path for path, st in current.items() if self.files.get(path, 'unseen') != st]
+            changed += [path for path in self.files if path not in current]
+            if not changed:
+                return []
+
+            if any(watched.get(path, ('bank',))[0] == 'bank' for path in changed):
+                conn = analyze_finance.load_bank_data(workers=workers)
+                try:
+                    self.bank_totals = ledger.bank_totals(conn)
+                    self.cube = cashflow_cube.load_cube(conn)
+                    self.opening = cashflow_cube.opening_balances(conn)
+                    cashflow_cube.print_mismatches(cashflow_cube.balance_mismatches(conn, self.opening))
+                finally:
+                    conn.close()
+
+            names = [watched[path][1] for path in changed if path in watched and watched[path][0] == 'report']
+            if names:
+                reports = dict(self.reports, Stock_Totals=dict(self.reports.get('Stock_Totals', {})))
+                analyze_finance.collect_reports(report_specs.load_reports(DATA_DIR, names=names, workers=workers), reports)
+                self.reports = reports
+                for name in names:
+                    self.movements.pop(name, None)
+
+            self.files = current
+            self.loaded_at = datetime.datetime.now().isoformat(timespec='seconds')
+            return changed
+
+    def watch(self, poll_seconds=POLL_SECONDS):
+        while True:
+            time.sleep(poll_seconds)
+            try:
+                changed = self.refresh()
+            except Exception as e:
+                print(f"Error reloading {DATA_DIR}: {e}")
+                continue
+            if changed:
+                print(f"Reloaded {len(changed)} changed file(s): {', '.join(os.path.basename(p) for p in changed)}")
+
+    def ledger_movements(self, source):
+        # Parsed on first use and kept until the ledger file changes
+        if source not in self.movements:
+            path = os.path.join(DATA_DIR, report_specs.REPORT_SPECS[source]['file'])
+            self.movements[source] = stock_snapshots.ledger_movements(path)
+        return self.movements[source]
+
+    def stock_balances(self, source, when):
+        when = stock_snapshots._day(when)
+        with self.lock:
+            conn = stock_snapshots.connect(SNAPSHOT_FILE)
+            try:
+                if source == stock_snapshots.ERP_SOURCE:
+                    db_conn = db.connect(config.ERP_DB)
+                    try:
+                        stock_snapshots.erp_snapshot(conn, db_conn)
+                        return stock_snapshots.balances_as_of(
+                            conn, source, when, lambda after, until: stock_snapshots.erp_movements(db_conn, after, until))
+                    finally:
+                        db_conn.close()
+                movements = self.ledger_movements(source)
+                return stock_snapshots.balances_as_of(
+                    conn, source, when, lambda after, until: stock_snapshots.between(movements, after, until))
+            finally:
+                conn.close()
+
+# --- Endpoints: each returns (status, content type, body) ---
+
+def _json(payload, status=200):
+    return status, 'application/json', json.dumps(payload, ensure_ascii=False, default=str)
+
+def _frame(df):
+    return 200, 'application/json', df.to_json(orient='records', force_ascii=False, date_format='iso')
+
+def _markdown(lines):
+    return 200, 'text/markdown; charset=utf-8', "\n".join(lines)
+
+def health(state, query):
+    return _json({
+        'data_dir': DATA_DIR,
+        'loaded_at': state.loaded_at,
+        'files': len([st for st in state.files.values() if st]),
+        'reports': sorted(k for k in state.reports if k != 'Stock_Totals') + sorted(state.reports.get('Stock_Totals', {})),
+        'banks': 0 if state.bank_totals is None else len(state.bank_totals),
+    })
+
+def cash_flow(state, query):
+    start, end = query.get('start'), query.get('end')
+    totals = state.bank_totals
+    if totals is None:
+        return _json({'error': 'Bank data not loaded'}, 404)
+    if start or end:
+        conn = ledger.connect(LEDGER_FILE)
+        try:
+            totals = ledger.bank_totals(conn, start, end)
+        finally:
+            conn.close()
+    if query.get('format') == 'md':
+        return _markdown([analyze_finance.format_cash_flow(totals)])
+    return _frame(totals)
+
+def cube(state, query):
+    freq = query.get('freq', 'M')
+    by = [col for col in query.get('by', 'bank').split(',') if col]
+    view = query.get('view', 'rollup')
+    df = state.cube
+    if df is None:
+        return _json({'error': 'Bank data not loaded'}, 404)
+    if view == 'running':
+        table = cashflow_cube.between(cashflow_cube.running_balance(df, freq, by, state.opening), query.get('start'), query.get('end'))
+    elif view in ('rollup', 'compare'):
+        if query.get('start'):
+            df = df[df['day'] >= pd.Timestamp(query['start'])]
+        if query.get('end'):
+            df = df[df['day'] <= pd.Timestamp(query['end'])]
+        table = cashflow_cube.rollup(df, freq, by)
+        if view == 'compare':
+            table = cashflow_cube.period_over_period(table, by)
+    else:
+        return _json({'error': f"unknown view {view!r}"}, 400)
+    return _frame(table.assign(period=table['period'].astype(str)))
+
+def expenses(state, query):
+    if 'Expenses' not in state.reports:
+        return _json({'error': 'Expenses report not loaded'}, 404)
+    df = list_expenses.clean_expenses(state.reports['Expenses'])
+    if query.get('format') == 'json':
+        return _frame(df)
+    return _markdown(list_expenses.expense_list_lines(df))
+
+def stock(state, query):
+    source = query.get('source')
+    if not source:
+        totals = state.reports.get('Stock_Totals', {})
+        return _json({name: {k: int(v) if k == 'rows' else float(v) for k, v in t.items()} for name, t in totals.items()})
+    if source not in STOCK_SOURCES + (stock_snapshots.ERP_SOURCE,):
+        return _json({'error': f"unknown source {source!r}"}, 400)
+    balances = state.stock_balances(source, query.get('as_of') or datetime.date.today())
+    balances = balances[balances['quantity'] != 0].sort_values(stock_snapshots.KEYS)
+    return _frame(balances)
+
+def report(state, query):
+    # The ERP sections still render when no bank statement has been loaded
+    totals = state.bank_totals
+    bank_summary = NO_BANK_DATA if totals is None else analyze_finance.format_cash_flow(totals)
+    return _markdown(analyze_finance.report_lines(state.reports, bank_summary))
+
+def refresh(state, query):
+    return _json({'changed': [os.path.basename(p) for p in state.refresh()]})
+
+GET_ROUTES = {'/health': health, '/cash-flow': cash_flow, '/cube': cube, '/expenses': expenses, '/stock': stock, '/report': report}
+POST_ROUTES = {'/refresh': refresh}
+# route -> the inputs it reads (ReportState.refresh's only; None = all)
+ROUTE_INPUTS = {'/cash-flow': {'bank'}, '/cube': {'bank'}, '/expenses': {'Expenses'}, '/stock': set(STOCK_SOURCES), '/report': None}
+
+def answer(path, query, workers=None):
+    # One GET without the server: loads only what the route reads and returns
+    # its (status, content type, body), so the answer is the one the running
+    # service would give
+    state = ReportState()
+    state.refresh(workers=workers, only=ROUTE_INPUTS.get(path))
+    return GET_ROUTES[path](state, query)
+
+
+class Handler(BaseHTTPRequestHandler):
+    state = None
+
+    def _dispatch(self, routes):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query, keep_blank_values=True))
+        route = routes.get(url.path.rstrip('/') or '/')
+        start = time.perf_counter()
+        if route is None:
+            status, content_type, body = _json({'error': f"no route {url.path}"}, 404)
+        else:
+            try:
+                status, content_type, body = route(self.state, query)
+            except Exception as e:
+                status, content_type, body = _json({'error': f"{type(e).__name__}: {e}"}, 500)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-Elapsed-Ms', f"{1000 * (time.perf_counter() - start):.1f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch(GET_ROUTES)
+
+    def do_POST(self):
+        self._dispatch(POST_ROUTES)
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} {format % args}")
+
+def serve(port=config.SERVICE_PORT, workers=None, poll_seconds=POLL_SECONDS):
+    state = ReportState()
+    start = time.perf_counter()
+    state.refresh(workers=workers)
+    print(f"Loaded {len(state.files)} files from {DATA_DIR} in {time.perf_counter() - start:.1f}s")
+
+    if poll_seconds > 0:
+        threading.Thread(target=state.watch, args=(poll_seconds,), daemon=True).start()
+    Handler.state = state
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    print(f"Serving reports on http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=config.SERVICE_PORT)
+    parser.add_argument('--workers', type=int, default=None, help="Parallel parsers for the initial load")
+    parser.add_argument('--poll', type=float, default=POLL_SECONDS, help="Seconds between DATA_DIR checks (0 = only on POST /refresh)")
+    args = parser.parse_args()
+    serve(args.port, args.workers, args.poll)
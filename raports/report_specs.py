@@ -0,0 +1,172 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import frame_cache
+import ingest
+import readers
+import stock_snapshots
+import streaming
+import tracing
+
+# What each section of the financial report actually reads. The ERP exports
+# carry a column per month plus currency and code columns nobody looks at, so
+# loaders ask the reader for just these columns (usecols) with their types
+# declared up front (dtype) instead of materializing the whole sheet. .xlsx
+# reports go through the streaming row walk, which only keeps those columns.
+
+STRING = 'string'
+NUMBER = 'float64'
+
+REPORT_SPECS = {
+    'Sales': {
+        'file': 'Aylık cari satış raporu.xls',
+        'columns': {'Cari hesap adı': STRING, 'Ciro': NUMBER},
+    },
+    'Purchases': {
+        'file': 'Aylık ciro alış raporu.xls',
+        'columns': {'Cari hesap adı': STRING, 'Ciro': NUMBER},
+    },
+    'Expenses': {
+        'file': 'Masraf durum raporu.xls',
+        'columns': {'Hesap adı': STRING, 'TL Borç': NUMBER},
+    },
+    'Balances': {
+        'file': 'Cari bakiye durum raporu.xls',
+        'columns': {'Cari hesap adı': STRING, 'TL Borç Bakiye': NUMBER},
+        # Only some exports of this report have the credit balance column
+        'optional': {'TL Alacak Bakiye': NUMBER},
+    },
+    'Stock_In': {
+        'file': 'Genel alış stok hareket föyü.xlsx',
+        'columns': {'MİKTAR': NUMBER, 'NET TUTAR': NUMBER},
+        'stream': True,
+    },
+    'Stock_Out': {
+        'file': 'Genel  satış stok hareket föyü.xlsx',
+        'columns': {'MİKTAR': NUMBER, 'NET TUTAR': NUMBER},
+        'stream': True,
+    },
+}
+
+
+class Projection:
+    # usecols callable. A plain list makes pandas fail on a missing optional
+    # column; a callable just skips it. The repr is stable so the frame cache
+    # keys projected reads on the column set.
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+
+    def __call__(self, name):
+        return name in self.columns
+
+    def __repr__(self):
+        return f"Projection({list(self.columns)!r})"
+
+def spec_columns(spec):
+    return {**spec['columns'], **spec.get('optional', {})}
+
+def project(df, spec):
+    # Coerce after the fact for readers that cannot project (HTML) or when a
+    # declared numeric column turned out to hold text (footer notes etc.)
+    columns = spec_columns(spec)
+    df = df[[c for c in df.columns if c in columns]].copy()
+    for col in df.columns:
+        if columns[col] == NUMBER:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        else:
+            df[col] = df[col].astype(columns[col])
+    return df
+
+def _read_xlsx_columns(path, columns):
+    # openpyxl's read-only row walk skips building cells for the other
+    # columns, which pandas' own xlsx path does not
+    chunks = list(streaming.iter_chunks(path, columns=columns))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+def load_report(name, data_dir, projected=True):
+    spec = REPORT_SPECS[name]
+    path = os.path.join(data_dir, spec['file'])
+
+    if spec.get('stream'):
+        # Stock ledgers: totals come from the materialized balances, which only
+        # re-read the ledger when the export changed (stock_snapshots)
+        return stock_snapshots.ledger_totals(name, path, os.path.join(data_dir, stock_snapshots.SNAPSHOT_NAME))
+
+    fmt = readers.sniff_format(path)
+    if not projected or fmt == readers.HTML:
+        frames, _ = readers.read_table(path)
+        return project(frames[0], spec) if projected else frames[0]
+
+    columns = spec_columns(spec)
+    if fmt == readers.XLSX:
+        df = project(frame_cache.cached_read('xlsx_columns', _read_xlsx_columns, path, columns=sorted(columns)), spec)
+    else:
+        try:
+            frames, _ = readers.read_table(path, usecols=Projection(columns), dtype=columns)
+            df = frames[0]
+        except ValueError:
+            # A numeric column with stray text; read untyped and coerce
+            frames, _ = readers.read_table(path, usecols=Projection(columns))
+            df = project(frames[0], spec)
+
+    missing = [c for c in spec['columns'] if c not in df.columns]
+    if missing:
+        raise KeyError(f"{spec['file']} has no column(s) {missing}")
+    return df
+
+def load_job(job):
+    name, data_dir = job
+    start = time.perf_counter()
+    rss_start = tracing.peak_rss_mb()
+    result = {'name': name, 'file': REPORT_SPECS[name]['file'], 'data': None, 'error': None, 'rows': None, 'frame_mb': None}
+    path = os.path.join(data_dir, result['file'])
+    with tracing.stage(f"report {name}", 'report', file=result['file'], bytes_read=os.path.getsize(path) if os.path.exists(path) else 0) as span:
+        try:
+            data = load_report(name, data_dir)
+            result['data'] = data
+            if isinstance(data, pd.DataFrame):
+                result['rows'] = len(data)
+                result['frame_mb'] = data.memory_usage(deep=True).sum() / 1e6
+            else:
+                result['rows'] = data['rows']
+            span.set(rows_out=result['rows'])
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            span.set(error=result['error'])
+    result['seconds'] = time.perf_counter() - start
+    # How far this job raised the worker's peak memory; the peak itself
+    # would include the earlier jobs the worker ran
+    result['rss_growth_mb'] = tracing.peak_rss_mb() - rss_start
+    result['trace'] = tracing.drain()
+    return result
+
+def load_reports(data_dir, names=None, workers=None):
+    # Every report is an independent file, so they parse side by side; results
+    # come back in spec order regardless of which one finishes first
+    jobs = [(name, data_dir) for name in (names or REPORT_SPECS)]
+    workers = workers or ingest.DEFAULT_WORKERS or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        results = [load_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(load_job, jobs))
+    for r in results:
+        tracing.merge(r.pop('trace', None))
+    return results
+
+def timing_table(results):
+    table = pd.DataFrame([
+        {k: r[k] for k in ('name', 'file', 'seconds', 'rows', 'frame_mb', 'rss_growth_mb')} | {'error': r['error'] or ''}
+        for r in results
+    ])
+    table['rows'] = pd.to_numeric(table['rows']).astype('Int64')
+    table['frame_mb'] = pd.to_numeric(table['frame_mb'])
+    return table.sort_values('seconds', ascending=False, ignore_index=True)
+
+def print_timings(results):
+    table = timing_table(results)
+    print("\nReport load timings (slowest first):")
+    print(table.to_string(index=False, na_rep='-', float_format=lambda v: f"{v:,.2f}"))
@@ -0,0 +1,168 @@
+import csv
+import os
+import time
+
+import pandas as pd
+
+import aggregate
+
+# Streaming report output. A listing is written chunk by chunk to any mix of
+# Markdown, CSV, XLSX and Parquet files in one pass over the data, so a long
+# expense or stock listing never exists as one big list of lines or one big
+# formatted frame. Amounts are formatted column-wise by aggregate.format_amounts
+# ("1,234.56", or "1.234,56" with locale='tr'), as in the Markdown reports.
+#
+#   report_writer.write(report_writer.chunks_of(df), ['list.md', 'list.xlsx'],
+#                       columns=['Hesap adı', 'TL Borç'], amount_cols=['TL Borç'])
+#
+# The format comes from each path's extension. Markdown and CSV carry the
+# formatted amounts; XLSX and Parquet keep them as numbers (XLSX with a
+# thousands number format, so Excel shows them in its own locale).
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+CHUNK_ROWS = 50_000
+# locale (aggregate.LOCALES) -> CSV delimiter; ';' where ',' is the decimal mark
+CSV_DELIMITERS = {'en': ',', 'tr': ';'}
+XLSX_AMOUNT_FORMAT = '#,##0.00'
+FORMATS = {'.md': 'md', '.csv': 'csv', '.xlsx': 'xlsx', '.parquet': 'parquet'}
+
+
+def chunks_of(df, rows=CHUNK_ROWS):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+def format_of(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"No report format for {os.path.basename(path)} (use {', '.join(FORMATS)})")
+    if fmt == 'parquet' and not HAS_PARQUET:
+        raise ValueError("Parquet output needs pyarrow")
+    return fmt
+
+def _text_columns(chunk, columns, amount_cols, locale):
+    return [aggregate.format_amounts(chunk[col], locale=locale) if col in amount_cols else chunk[col].astype(str).to_numpy(dtype=object) for col in columns]
+
+# --- Sinks: open on creation, write(chunk) any number of times, close() ---
+
+class MarkdownSink:
+    def __init__(self, path, columns, headers, amount_cols, locale, preamble):
+        self.f = open(path, 'w')
+        self.columns, self.amount_cols, self.locale = columns, amount_cols, locale
+        # Lines are joined with newlines and the file has no trailing one,
+        # like the reports written from a list of lines before
+        lines = list(preamble) + ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(columns)]
+        self.f.write("\n".join(lines))
+
+    def write(self, chunk):
+        if chunk.empty:
+            return
+        cells = _text_columns(chunk, self.columns, self.amount_cols, self.locale)
+        body = cells[0]
+        for col in cells[1:]:
+            body = body + ' | ' + col
+        self.f.write("\n| " + " |\n| ".join(body) + " |")
+
+    def close(self, footer=()):
+        if footer:
+            self.f.write("\n" + "\n".join(footer))
+        self.f.close()
+
+class CsvSink:
+    def __init__(self, path, columns, headers, amount_cols, locale, preamble):
+        self.f = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.columns, self.amount_cols, self.locale = columns, amount_cols, locale
+        self.writer = csv.writer(self.f, delimiter=CSV_DELIMITERS[locale])
+        self.writer.writerow(headers)
+
+    def write(self, chunk):
+        if not chunk.empty:
+            self.writer.writerows(zip(*_text_columns(chunk, self.columns, self.amount_cols, self.locale)))
+
+    def close(self, footer=()):
+        self.f.close()
+
+class XlsxSink:
+    def __init__(self, path, columns, headers, amount_cols, locale, preamble):
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+
+        # Write-only mode streams rows to the file instead of keeping a sheet
+        self.path = path
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.ws = self.wb.create_sheet()
+        self.columns = columns
+        self.amount_positions = [i for i, col in enumerate(columns) if col in amount_cols]
+        self.cell = WriteOnlyCell
+        for line in preamble:
+            self.ws.append([line.lstrip('# ')] if line else [])
+        self.ws.append(headers)
+
+    def write(self, chunk):
+        if chunk.empty:
+            return
+        values = [chunk[col].to_numpy(dtype=object) for col in self.columns]
+        for i in self.amount_positions:
+            values[i] = [None if pd.isna(v) else float(v) for v in values[i]]
+        for row in zip(*values):
+            row = list(row)
+            for i in self.amount_positions:
+                cell = self.cell(self.ws, value=row[i])
+                cell.number_format = XLSX_AMOUNT_FORMAT
+                row[i] = cell
+            self.ws.append(row)
+
+    def close(self, footer=()):
+        self.wb.save(self.path)
+
+class ParquetSink:
+    def __init__(self, path, columns, headers, amount_cols, locale, preamble):
+        # Values as they are, under the display headers; the schema comes from
+        # the first chunk
+        self.path, self.columns, self.headers = path, columns, headers
+        self.writer = None
+
+    def write(self, chunk):
+        table = pa.Table.from_pandas(chunk[self.columns].set_axis(self.headers, axis=1), preserve_index=False,
+                                     schema=self.writer.schema if self.writer else None)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self, footer=()):
+        if self.writer is None:
+            # No rows at all: still leave a readable, empty file
+            pq.write_table(pa.table({h: pa.array([], pa.string()) for h in self.headers}), self.path)
+        else:
+            self.writer.close()
+
+SINKS = {'md': MarkdownSink, 'csv': CsvSink, 'xlsx': XlsxSink, 'parquet': ParquetSink}
+
+def write(chunks, paths, columns, headers=None, amount_cols=(), locale='en', preamble=(), footer=()):
+    # Streams chunks (DataFrames) to every path in one pass. preamble and
+    # footer are Markdown lines around the table (the XLSX sheet gets the
+    # preamble as its first rows). Returns {path: seconds spent writing}.
+    headers = list(headers or columns)
+    formats = {path: format_of(path) for path in paths}
+    sinks, seconds = {}, dict.fromkeys(paths, 0.0)
+    try:
+        for path, fmt in formats.items():
+            start = time.perf_counter()
+            sinks[path] = SINKS[fmt](path, list(columns), headers, set(amount_cols), locale, list(preamble))
+            seconds[path] += time.perf_counter() - start
+        for chunk in chunks:
+            for path, sink in sinks.items():
+                start = time.perf_counter()
+                sink.write(chunk)
+                seconds[path] += time.perf_counter() - start
+    finally:
+        for path, sink in sinks.items():
+            start = time.perf_counter()
+            sink.close(footer)
+            seconds[path] += time.perf_counter() - start
+    return seconds
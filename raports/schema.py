@@ -0,0 +1,54 @@
+import pandas as pd
+
+# Typed in-memory schema for normalized bank transactions. Amounts are whole
+# kuruş in int64, so totals add up exactly instead of drifting the way large
+# float sums do; the bank and source file are categoricals (a few distinct
+# values repeated on every row), dates are datetime64 and descriptions are
+# Arrow-backed strings when pyarrow is installed.
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+TEXT = pd.StringDtype('pyarrow') if HAS_ARROW else pd.StringDtype()
+
+TRANSACTION_DTYPES = {
+    'bank': 'category',
+    'date': 'datetime64[ns]',
+    'amount_kurus': 'int64',
+    'description': TEXT,
+    'balance_kurus': 'Int64',
+    'file': 'category',
+}
+
+
+def compact(df):
+    # Cast the schema's columns that are present; anything else is left alone
+    dtypes = {col: dtype for col, dtype in TRANSACTION_DTYPES.items() if col in df.columns}
+    if 'date' in dtypes:
+        df = df.assign(date=pd.to_datetime(df['date'], errors='coerce'))
+    return df.astype(dtypes)
+
+def footprint(df):
+    # Deep memory use per column in bytes, index included
+    return df.memory_usage(deep=True, index=True)
+
+def footprint_table(stages):
+    # stages: list of (label, frame). One row per label with rows, MB and the
+    # factor by which it is smaller than the first stage
+    rows = []
+    for label, df in stages:
+        rows.append({'stage': label, 'rows': len(df), 'columns': df.shape[1], 'mb': footprint(df).sum() / 1e6})
+    table = pd.DataFrame(rows)
+    table['bytes_per_row'] = table['mb'] * 1e6 / table['rows'].where(table['rows'] > 0)
+    table['times_smaller'] = table['mb'].iloc[0] / table['mb'] if len(table) else None
+    return table
+
+def column_table(before, after):
+    # Per-column bytes of two frames side by side
+    table = pd.DataFrame({'before_mb': footprint(before) / 1e6, 'after_mb': footprint(after) / 1e6})
+    table['before_dtype'] = pd.Series({c: str(t) for c, t in before.dtypes.items()})
+    table['after_dtype'] = pd.Series({c: str(t) for c, t in after.dtypes.items()})
+    return table
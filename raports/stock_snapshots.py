@@ -0,0 +1,289 @@
+import argparse
+import datetime
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+import aggregate
+import config
+import db
+import frame_cache
+import report_writer
+import streaming
+import tracing
+
+DATA_DIR = config.DATA_DIR
+SNAPSHOT_NAME = 'stock_snapshots.db'
+SNAPSHOT_FILE = os.path.join(DATA_DIR, SNAPSHOT_NAME)
+
+# Materialized stock balances per (item, warehouse, lot) as of a cutoff date.
+# A balance for any date is the latest snapshot at or before it plus the
+# movements between the two, so neither the report nor a point-in-time query
+# replays the whole ledger. Snapshots are taken at every month end a roll
+# forward passes, which bounds the delta scan to at most a month of movements.
+#
+# Movements are frames of item, warehouse, lot, date, kind, quantity, value.
+# kind is 'delta' (added to the balance) or 'set' (replaces it): the ERP's
+# TRANSFER writes an absolute quantity, IN/OUT/ADJUSTMENT are deltas.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    cutoff TEXT NOT NULL,
+    fingerprint TEXT,
+    movements INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_source_cutoff ON snapshots (source, cutoff);
+CREATE TABLE IF NOT EXISTS balances (
+    snapshot_id INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    warehouse TEXT NOT NULL,
+    lot TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (snapshot_id, item, warehouse, lot)
+) WITHOUT ROWID;
+"""
+
+KEYS = ['item', 'warehouse', 'lot']
+ERP_SOURCE = 'erp'
+ERP_KINDS = {'IN': ('delta', 1), 'OUT': ('delta', -1), 'ADJUSTMENT': ('delta', 1), 'TRANSFER': ('set', 1)}
+LEDGER_COLUMNS = ['STOK KODU', 'TARİH', 'MİKTAR', 'NET TUTAR']
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30.0)
+    conn.executescript(SCHEMA)
+    return conn
+
+def empty_balances():
+    return pd.DataFrame({'item': pd.Series(dtype=object), 'warehouse': pd.Series(dtype=object), 'lot': pd.Series(dtype=object),
+                         'quantity': pd.Series(dtype='float64'), 'value': pd.Series(dtype='float64')})
+
+def roll_forward(base, movements):
+    # base: balances (KEYS, quantity, value); movements: rows after base's cutoff
+    if movements.empty:
+        return base
+    mv = movements.sort_values('date', kind='stable').reset_index(drop=True)
+    mv['pos'] = np.arange(len(mv))
+    # Value is every movement's value added up; a 'set' only replaces the quantity
+    values = mv.groupby(KEYS)['value'].sum()
+
+    # Only the last 'set' per key matters; deltas before it are overwritten
+    last_set = mv[mv['kind'] == 'set'].groupby(KEYS)['pos'].max().rename('last_set')
+    mv = mv.join(last_set, on=KEYS)
+    live = mv['last_set'].isna() | (mv['pos'] >= mv['last_set'])
+    mv = mv[live]
+
+    sets = mv[mv['kind'] == 'set'].set_index(KEYS)[['quantity']]
+    deltas = mv[mv['kind'] == 'delta'].groupby(KEYS)[['quantity']].sum()
+
+    out = base.set_index(KEYS)[['quantity', 'value']]
+    out = out.reindex(out.index.union(deltas.index).union(sets.index), fill_value=0.0)
+    out.loc[sets.index, 'quantity'] = sets['quantity']
+    out['quantity'] = out['quantity'].add(deltas['quantity'].reindex(out.index, fill_value=0.0))
+    out['value'] = out['value'].add(values.reindex(out.index, fill_value=0.0))
+    return out.reset_index()
+
+def latest_snapshot(conn, source, until=None):
+    row = conn.execute(
+        "SELECT id, cutoff, fingerprint, movements, quantity FROM snapshots "
+        "WHERE source = ? AND (? IS NULL OR cutoff <= ?) ORDER BY cutoff DESC, id DESC LIMIT 1",
+        (source, until, until),
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(('id', 'cutoff', 'fingerprint', 'movements', 'quantity'), row))
+
+def load_balances(conn, snapshot_id):
+    return pd.read_sql_query(
+        "SELECT item, warehouse, lot, quantity, value FROM balances WHERE snapshot_id = ?", conn, params=(snapshot_id,)
+    )
+
+def save_snapshot(conn, source, cutoff, balances, movements, fingerprint=None):
+    now = datetime.datetime.now().isoformat(timespec='seconds')
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO snapshots (source, cutoff, fingerprint, movements, quantity, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (source, cutoff, fingerprint, int(movements), float(balances['quantity'].sum()), now),
+        )
+        snapshot_id = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO balances VALUES (?, ?, ?, ?, ?, ?)",
+            zip([snapshot_id] * len(balances), balances['item'], balances['warehouse'], balances['lot'],
+                balances['quantity'].astype(float), balances['value'].astype(float)),
+        )
+    return snapshot_id
+
+def _day(ts):
+    return pd.Timestamp(ts).strftime('%Y-%m-%d')
+
+def _month_ends(start, end):
+    # Month ends strictly between start and end
+    ends = pd.date_range(start, end, freq=pd.offsets.MonthEnd())
+    return [d for d in ends if start < d < end]
+
+def roll_and_snapshot(conn, source, snap, movements, until, fingerprint=None):
+    # Rolls snap (or nothing) forward over movements up to until, saving a
+    # snapshot at every month end on the way and one at until itself
+    until = pd.Timestamp(until)
+    base = load_balances(conn, snap['id']) if snap else empty_balances()
+    count = snap['movements'] if snap else 0
+    prev = pd.Timestamp(snap['cutoff']) if snap else None
+    first = prev if prev is not None else (movements['date'].min() if len(movements) else until)
+    for end in _month_ends(first, until) + [until]:
+        mask = movements['date'] <= end
+        if prev is not None:
+            mask &= movements['date'] > prev
+        part = movements[mask]
+        base = roll_forward(base, part)
+        count += len(part)
+        prev = end
+        save_snapshot(conn, source, _day(end), base, count, fingerprint if end == until else None)
+    return base
+
+def balances_as_of(conn, source, when, movements_fn):
+    # One snapshot lookup plus the movements between it and `when`
+    when = _day(when)
+    snap = latest_snapshot(conn, source, when)
+    base = load_balances(conn, snap['id']) if snap else empty_balances()
+    if snap and snap['cutoff'] == when:
+        return base
+    return roll_forward(base, movements_fn(snap['cutoff'] if snap else None, when))
+
+# --- ERP StockMovement source ---
+
+def erp_movements(db_conn, after=None, until=None):
+    # Movements with after < day <= until, read through the createdAt index
+    start = pd.Timestamp(after) + pd.Timedelta(days=1) if after else None
+    end = pd.Timestamp(until) + pd.Timedelta(days=1) if until else None
+    df = db.stock_movements(db_conn, start=start, end=end)
+    if df.empty:
+        return pd.DataFrame(columns=KEYS + ['date', 'kind', 'quantity', 'value'])
+    kind = df['type'].map({t: k for t, (k, _) in ERP_KINDS.items()})
+    sign = df['type'].map({t: s for t, (_, s) in ERP_KINDS.items()})
+    return pd.DataFrame({
+        'item': np.where(df['materialId'].notna(), 'material:' + df['materialId'].fillna(''), 'product:' + df['productId'].fillna('')),
+        'warehouse': df['warehouseId'].fillna(''),
+        'lot': df['lotNumber'].fillna(''),
+        'date': df['createdAt'].dt.normalize(),
+        'kind': kind,
+        'quantity': df['quantity'] * sign,
+        'value': 0.0,
+    })[kind.notna()]
+
+def erp_snapshot(conn, db_conn, until=None):
+    # Default to yesterday: today's movements are still coming in
+    until = _day(until or datetime.date.today() - datetime.timedelta(days=1))
+    snap = latest_snapshot(conn, ERP_SOURCE, until)
+    if snap and snap['cutoff'] == until:
+        return load_balances(conn, snap['id'])
+    movements = erp_movements(db_conn, snap['cutoff'] if snap else None, until)
+    return roll_and_snapshot(conn, ERP_SOURCE, snap, movements, until)
+
+# --- Excel stock ledger source (Genel alış/satış stok hareket föyü) ---
+
+def ledger_movements(path):
+    # The whole export as movements. Rows without a date are the report's own
+    # footer total and are left out.
+    frames = []
+    for chunk in streaming.iter_chunks(path, columns=LEDGER_COLUMNS):
+        dates = pd.to_datetime(chunk['TARİH'], errors='coerce')
+        frames.append(pd.DataFrame({
+            'item': chunk['STOK KODU'].astype(str),
+            'warehouse': '',
+            'lot': '',
+            'date': dates.dt.normalize(),
+            'kind': 'delta',
+            'quantity': pd.to_numeric(chunk['MİKTAR'], errors='coerce').fillna(0.0),
+            'value': pd.to_numeric(chunk['NET TUTAR'], errors='coerce').fillna(0.0),
+        })[dates.notna()])
+    if not frames:
+        return pd.DataFrame(columns=KEYS + ['date', 'kind', 'quantity', 'value'])
+    return pd.concat(frames, ignore_index=True)
+
+def between(movements, after, until):
+    # Movements with after < date <= until, for balances_as_of
+    return movements[(movements['date'] > pd.Timestamp(after) if after else True) & (movements['date'] <= pd.Timestamp(until))]
+
+def _ledger_snapshot(conn, source, path):
+    # An unchanged export is answered from its snapshot without opening it. A
+    # re-export is read once: if the rows up to the last snapshot still add up
+    # to it, only the newer rows are rolled forward; otherwise history changed
+    # and the balances are rebuilt from scratch.
+    fingerprint = frame_cache.file_hash(path)
+    snap = latest_snapshot(conn, source)
+    if snap and snap['fingerprint'] == fingerprint:
+        return load_balances(conn, snap['id'])
+
+    movements = ledger_movements(path)
+    if movements.empty:
+        return empty_balances()
+    until = movements['date'].max()
+    if snap:
+        known = movements[movements['date'] <= pd.Timestamp(snap['cutoff'])]
+        if len(known) != snap['movements'] or not np.isclose(known['quantity'].sum(), snap['quantity']):
+            conn.execute("DELETE FROM balances WHERE snapshot_id IN (SELECT id FROM snapshots WHERE source = ?)", (source,))
+            conn.execute("DELETE FROM snapshots WHERE source = ?", (source,))
+            conn.commit()
+            snap = None
+    if snap and pd.Timestamp(snap['cutoff']) >= until:
+        # Same history, different bytes (re-saved file): just remember the new hash
+        with conn:
+            conn.execute("UPDATE snapshots SET fingerprint = ? WHERE id = ?", (fingerprint, snap['id']))
+        return load_balances(conn, snap['id'])
+    return roll_and_snapshot(conn, source, snap, movements, until, fingerprint)
+
+def ledger_snapshot(conn, source, path):
+    with tracing.stage(f"snapshot {source}", 'stock') as span:
+        balances = _ledger_snapshot(conn, source, path)
+        span.set(rows_out=len(balances))
+        return balances
+
+def ledger_totals(source, path, snapshot_file):
+    # Totals in the shape streaming.sum_columns returns, for the report
+    conn = connect(snapshot_file)
+    try:
+        balances = ledger_snapshot(conn, source, path)
+        snap = latest_snapshot(conn, source)
+    finally:
+        conn.close()
+    return {'MİKTAR': balances['quantity'].sum(), 'NET TUTAR': balances['value'].sum(), 'rows': snap['movements'] if snap else 0}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--as-of', default=None, help="Balance date (YYYY-MM-DD, default today)")
+    parser.add_argument('--source', default=ERP_SOURCE, help="'erp' for dev.db StockMovement, or Stock_In / Stock_Out for the Excel ledgers")
+    parser.add_argument('--db', default=db.DEFAULT_DB)
+    parser.add_argument('--output', nargs='+', default=[], help="Write the full listing to these files (.md, .csv, .xlsx, .parquet)")
+    parser.add_argument('--locale', default='en', choices=sorted(aggregate.LOCALES))
+    args = parser.parse_args()
+
+    conn = connect(SNAPSHOT_FILE)
+    when = _day(args.as_of or datetime.date.today())
+    if args.source == ERP_SOURCE:
+        db_conn = db.connect(args.db)
+        erp_snapshot(conn, db_conn)
+        balances = balances_as_of(conn, ERP_SOURCE, when, lambda after, until: erp_movements(db_conn, after, until))
+    else:
+        import report_specs
+        path = os.path.join(DATA_DIR, report_specs.REPORT_SPECS[args.source]['file'])
+        ledger_snapshot(conn, args.source, path)
+
+        balances = balances_as_of(conn, args.source, when, lambda after, until: between(ledger_movements(path), after, until))
+
+    balances = balances[balances['quantity'] != 0].sort_values(KEYS)
+    print(f"Stock as of {when} ({args.source}): {len(balances)} balances, {balances['quantity'].sum():,.2f} units, {balances['value'].sum():,.2f} TL")
+    print(balances.head(30).to_string(index=False))
+    if args.output:
+        preamble = [f"# Stock Balances ({args.source})", f"As of: {when}", f"Balances: {len(balances)}", ""]
+        report_writer.write(report_writer.chunks_of(balances), args.output, KEYS + ['quantity', 'value'],
+                            ['Item', 'Warehouse', 'Lot', 'Quantity', 'Value (TL)'], amount_cols=['quantity', 'value'],
+                            locale=args.locale, preamble=preamble)
+        for path in args.output:
+            print(f"Listing saved to {path}")
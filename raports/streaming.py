@@ -0,0 +1,64 @@
+import pandas as pd
+
+import readers
+
+# Row-chunked reading for the large stock movement ledgers. .xlsx files are
+# walked with openpyxl's read-only row iterator, so only one chunk of rows is
+# ever materialized; other formats (xlrd/.xls, HTML) cannot be streamed and are
+# read whole, then handed out in chunks so callers see the same interface.
+
+CHUNK_ROWS = 50_000
+
+
+def _header_names(row):
+    return [str(v) if v is not None else f"Unnamed: {i}" for i, v in enumerate(row)]
+
+def _iter_xlsx(path, chunk_rows, columns, header_row):
+    import openpyxl
+
+    # Pass a file object: openpyxl refuses paths whose extension is not .xlsx,
+    # and ERP exports saved as .xls are sometimes real workbooks
+    fh = open(path, 'rb')
+    wb = openpyxl.load_workbook(fh, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        for _ in range(header_row):
+            next(rows, None)
+        names = _header_names(next(rows, ()))
+        wanted = [i for i, n in enumerate(names) if columns is None or n in columns]
+        wanted_names = [names[i] for i in wanted]
+
+        buf = []
+        for row in rows:
+            buf.append([row[i] if i < len(row) else None for i in wanted])
+            if len(buf) >= chunk_rows:
+                yield pd.DataFrame(buf, columns=wanted_names)
+                buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=wanted_names)
+    finally:
+        wb.close()
+        fh.close()
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS, columns=None, header_row=0):
+    if readers.sniff_format(path) == readers.XLSX:
+        yield from _iter_xlsx(path, chunk_rows, columns, header_row)
+        return
+
+    frames, _ = readers.read_table(path, header=header_row)
+    df = frames[0]
+    if columns is not None:
+        df = df[[c for c in df.columns if c in columns]]
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def sum_columns(path, columns, chunk_rows=CHUNK_ROWS):
+    totals = dict.fromkeys(columns, 0.0)
+    rows = 0
+    for chunk in iter_chunks(path, chunk_rows=chunk_rows, columns=columns):
+        rows += len(chunk)
+        for col in columns:
+            if col in chunk.columns:
+                totals[col] += pd.to_numeric(chunk[col], errors='coerce').sum()
+    totals['rows'] = rows
+    return totals
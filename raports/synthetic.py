@@ -0,0 +1,230 @@
+import argparse
+import datetime
+import os
+
+import numpy as np
+
+import report_specs
+
+# Deterministic stand-ins for the bank statements and ERP exports, laid out
+# the way the real ones are: Kuveyt HTML saved as .xls (UTF-8 BOM, preamble,
+# Turkish-formatted amounts), Ziraat .xlsx with an 11-row preamble, Akbank
+# .xlsx with a 9-row preamble, and the ERP reports with their footer totals.
+# The same seed and row count always give the same rows.
+#
+# openpyxl's write-only mode stores text as inline strings, which parse about
+# twice as slowly as the shared strings the real exports use, so .xlsx timings
+# on this data err on the slow side.
+#
+# .xlsx sheets stop at 1,048,576 rows, so bank statements and stock ledgers
+# above that are split over several files (the HTML statement is not limited).
+
+XLSX_MAX_ROWS = 1_048_576 - 20
+START_DATE = datetime.date(2025, 1, 1)
+DESCRIPTIONS = [
+    'EFT {name} FATURA ÖDEMESİ', 'FAST Para Transferi, Gönderen: {name}', 'POS TAHSİLAT {n}',
+    'MESAJ ÜCRETİ TUTARI', 'BSMV TUTARI', '7777/MBL-Kredi Kartı Ödeme', 'DBS ODM/{n}/EAE2025{n}',
+]
+COMPANY_WORDS = ['KALIP', 'METAL', 'OTOMOTİV', 'MAKİNA', 'LAZER', 'SAC', 'PRES', 'KOLTUK', 'APARAT', 'ÇELİK']
+MONTHS = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran', 'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+
+
+def _rng(seed, name):
+    # Independent, reproducible stream per file
+    return np.random.default_rng([seed, sum(name.encode('utf-8'))])
+
+def _companies(rng, count):
+    words = rng.choice(COMPANY_WORDS, size=(count, 2))
+    return [f"{a} {b} {i} SANAYİ VE TİCARET LİMİTED ŞİRKETİ" for i, (a, b) in enumerate(words)]
+
+def _transactions(rng, rows):
+    days = np.sort(rng.integers(0, 365, rows))
+    dates = [START_DATE + datetime.timedelta(days=int(d)) for d in days]
+    amounts = (rng.normal(0, 40_000, rows)).round(2)
+    balances = (np.cumsum(amounts[::-1])[::-1] + 1_000_000).round(2)
+    names = _companies(rng, 200)
+    templates = rng.integers(0, len(DESCRIPTIONS), rows)
+    who = rng.integers(0, len(names), rows)
+    numbers = rng.integers(100_000, 999_999, rows)
+    descriptions = [DESCRIPTIONS[t].format(name=names[w], n=n) for t, w, n in zip(templates, who, numbers)]
+    return dates, amounts, balances, descriptions
+
+def turkish_amount(value):
+    # 1234567.8 -> '1.234.567,80'
+    return f"{value:,.2f}".translate(str.maketrans(',.', '.,'))
+
+def _write_xlsx(path, rows):
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+def _split(rows):
+    # Row counts per file for formats with a sheet limit
+    parts = []
+    while rows > 0:
+        parts.append(min(rows, XLSX_MAX_ROWS))
+        rows -= parts[-1]
+    return parts or [0]
+
+def kuveyt_statement(path, rows, seed=42):
+    rng = _rng(seed, os.path.basename(path))
+    dates, amounts, balances, descriptions = _transactions(rng, rows)
+    with open(path, 'w', encoding='utf-8-sig', newline='\n') as f:
+        f.write('<table>\n\t<tr>\n\t\t<td>Hesap\n\t\t</td><td>98458902 - 1 TL\n\t\t</td>\n\t</tr><tr>\n')
+        f.write('\t\t<td>Şube\n\t\t</td><td>&#214;zl&#252;ce Şubesi(304)\n\t\t</td>\n\t</tr><tr>\n')
+        f.write('\t\t<td align="center" colspan="5">Hesap Hareketleri\n\t\t</td><tr>\n')
+        f.write(''.join(f'\t\t\t<th><strong>{h}\n\t\t\t</strong></th>' for h in ('İşlem Tarihi', 'Açıklama', 'Tutar', 'Bakiye', 'İşlem Referans Numarası')))
+        f.write('\n\t\t</tr>')
+        for i, (d, a, b, desc) in enumerate(zip(dates, amounts, balances, descriptions)):
+            f.write(f'<tr>\n\t\t\t<td>{d.day}.{d.month}.{d.year}\n\t\t\t</td><td>{desc}\n\t\t\t</td>'
+                    f'<td>{turkish_amount(a)}\n\t\t\t</td><td>{turkish_amount(b)}\n\t\t\t</td><td>A{i:09d}\n\t\t\t</td>\n\t\t</tr>')
+        f.write('\n</table>\n')
+    return [path]
+
+def ziraat_statement(path, rows, seed=42):
+    rng = _rng(seed, os.path.basename(path))
+    dates, amounts, balances, descriptions = _transactions(rng, rows)
+    paths = []
+    start = 0
+    for part, count in enumerate(_split(rows)):
+        out = path if part == 0 else path.replace('.xlsx', f' ({part}).xlsx')
+        preamble = [[None]] * 4 + [
+            ['Sayın AKKA DEMİR ÇELİK SANAYİ VE TİCARET LİMİTED ŞİRKETİ'],
+            ['01.01.2025 - 31.12.2025 tarihleri arasındaki hesap hareketleri listelenmektedir.'],
+            ['Hesap Numarası', None, '60-97707193-5001 BURSA ŞUBESİ TL'],
+            ['IBAN', None, 'TR780001000060977071935001'],
+            [None], [None], ['Hesap Hareketleri'],
+            ['Tarih', 'Fiş No', 'Açıklama', 'İşlem Tutarı', 'Bakiye'],
+        ]
+        body = (
+            [dates[i].strftime('%d.%m.%Y'), f"F{10000 + i}", descriptions[i], float(amounts[i]), float(balances[i])]
+            for i in range(start, start + count)
+        )
+        _write_xlsx(out, _chain(preamble, body))
+        paths.append(out)
+        start += count
+    return paths
+
+def akbank_statement(path, rows, seed=42):
+    rng = _rng(seed, os.path.basename(path))
+    dates, amounts, balances, descriptions = _transactions(rng, rows)
+    minutes = rng.integers(0, 24 * 60, rows)
+    paths = []
+    start = 0
+    for part, count in enumerate(_split(rows)):
+        out = path if part == 0 else path.replace('.xlsx', f' ({part}).xlsx')
+        preamble = [
+            ['Vadesiz Hesap Hareketleriniz'],
+            ['Ad Soyad/Ünvan', 'AKKA DMR.ÇELİK SAN.VE TİC.LTD.ŞTİ.'],
+            ['Şube', 'ERTUĞRULKENT'],
+            ['Hesap No', '1179-0061615'],
+            ['Döviz Cinsi', 'TL'],
+            ['IBAN', 'TR62 0004 6011 7988 8000 0616 15'],
+            ['Kullanılabilir Bakiye', f"{turkish_amount(balances[0] if rows else 0)} TL"],
+            ['Tarih Aralığı', '01.01.2025 - 31.12.2025'],
+            [None],
+            ['Tarih', 'Saat', 'Tutar', 'Bakiye', 'Borç/Alacak', 'Açıklama', 'Fiş/Dekont No'],
+        ]
+        body = (
+            [dates[i].strftime('%d.%m.%Y'), f"{minutes[i] // 60:02d}:{minutes[i] % 60:02d}", float(amounts[i]), float(balances[i]),
+             'B' if amounts[i] < 0 else 'A', descriptions[i], f"{i:09d}"]
+            for i in range(start, start + count)
+        )
+        _write_xlsx(out, _chain(preamble, body))
+        paths.append(out)
+        start += count
+    return paths
+
+def _chain(*parts):
+    for part in parts:
+        yield from part
+
+def sales_report(path, rows, seed=42):
+    rng = _rng(seed, os.path.basename(path))
+    names = _companies(rng, rows)
+    months = rng.uniform(0, 200_000, (rows, 12)).round(2) * (rng.random((rows, 1)) < 0.7)
+    header = ['Cari hesap kodu', 'Cari hesap adı', 'Döviz', 'Ciro'] + [f"{m:<10}- 2025" for m in MONTHS] + ['2025 maliyılı sonrası']
+    body = ([f"120.A.{i:04d}", names[i], 'TL', float(months[i].sum().round(2))] + months[i].tolist() + [0.0] for i in range(rows))
+    footer = [[None, None, None, float(months.sum().round(2))] + months.sum(axis=0).round(2).tolist() + [0.0], [None]]
+    _write_xlsx(path, _chain([header], body, footer))
+    return [path]
+
+def expense_report(path, rows, seed=42):
+    rng = _rng(seed, os.path.basename(path))
+    amounts = rng.uniform(0, 500_000, rows).round(2)
+    body = ([f"770.{i:03d}", f"GİDER HESABI {i}", float(amounts[i])] for i in range(rows))
+    _write_xlsx(path, _chain([['Hesap kodu', 'Hesap adı', 'TL Borç']], body, [[None, None, float(amounts.sum().round(2))], [None]]))
+    return [path]
+
+def balance_report(path, rows, seed=42):
+    rng = _rng(seed, os.path.basename(path))
+    names = _companies(rng, rows)
+    debit = rng.uniform(0, 2_000_000, rows).round(2)
+    credit = (debit * rng.uniform(0.5, 1.0, rows)).round(2)
+    body = ([names[i], float(debit[i]), float(credit[i]), float((debit[i] - credit[i]).round(2)), 'TL'] for i in range(rows))
+    footer = [[None, float(debit.sum().round(2)), float(credit.sum().round(2)), float((debit - credit).sum().round(2)), None], [None]]
+    _write_xlsx(path, _chain([['Cari hesap adı', 'TL Borç', 'TL Alacak', 'TL Borç Bakiye', 'Orj. döviz']], body, footer))
+    return [path]
+
+STOCK_HEADER = [
+    'STOK KODU', 'STOK İSMİ', 'TARİH', 'SERİ', 'SIRA NO', 'EVRAK TİPİ', 'GİREN MİKTAR', 'ÇIKAN MİKTAR', 'MİKTAR',
+    'BİRİM ADI', 'NET BİRİM FİYATI', 'NET TUTAR', 'FATURA SERİ', 'FATURA SIRA NO', 'CARİ CİNSİ', 'CARİ KODU',
+    'CARİ İSMİ', 'GRUP İSMİ', 'GİREN MALİYET DEĞER',
+]
+
+def stock_ledger(path, rows, incoming=True, seed=42):
+    # One file only: the report reads the ledger by its fixed name
+    rows = min(rows, XLSX_MAX_ROWS)
+    rng = _rng(seed, os.path.basename(path))
+    days = np.sort(rng.integers(0, 365, rows))
+    items = rng.integers(0, max(rows // 20, 10), rows)
+    qty = rng.integers(1, 2_000, rows)
+    price = rng.uniform(5, 80, rows).round(3)
+    names = _companies(rng, 100)
+    sign = 1 if incoming else -1
+
+    def body():
+        for i in range(rows):
+            q = int(qty[i])
+            yield [
+                f"15{0 if incoming else 2}.SYN.{items[i]:04d}", f"SAC {items[i]}", datetime.datetime.combine(START_DATE + datetime.timedelta(days=int(days[i])), datetime.time()),
+                'KR2025', i, 'Giriş faturası' if incoming else 'Satış faturası', q if incoming else 0, 0 if incoming else q, sign * q,
+                'KİLOGRAM', float(price[i]), float(round(q * price[i], 2)), 'KR2025', i, 'Cari hesap', f"320.K.{i % 100:04d}",
+                names[i % 100], 'SATICI' if incoming else 'MÜŞTERİ', float(round(q * price[i], 2)) if incoming else 0.0,
+            ]
+    footer = [[rows] + [None] * 7 + [int(sign * qty.sum())]]
+    _write_xlsx(path, _chain([STOCK_HEADER], body(), footer))
+    return [path]
+
+def generate_dataset(data_dir, rows, seed=42, report_rows=None):
+    # Every input analyze_finance reads, at `rows` per bank statement and stock
+    # ledger; the ERP summary reports get report_rows (default rows // 100)
+    os.makedirs(data_dir, exist_ok=True)
+    report_rows = report_rows or max(10, rows // 100)
+    specs = report_specs.REPORT_SPECS
+    written = {}
+    written['kuveyt'] = kuveyt_statement(os.path.join(data_dir, 'Kuveyt Hesap Hareketleri (synthetic).xls'), rows, seed)
+    written['ziraat'] = ziraat_statement(os.path.join(data_dir, 'Ziraat Hesap_Hareketleri_synthetic.xlsx'), rows, seed)
+    written['akbank'] = akbank_statement(os.path.join(data_dir, 'Akbank HesapHareketleri_synthetic.xlsx'), rows, seed)
+    written['sales'] = sales_report(os.path.join(data_dir, specs['Sales']['file']), report_rows, seed)
+    written['purchases'] = sales_report(os.path.join(data_dir, specs['Purchases']['file']), report_rows, seed + 1)
+    written['expenses'] = expense_report(os.path.join(data_dir, specs['Expenses']['file']), report_rows, seed)
+    written['balances'] = balance_report(os.path.join(data_dir, specs['Balances']['file']), report_rows, seed)
+    written['stock_in'] = stock_ledger(os.path.join(data_dir, specs['Stock_In']['file']), rows, True, seed)
+    written['stock_out'] = stock_ledger(os.path.join(data_dir, specs['Stock_Out']['file']), rows, False, seed)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('data_dir')
+    parser.add_argument('--rows', type=int, default=1_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for kind, paths in generate_dataset(args.data_dir, args.rows, args.seed).items():
+        for p in paths:
+            print(f"{kind:<10} {os.path.getsize(p) / 1e6:9.2f} MB  {os.path.basename(p)}")
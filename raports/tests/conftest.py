@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The raports scripts import each other as siblings
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
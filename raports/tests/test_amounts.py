@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import amounts
+
+NAN = float('nan')
+# text -> value, for the pandas path and (when installed) the arrow path alike
+CASES = [
+    ('1.234,56', 1234.56),
+    ('1.234,56 TL', 1234.56),
+    ('₺ 12.345.678,9', 12345678.9),
+    ('(1.234,56)', -1234.56),
+    ('1.234,56-', -1234.56),
+    ('-1.234,56', -1234.56),
+    ('-(5)', -5.0),
+    ('(5-)', -5.0),
+    ('+5', 5.0),
+    ('1,234.56', 1234.56),
+    ('1234,5', 1234.5),
+    ('1.234', 1234.0),
+    ('12.345.678', 12345678.0),
+    ('1234.56', 1234.56),
+    ('0.500', 0.5),
+    ('-0.500', -0.5),
+    ('0,500', 0.5),
+    ('1.23', 1.23),
+    ('.5', 0.5),
+    ('5.', 5.0),
+    ('', NAN),
+    ('-', NAN),
+    ('TL', NAN),
+    ('1.2.3,4.5', NAN),
+    ('1-2', NAN),
+    (None, NAN),
+]
+PATHS = [amounts._parse_pandas] + ([amounts._parse_arrow] if amounts.HAS_ARROW else [])
+
+
+@pytest.mark.parametrize('parse', PATHS, ids=lambda f: f.__name__)
+def test_string_paths(parse):
+    texts, expected = zip(*CASES)
+    got = parse(pd.Series(list(texts), dtype=object))
+    assert got.dtype == 'float64'
+    np.testing.assert_array_equal(got.to_numpy(), np.array(expected), err_msg=str(list(zip(texts, got))))
+
+@pytest.mark.skipif(not amounts.HAS_ARROW, reason="needs pyarrow")
+def test_paths_agree_on_noise():
+    rng = np.random.default_rng(4)
+    texts = [''.join(rng.choice(list('0123456789.,()-+ T'), rng.integers(0, 9))) for _ in range(5000)]
+    series = pd.Series(texts, dtype=object)
+    pd.testing.assert_series_equal(amounts._parse_arrow(series), amounts._parse_pandas(series))
+
+def test_numbers_and_mixed_columns():
+    assert amounts.parse_amounts(pd.Series([1, 2.5])).tolist() == [1.0, 2.5]
+    mixed = amounts.parse_amounts(pd.Series([1200, '1.234,56', None, 3.5], dtype=object))
+    np.testing.assert_array_equal(mixed.to_numpy(), [1200.0, 1234.56, NAN, 3.5])
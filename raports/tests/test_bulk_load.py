@@ -0,0 +1,89 @@
+import datetime
+import os
+import sqlite3
+import time
+import uuid
+
+import pandas as pd
+import pytest
+
+import bulk_load
+import config
+import report_specs
+
+APP_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'prisma', 'dev.db')
+
+
+def empty_app_db(path):
+    # The app's current schema, without its rows
+    source = sqlite3.connect(APP_DB)
+    schema = [sql for (sql,) in source.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'")]
+    source.close()
+    conn = sqlite3.connect(path)
+    for sql in schema:
+        conn.execute(sql)
+    conn.commit()
+    return conn
+
+def seed_like_ts_seeder(conn, data_dir):
+    # What scripts/seed_real_data_from_files.ts writes: legacy_/expense_ parties
+    # (first writer wins an id), cuid-style orders, invoices and items
+    now = int(time.time() * 1000)
+    due = now + 30 * 24 * 3600 * 1000
+    cuid = lambda: uuid.uuid4().hex
+    for report, order_type, status, invoice_type, invoice_status, flag in bulk_load.ORDER_REPORTS:
+        df = report_specs.load_report(report, data_dir)
+        for name, amount in zip(df['Cari hesap adı'], df['Ciro']):
+            if not isinstance(name, str) or not name or pd.isna(amount) or not amount or 'TOPLAM' in name:
+                continue
+            party = bulk_load.seeder_id('legacy', name)
+            conn.execute(f'INSERT OR IGNORE INTO ThirdParty (id, name, "{flag}", createdAt, updatedAt) VALUES (?, ?, 1, ?, ?)', (party, name, now, now))
+            order, invoice = cuid(), cuid()
+            conn.execute('INSERT INTO "Order" (id, type, status, totalAmount, createdAt, updatedAt, thirdPartyId) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                         (order, order_type, status, amount, now, now, party))
+            conn.execute('INSERT INTO OrderItem (id, orderId, quantity, unitPrice) VALUES (?, ?, 1, ?)', (cuid(), order, amount))
+            conn.execute('INSERT INTO Invoice (id, type, thirdPartyId, orderId, status, issueDate, dueDate, totalAmount, paidAmount, createdAt, updatedAt) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                         (invoice, invoice_type, party, order, invoice_status, now, due, amount, amount if invoice_status == 'PAID' else 0, now, now))
+            conn.execute("INSERT INTO InvoiceItem (id, invoiceId, description, quantity, unitPrice, totalPrice) VALUES (?, ?, 'Order Item', 1, ?, ?)",
+                         (cuid(), invoice, amount, amount))
+    df = report_specs.load_report('Expenses', data_dir)
+    for name, amount in zip(df['Hesap adı'], df['TL Borç']):
+        if not isinstance(name, str) or not name or pd.isna(amount) or amount <= 0:
+            continue
+        party, invoice = bulk_load.seeder_id('expense', name), cuid()
+        conn.execute('INSERT OR IGNORE INTO ThirdParty (id, name, isSupplier, createdAt, updatedAt) VALUES (?, ?, 1, ?, ?)', (party, name, now, now))
+        conn.execute("INSERT INTO Invoice (id, type, thirdPartyId, status, issueDate, totalAmount, paidAmount, createdAt, updatedAt) "
+                     "VALUES (?, 'EXPENSE', ?, 'PAID', ?, ?, ?, ?, ?)", (invoice, party, now, amount, amount, now, now))
+        conn.execute('INSERT INTO InvoiceItem (id, invoiceId, description, quantity, unitPrice, totalPrice) VALUES (?, ?, ?, 1, ?, ?)',
+                     (cuid(), invoice, name, amount, amount))
+    conn.commit()
+
+@pytest.fixture
+def data_dir():
+    for report in ('Sales', 'Purchases', 'Expenses'):
+        if not os.path.exists(os.path.join(config.DATA_DIR, report_specs.REPORT_SPECS[report]['file'])):
+            pytest.skip(f"{report} export not in {config.DATA_DIR}")
+    if not os.path.exists(APP_DB):
+        pytest.skip("no prisma/dev.db to take the schema from")
+    return config.DATA_DIR
+
+def test_seeder_id_matches_the_ts_expression():
+    assert bulk_load.seeder_id('legacy', 'ABC  METAL SANAYİ VE TİCARET') == 'legacy_ABC_METAL_SANAYİ_VE_'
+
+def test_run_on_seeded_db_inserts_nothing(tmp_path, data_dir):
+    conn = empty_app_db(tmp_path / 'app.db')
+    seed_like_ts_seeder(conn, data_dir)
+    conn.close()
+    counts = bulk_load.load(str(tmp_path / 'app.db'), data_dir, datetime.datetime.now(), stock=False)
+    added = {name: new for name, (rows, new) in counts.items() if name != 'Warehouse'}
+    assert counts['Order'][0] > 0
+    assert added == {name: 0 for name in added}
+
+def test_rerun_updates_in_place(tmp_path, data_dir):
+    empty_app_db(tmp_path / 'app.db').close()
+    as_of = datetime.datetime(2025, 11, 30)
+    first = bulk_load.load(str(tmp_path / 'app.db'), data_dir, as_of, stock=False)
+    again = bulk_load.load(str(tmp_path / 'app.db'), data_dir, as_of, stock=False)
+    assert all(new == rows for rows, new in first.values())
+    assert all(new == 0 for rows, new in again.values())
@@ -0,0 +1,30 @@
+import pandas as pd
+
+import counterparties
+
+
+def test_equal_keys_are_one_counterparty():
+    index = counterparties.build_index([['AİR LİQUİDE GAZ SANAYİ VE TİCARET ANONİM ŞİRKETİ'],
+                                        ['Air Liquide Gaz Sanayi Ve Ticaret Anonim Şirketi']])
+    assert len(index['keys']) == 1
+
+def test_a_shorter_company_name_is_not_a_truncation():
+    index = counterparties.build_index([['OZTURK METAL KAPLAMA SANAYİ LİMİTED ŞİRKETİ', 'ÖZTÜRK METAL LİMİTED ŞİRKETİ']])
+    assert sorted(index['keys']) == ['OZTURK METAL', 'OZTURK METAL KAPLAMA']
+
+def test_a_name_cut_mid_word_merges():
+    index = counterparties.build_index([['ANLAŞ KALIPMAK OTOMOTİV YAN SANAYİ'], ['ANLAŞ KALIPMAK OTOM']])
+    assert index['keys'] == ['ANLAS KALIPMAK OTOMOTIV YAN']
+    assert index['aliases'] == {'ANLAS KALIPMAK OTOM': 0}
+
+def test_a_name_cut_at_an_export_width_merges():
+    full = 'OZTURK METAL KAPLAMA BURSA'
+    index = counterparties.build_index([[full, full[:20]]])
+    assert index['keys'] == ['OZTURK METAL KAPLAMA BURSA']
+    assert list(counterparties.resolve(index, [full[:20]])) == [full]
+
+def test_resolve_keeps_unknown_names_apart():
+    index = counterparties.build_index([['OZTURK METAL KAPLAMA']])
+    resolved = counterparties.resolve(index, pd.Series(['OZTURK METAL KAPLAMA', 'OZTURK METAL', None]))
+    assert resolved[0] == 'OZTURK METAL KAPLAMA'
+    assert resolved.isna()[1:].all()
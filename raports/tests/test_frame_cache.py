@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+import pytest
+
+import frame_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('RAPORTS_CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+class CountingReader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path, **kwargs):
+        self.calls += 1
+        with open(path) as f:
+            return pd.DataFrame({'text': [f.read()], 'args': [repr(sorted(kwargs.items()))]})
+
+def write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+def cache_files(cache):
+    return sorted(name for name in os.listdir(cache) if not name.endswith('.json'))
+
+def test_second_read_comes_from_the_cache(tmp_path, cache):
+    path, reader = str(tmp_path / 'a.xls'), CountingReader()
+    write(path, 'one')
+    first = frame_cache.cached_read('counting', reader, path)
+    pd.testing.assert_frame_equal(frame_cache.cached_read('counting', reader, path), first)
+    assert reader.calls == 1
+
+def test_touched_file_keeps_its_entry(tmp_path, cache):
+    path, reader = str(tmp_path / 'a.xls'), CountingReader()
+    write(path, 'one')
+    frame_cache.cached_read('counting', reader, path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    frame_cache.cached_read('counting', reader, path)
+    frame_cache.cached_read('counting', reader, path)
+    assert reader.calls == 1
+
+def test_changed_file_is_reread_and_old_variants_evicted(tmp_path, cache):
+    path, reader = str(tmp_path / 'a.xls'), CountingReader()
+    write(path, 'one')
+    frame_cache.cached_read('counting', reader, path)
+    frame_cache.cached_read('counting', reader, path, header=9)
+    assert reader.calls == 2 and len(cache_files(cache)) == 2
+    write(path, 'two!')
+    assert frame_cache.cached_read('counting', reader, path)['text'][0] == 'two!'
+    assert reader.calls == 3 and len(cache_files(cache)) == 1
+
+def test_reader_arguments_are_separate_entries(tmp_path, cache):
+    path, reader = str(tmp_path / 'a.xls'), CountingReader()
+    write(path, 'one')
+    plain = frame_cache.cached_read('counting', reader, path)
+    offset = frame_cache.cached_read('counting', reader, path, header=9)
+    assert plain['args'][0] != offset['args'][0]
+    frame_cache.cached_read('counting', reader, path, header=9)
+    assert reader.calls == 2
+
+def test_damaged_entry_is_rebuilt(tmp_path, cache):
+    path, reader = str(tmp_path / 'a.xls'), CountingReader()
+    write(path, 'one')
+    frame_cache.cached_read('counting', reader, path)
+    for name in cache_files(cache):
+        write(os.path.join(cache, name), 'garbage')
+    assert frame_cache.cached_read('counting', reader, path)['text'][0] == 'one'
+    assert reader.calls == 2
+
+def test_disabled_cache_always_reads(tmp_path, cache, monkeypatch):
+    monkeypatch.setattr(frame_cache, 'ENABLED', False)
+    path, reader = str(tmp_path / 'a.xls'), CountingReader()
+    write(path, 'one')
+    frame_cache.cached_read('counting', reader, path)
+    frame_cache.cached_read('counting', reader, path)
+    assert reader.calls == 2 and not os.path.exists(cache)
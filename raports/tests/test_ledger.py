@@ -0,0 +1,61 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import ingest
+import ledger
+import synthetic
+
+ROWS = 40
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('RAPORTS_CACHE_DIR', str(tmp_path / 'cache'))
+    data = tmp_path / 'data'
+    data.mkdir()
+    synthetic.kuveyt_statement(str(data / 'Kuveyt Hesap Hareketleri (5).xls'), ROWS)
+    return data
+
+def sync(data_dir):
+    conn = ledger.connect(str(data_dir / 'bank_ledger.db'))
+    try:
+        stats = ledger.sync(conn, ingest.bank_jobs(str(data_dir)), workers=1)
+        stats['stored'] = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    finally:
+        conn.close()
+    return stats
+
+def test_first_sync_stores_every_row(data_dir):
+    stats = sync(data_dir)
+    assert (stats['files_parsed'], stats['rows'], stats['new_rows'], stats['stored']) == (1, ROWS, ROWS, ROWS)
+
+def test_unchanged_and_touched_files_are_not_parsed_again(data_dir):
+    sync(data_dir)
+    assert sync(data_dir)['files_parsed'] == 0
+    path = data_dir / 'Kuveyt Hesap Hareketleri (5).xls'
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    stats = sync(data_dir)
+    assert (stats['files_parsed'], stats['stored']) == (0, ROWS)
+
+def test_overlapping_export_adds_no_rows(data_dir):
+    sync(data_dir)
+    shutil.copy(data_dir / 'Kuveyt Hesap Hareketleri (5).xls', data_dir / 'Kuveyt kasım Hesap Hareketleri (6).xls')
+    stats = sync(data_dir)
+    assert (stats['files_parsed'], stats['new_rows'], stats['duplicate_rows'], stats['stored']) == (1, 0, ROWS, ROWS)
+
+def test_changed_file_adds_only_its_new_rows(data_dir):
+    sync(data_dir)
+    synthetic.kuveyt_statement(str(data_dir / 'Kuveyt Hesap Hareketleri (5).xls'), ROWS, seed=7)
+    stats = sync(data_dir)
+    assert stats['files_parsed'] == 1
+    assert stats['stored'] == ROWS + stats['new_rows'] and stats['new_rows'] > 0
+
+def test_fingerprint_ignores_description_case_and_spacing():
+    df = pd.DataFrame({'bank': 'Kuveyt', 'date': pd.to_datetime(['2025-11-03'] * 2), 'amount_kurus': [100, 100],
+                       'description': ['EFT  fkt koltuk', 'EFT FKT KOLTUK'], 'balance_kurus': pd.array([None, None], dtype='Int64')})
+    first, second = ledger.fingerprints(df)
+    assert first == second
@@ -0,0 +1,51 @@
+import pytest
+
+import readers
+import synthetic
+
+HTML_TABLE = '<table><tr><th>Tarih</th><th>Tutar</th></tr><tr><td>03.11.2025</td><td>1.234,56</td></tr></table>'
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('RAPORTS_CACHE_DIR', str(tmp_path / 'cache'))
+
+def write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+@pytest.mark.parametrize('name, data, expected', [
+    ('statement.xls', readers.ZIP_MAGIC + b'rest', (readers.XLSX, True)),
+    ('statement.xlsx', readers.OLE2_MAGIC + b'rest', (readers.XLS, True)),
+    ('statement.xls', b'\xef\xbb\xbf  <table>', (readers.HTML, True)),
+    ('statement.xlsx', '<html>'.encode('utf-16'), (readers.HTML, True)),
+    ('statement.xls', b'plain text', (readers.XLS, False)),
+    ('statement.txt', b'plain text', (readers.UNKNOWN, False)),
+])
+def test_sniff_trusts_content_over_extension(tmp_path, name, data, expected):
+    assert readers.sniff(write_bytes(tmp_path / name, data)) == expected
+
+def test_html_saved_as_xls_goes_straight_to_read_html(tmp_path):
+    path = write_bytes(tmp_path / 'Kuveyt.xls', HTML_TABLE.encode('utf-8'))
+    frames, info = readers.read_table(path)
+    assert (info['parser'], info['misdetected'], info['wasted_seconds']) == (readers.HTML, False, 0.0)
+    assert list(frames[0].columns) == ['Tarih', 'Tutar']
+
+def test_real_workbook_is_read_with_openpyxl(tmp_path):
+    path = str(tmp_path / 'Ziraat.xlsx')
+    synthetic.ziraat_statement(path, 5)
+    frames, info = readers.read_table(path, header=None)
+    assert (info['sniffed'], info['by_magic'], info['parser']) == (readers.XLSX, True, readers.XLSX)
+    assert len(frames[0]) >= 5
+
+def test_extension_guess_falls_back_to_the_next_parser(tmp_path):
+    # Text before the markup hides it from the sniffer; xlrd fails, read_html does not
+    path = write_bytes(tmp_path / 'Kuveyt.xls', b'Hesap Hareketleri\n' + HTML_TABLE.encode('utf-8'))
+    frames, info = readers.read_table(path)
+    assert (info['sniffed'], info['by_magic'], info['parser'], info['misdetected']) == (readers.XLS, False, readers.HTML, True)
+    assert list(frames[0].columns) == ['Tarih', 'Tutar']
+
+def test_nothing_parses_raises_the_first_error(tmp_path):
+    with pytest.raises(Exception):
+        readers.read_table(write_bytes(tmp_path / 'export.dat', b'no table here'))
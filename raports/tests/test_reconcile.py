@@ -0,0 +1,66 @@
+import pandas as pd
+
+import reconcile
+
+
+def make_payments(rows):
+    df = pd.DataFrame(rows, columns=['payment_id', 'invoice_type', 'counterparty', 'amount', 'date'])
+    df['invoice_id'] = 'i_' + df['payment_id']
+    df['date'] = pd.to_datetime(df['date'])
+    df['amount_kurus'] = reconcile.signed_kurus(df)
+    return df
+
+def make_bank(rows):
+    df = pd.DataFrame(rows, columns=['description', 'amount', 'date'])
+    df['bank'] = 'Akbank'
+    df['date'] = pd.to_datetime(df['date'])
+    df['amount_kurus'] = (df['amount'] * 100).round().astype('int64')
+    return df
+
+def by_description(lines):
+    return lines.set_index('description')
+
+def test_payments_are_signed_by_invoice_type():
+    payments = make_payments([('p1', 'SALES', 'A', 10.5, '2025-11-03'), ('p2', 'PURCHASE', 'B', 10.5, '2025-11-03'),
+                              ('p3', 'EXPENSE', 'C', 7, '2025-11-03'), ('p4', 'CREDIT', 'D', 7, '2025-11-03')])
+    assert payments['amount_kurus'].tolist()[:3] == [1050, -1050, -700]
+    assert pd.isna(payments['amount_kurus'][3])
+
+def test_direction_must_match_as_well_as_amount():
+    payments = make_payments([('p1', 'SALES', 'FKT KOLTUK', 1000, '2025-11-03'), ('p2', 'PURCHASE', 'KAWELCO METAL', 1000, '2025-11-03')])
+    bank = make_bank([('GELEN EFT', 1000, '2025-11-04'), ('GIDEN EFT', -1000, '2025-11-04')])
+    lines, unmatched = reconcile.reconcile(bank, payments)
+    lines = by_description(lines)
+    assert lines.loc['GELEN EFT', 'payment_id'] == 'p1'
+    assert lines.loc['GIDEN EFT', 'payment_id'] == 'p2'
+    assert unmatched.empty
+
+def test_expense_payments_match_money_out():
+    payments = make_payments([('p1', 'EXPENSE', 'ELEKTRIK', 250, '2025-11-03')])
+    lines, unmatched = reconcile.reconcile(make_bank([('FATURA ODEME', -250, '2025-11-03')]), payments)
+    assert lines['status'].tolist() == ['matched']
+    assert unmatched.empty
+
+def test_names_break_ties_and_dates_bound_the_search():
+    payments = make_payments([('p1', 'SALES', 'FKT KOLTUK', 500, '2025-11-03'), ('p2', 'SALES', 'KAWELCO METAL', 500, '2025-11-03'),
+                              ('p3', 'SALES', 'EMPO OTOMOTIV', 500, '2025-10-01')])
+    bank = make_bank([('EFT KAWELCO METAL', 500, '2025-11-05'), ('EFT', 500, '2025-11-05')])
+    lines, unmatched = reconcile.reconcile(bank, payments)
+    lines = by_description(lines)
+    assert (lines.loc['EFT KAWELCO METAL', 'status'], lines.loc['EFT KAWELCO METAL', 'payment_id']) == ('matched', 'p2')
+    assert lines.loc['EFT', 'status'] == 'matched' and lines.loc['EFT', 'basis'] == 'amount+date'
+    assert unmatched['payment_id'].tolist() == ['p3']
+
+def test_equal_candidates_are_ambiguous():
+    payments = make_payments([('p1', 'SALES', 'FKT KOLTUK', 500, '2025-11-03'), ('p2', 'SALES', 'KAWELCO METAL', 500, '2025-11-03')])
+    lines, unmatched = reconcile.reconcile(make_bank([('EFT', 500, '2025-11-03')]), payments)
+    assert lines['status'].tolist() == ['ambiguous']
+    assert len(unmatched) == 2
+
+def test_unknown_types_are_reported_not_dropped():
+    payments = make_payments([('p1', 'SALES', 'FKT KOLTUK', 500, '2025-11-03'), ('p2', 'CREDIT', 'FKT KOLTUK', 80, '2025-11-03')])
+    lines, unmatched = reconcile.reconcile(make_bank([('EFT FKT KOLTUK', 500, '2025-11-03')]), payments)
+    assert unmatched[['payment_id', 'reason']].values.tolist() == [['p2', 'unknown invoice type']]
+    summary = reconcile.summary_lines(lines, unmatched)
+    assert "- **ERP payments without a bank line**: 0, 0.00 TL" in summary
+    assert "- **ERP payments not reconciled, unknown invoice type**: 1, 80.00 TL (invoice types: CREDIT)" in summary
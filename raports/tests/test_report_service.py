@@ -0,0 +1,13 @@
+import json
+
+import report_service
+
+
+def test_routes_without_bank_statements(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_service, 'DATA_DIR', str(tmp_path))
+    status, _, body = report_service.answer('/report', {})
+    assert status == 200
+    assert report_service.NO_BANK_DATA in body.splitlines()
+    for path in ('/cash-flow', '/cube'):
+        status, _, body = report_service.answer(path, {})
+        assert (status, json.loads(body)) == (404, {'error': 'Bank data not loaded'})
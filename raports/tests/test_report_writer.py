@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregate
+import report_writer
+
+FRAME = pd.DataFrame({'Hesap adı': ['ELEKTRİK', 'KİRA', 'AİDAT'], 'TL Borç': [1234567.891, -0.004, np.nan]})
+
+
+def read(path, encoding='utf-8'):
+    with open(path, encoding=encoding, newline='') as f:
+        return f.read()
+
+@pytest.mark.parametrize('value', [0.0, -0.0, 2.675, 1.005, -1234.5, 1e16, 123456789.125, 0.125])
+def test_format_amounts_is_format(value):
+    assert aggregate.format_amounts([value])[0] == f"{value:,.2f}"
+    assert aggregate.format_amounts([value], locale='tr')[0] == f"{value:,.2f}".translate(str.maketrans(',.', '.,'))
+
+def test_format_amounts_leaves_missing_values_empty():
+    assert aggregate.format_amounts([np.nan, None, 'x', 5]).tolist() == ['', '', '', '5.00']
+
+def test_markdown_matches_markdown_table(tmp_path):
+    path = str(tmp_path / 'list.md')
+    report_writer.write(report_writer.chunks_of(FRAME, rows=2), [path], columns=list(FRAME.columns), amount_cols=['TL Borç'],
+                        preamble=['# Expenses', ''], footer=['', 'end'])
+    table = aggregate.markdown_table(FRAME, list(FRAME.columns), amount_cols=['TL Borç'])
+    assert read(path) == "\n".join(['# Expenses', ''] + table + ['', 'end'])
+    assert table[2:] == ['| ELEKTRİK | 1,234,567.89 |', '| KİRA | -0.00 |', '| AİDAT |  |']
+
+def test_turkish_csv(tmp_path):
+    path = str(tmp_path / 'list.csv')
+    report_writer.write([FRAME], [path], columns=list(FRAME.columns), amount_cols=['TL Borç'], locale='tr')
+    assert read(path, 'utf-8-sig') == "Hesap adı;TL Borç\r\nELEKTRİK;1.234.567,89\r\nKİRA;-0,00\r\nAİDAT;\r\n"
+
+def test_xlsx_keeps_numbers(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    path = str(tmp_path / 'list.xlsx')
+    report_writer.write([FRAME], [path], columns=list(FRAME.columns), amount_cols=['TL Borç'], preamble=['# Expenses'])
+    rows = list(openpyxl.load_workbook(path).active.values)
+    assert rows[:3] == [('Expenses', None), ('Hesap adı', 'TL Borç'), ('ELEKTRİK', 1234567.891)]
+    assert rows[4] == ('AİDAT', None)
+
+@pytest.mark.skipif(not report_writer.HAS_PARQUET, reason="needs pyarrow")
+def test_parquet_round_trip(tmp_path):
+    path = str(tmp_path / 'list.parquet')
+    report_writer.write(report_writer.chunks_of(FRAME, rows=2), [path], columns=list(FRAME.columns), headers=['Account', 'Debit'])
+    back = pd.read_parquet(path)
+    assert list(back.columns) == ['Account', 'Debit']
+    pd.testing.assert_series_equal(back['Debit'], FRAME['TL Borç'].rename('Debit'))
+
+def test_unknown_extension_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        report_writer.write([FRAME], [str(tmp_path / 'list.txt')], columns=list(FRAME.columns))
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+import stock_snapshots
+
+
+def movements(rows):
+    return pd.DataFrame(rows, columns=['item', 'warehouse', 'lot', 'date', 'kind', 'quantity', 'value']).assign(
+        date=lambda df: pd.to_datetime(df['date']))
+
+def as_dict(balances):
+    return {tuple(k): (q, v) for *k, q, v in balances[stock_snapshots.KEYS + ['quantity', 'value']].itertuples(index=False)}
+
+def replay(mv):
+    # Row by row in date order, the definition roll_forward must agree with
+    out = {}
+    for row in mv.sort_values('date', kind='stable').itertuples(index=False):
+        key = (row.item, row.warehouse, row.lot)
+        q, v = out.get(key, (0.0, 0.0))
+        out[key] = (row.quantity if row.kind == 'set' else q + row.quantity, v + row.value)
+    return out
+
+def test_deltas_add_and_sets_replace():
+    base = pd.DataFrame({'item': ['A', 'B'], 'warehouse': '', 'lot': '', 'quantity': [10.0, 5.0], 'value': [100.0, 50.0]})
+    mv = movements([
+        ('A', '', '', '2025-11-02', 'delta', 3.0, 30.0),
+        ('B', '', '', '2025-11-01', 'delta', 4.0, 0.0),
+        ('B', '', '', '2025-11-03', 'set', 2.0, 0.0),
+        ('B', '', '', '2025-11-04', 'delta', -1.0, 0.0),
+        ('C', '', '', '2025-11-05', 'delta', 7.0, 70.0),
+    ])
+    assert as_dict(stock_snapshots.roll_forward(base, mv)) == {
+        ('A', '', ''): (13.0, 130.0), ('B', '', ''): (1.0, 50.0), ('C', '', ''): (7.0, 70.0)}
+    assert stock_snapshots.roll_forward(base, mv.iloc[:0]) is base
+
+def random_movements(rows, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'item': rng.choice(['A', 'B', 'C', 'D'], rows),
+        'warehouse': rng.choice(['W1', 'W2'], rows),
+        'lot': '',
+        'date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 300, rows), unit='D'),
+        'kind': np.where(rng.random(rows) < 0.1, 'set', 'delta'),
+        'quantity': rng.integers(-20, 50, rows).astype(float),
+        'value': rng.integers(0, 9, rows).astype(float),
+    })
+
+def test_snapshots_plus_deltas_match_a_full_replay(tmp_path):
+    mv = random_movements(600)
+    conn = stock_snapshots.connect(str(tmp_path / 'snapshots.db'))
+    try:
+        stock_snapshots.roll_and_snapshot(conn, 'test', None, mv[mv['date'] <= '2025-08-31'], '2025-08-31')
+        cutoffs = [c for (c,) in conn.execute("SELECT cutoff FROM snapshots WHERE source = 'test' ORDER BY cutoff")]
+        assert cutoffs[-1] == '2025-08-31' and '2025-03-31' in cutoffs
+        for when in ('2025-02-14', '2025-08-31', '2025-10-20'):
+            got = stock_snapshots.balances_as_of(conn, 'test', when, lambda after, until: stock_snapshots.between(mv, after, until))
+            expected = replay(mv[mv['date'] <= when])
+            assert as_dict(got).keys() == expected.keys()
+            for key, (q, v) in as_dict(got).items():
+                assert np.isclose(q, expected[key][0]) and np.isclose(v, expected[key][1]), (when, key)
+    finally:
+        conn.close()
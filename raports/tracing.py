@@ -0,0 +1,208 @@
+import cProfile
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+import pandas as pd
+
+# Opt-in stage instrumentation for the raports pipeline. Switched on by
+# environment variables, so worker processes inherit it:
+#
+#   RAPORTS_TRACE=path.json   record stages and write a Chrome trace (open in
+#                             chrome://tracing or ui.perfetto.dev); '1' writes
+#                             raports_trace.json in the current directory
+#   RAPORTS_PROFILE=dir       also run each top-level stage under cProfile and
+#                             dump <stage>-<pid>-<n>.prof files into dir
+#
+# When RAPORTS_TRACE is unset, stage() hands back one shared no-op object and
+# traced() returns the function unchanged, so the hooks cost next to nothing.
+#
+# Each stage records wall and CPU time, rows in/out (set by the caller),
+# bytes read (caller-supplied, else the process's /proc read counter) and the
+# process's peak RSS. Stages run in worker processes travel back with the job
+# result (drain/merge) and land in the same trace under their own pid.
+
+_trace_env = os.environ.get('RAPORTS_TRACE', '')
+ENABLED = _trace_env not in ('', '0')
+TRACE_FILE = 'raports_trace.json' if _trace_env == '1' else _trace_env
+PROFILE_DIR = os.environ.get('RAPORTS_PROFILE') if ENABLED else None
+
+EVENTS = []
+_local = threading.local()
+_profile_count = [0]
+
+
+def _reset_after_fork():
+    # A forked worker starts with a copy of the parent's events and stage depth;
+    # drop them so drain() only hands back what the worker itself recorded
+    del EVENTS[:]
+    _local.depth = 0
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # High-water mark of the whole process (or of its waited-for children),
+    # never reset: what a step adds is the growth over the step, not the value
+    # after it. ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+def _bytes_read():
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class _NoopStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+NOOP = _NoopStage()
+
+
+class Stage:
+    def __init__(self, name, category, fields):
+        self.name = name
+        self.category = category
+        self.fields = dict(fields)
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.depth = getattr(_local, 'depth', 0)
+        _local.depth = self.depth + 1
+        self.profiler = None
+        if PROFILE_DIR and self.depth == 0:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.ts_us = time.time_ns() // 1000
+        self.io_start = _bytes_read()
+        self.rss_start = peak_rss_mb()
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        if self.profiler:
+            self.profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            _profile_count[0] += 1
+            safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in self.name)
+            self.profiler.dump_stats(os.path.join(PROFILE_DIR, f"{safe}-{os.getpid()}-{_profile_count[0]}.prof"))
+        _local.depth = self.depth
+
+        args = dict(self.fields)
+        if 'bytes_read' not in args and self.io_start is not None:
+            args['bytes_read'] = _bytes_read() - self.io_start
+        args.update(wall_s=wall, cpu_s=cpu, rss_growth_mb=peak_rss_mb() - self.rss_start)
+        if exc_type is not None:
+            args['error'] = f"{exc_type.__name__}: {exc}"
+        EVENTS.append({
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': self.ts_us,
+            'dur': int(wall * 1e6),
+            'pid': os.getpid(),
+            'tid': threading.get_ident() % 1_000_000,
+            'args': args,
+        })
+        return False
+
+def stage(name, category='stage', **fields):
+    if not ENABLED:
+        return NOOP
+    return Stage(name, category, fields)
+
+def traced(name=None, category='stage'):
+    # Decorator form. DataFrame results and dicts of them get rows_out filled in.
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with Stage(label, category, {}) as s:
+                result = fn(*args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    s.set(rows_out=len(result))
+                elif isinstance(result, dict):
+                    s.set(rows_out=sum(len(v) for v in result.values() if isinstance(v, pd.DataFrame)))
+                return result
+        return inner
+    return wrap
+
+def drain():
+    # Hand this process's events to the caller (a worker returning them with
+    # its job result) and forget them here
+    if not ENABLED:
+        return None
+    events = EVENTS[:]
+    del EVENTS[:]
+    return events
+
+def merge(events):
+    if events:
+        EVENTS.extend(events)
+
+def summary(events=None):
+    events = EVENTS if events is None else events
+    if not events:
+        return pd.DataFrame()
+    rows = [{'stage': e['name'], 'pid': e['pid'], **e['args']} for e in events]
+    df = pd.DataFrame(rows)
+    for col in ('rows_in', 'rows_out', 'bytes_read'):
+        if col not in df.columns:
+            df[col] = pd.NA
+    table = df.groupby('stage', sort=False).agg(
+        calls=('wall_s', 'size'),
+        wall_s=('wall_s', 'sum'),
+        cpu_s=('cpu_s', 'sum'),
+        rows_in=('rows_in', lambda r: pd.to_numeric(r).sum(min_count=1)),
+        rows_out=('rows_out', lambda r: pd.to_numeric(r).sum(min_count=1)),
+        mb_read=('bytes_read', lambda b: pd.to_numeric(b).sum() / 1e6),
+        rss_growth_mb=('rss_growth_mb', 'max'),
+    )
+    for col in ('rows_in', 'rows_out'):
+        table[col] = table[col].round().astype('Int64')
+    return table.sort_values('wall_s', ascending=False).reset_index()
+
+def write_trace(path=None):
+    path = path or TRACE_FILE
+    meta = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'main' if pid == os.getpid() else f"worker {pid}"}}
+            for pid in sorted({e['pid'] for e in EVENTS})]
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': meta + EVENTS, 'displayTimeUnit': 'ms'}, f, default=str)
+    return path
+
+def finish():
+    # Write the trace and print the summary; call at the end of a script run
+    if not ENABLED or not EVENTS:
+        return
+    path = write_trace()
+    print(f"\nStage timings (trace written to {path}):")
+    table = summary()
+    for col in ('rows_in', 'rows_out'):
+        table[col] = table[col].map(lambda v: '-' if pd.isna(v) else f"{int(v):,}")
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
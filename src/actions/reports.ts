@@ -289,3 +289,22 @@ export async function getStockMovements() {
         quantity: m.quantity
     }))
 }
+
+export async function getBankCashFlow() {
+    // Per-bank totals from the raports report service (raports/report_service.py),
+    // which keeps the parsed bank statements in memory. Empty if it isn't running.
+    const baseUrl = process.env.RAPORTS_SERVICE_URL || 'http://127.0.0.1:8765'
+
+    try {
+        const res = await fetch(`${baseUrl}/cash-flow`, { cache: 'no-store' })
+        if (!res.ok) return []
+        const totals: { bank: string, rows: number, inflow: number, outflow: number, first_date: string, last_date: string }[] = await res.json()
+        return totals.map(t => ({
+            name: t.bank,
+            income: t.inflow,
+            expense: t.outflow
+        }))
+    } catch {
+        return []
+    }
+}
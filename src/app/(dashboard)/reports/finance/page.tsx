@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
-import { getFinancialSummary, getCashFlow, getAgingReport } from "@/actions/reports"
+import { getFinancialSummary, getCashFlow, getAgingReport, getBankCashFlow } from "@/actions/reports"
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts'
 import { formatCurrency } from "@/lib/utils"
 
@@ -10,18 +10,21 @@ export default function FinancialReportsPage() {
     const [summary, setSummary] = useState<{ revenue: number, expenses: number, profit: number } | null>(null)
     const [cashFlow, setCashFlow] = useState<{ name: string, income: number, expense: number }[]>([])
     const [aging, setAging] = useState<{ name: string, amount: number }[]>([])
+    const [bankFlow, setBankFlow] = useState<{ name: string, income: number, expense: number }[]>([])
     const [loading, setLoading] = useState(true)
 
     useEffect(() => {
         async function fetchData() {
-            const [sum, flow, age] = await Promise.all([
+            const [sum, flow, age, bank] = await Promise.all([
                 getFinancialSummary(),
                 getCashFlow(),
-                getAgingReport()
+                getAgingReport(),
+                getBankCashFlow()
             ])
             setSummary(sum)
             setCashFlow(flow)
             setAging(age)
+            setBankFlow(bank)
             setLoading(false)
         }
         fetchData()
@@ -116,6 +119,28 @@ export default function FinancialReportsPage() {
                         </ResponsiveContainer>
                     </CardContent>
                 </Card>
+
+                {/* Bank Cash Flow Chart (only when the raports report service is running) */}
+                {bankFlow.length > 0 && (
+                    <Card className="col-span-2">
+                        <CardHeader>
+                            <CardTitle>Banka Nakit Akışı (Hesap Hareketleri)</CardTitle>
+                        </CardHeader>
+                        <CardContent className="h-[400px]">
+                            <ResponsiveContainer width="100%" height="100%">
+                                <BarChart data={bankFlow} margin={{ top: 20, right: 30, left: 20, bottom: 5 }}>
+                                    <CartesianGrid strokeDasharray="3 3" />
+                                    <XAxis dataKey="name" />
+                                    <YAxis tickFormatter={(value) => `₺${value / 1000}k`} />
+                                    <Tooltip formatter={(value: number | undefined) => formatCurrency(value || 0)} />
+                                    <Legend />
+                                    <Bar dataKey="income" name="Giriş" fill="#10b981" />
+                                    <Bar dataKey="expense" name="Çıkış" fill="#ef4444" />
+                                </BarChart>
+                            </ResponsiveContainer>
+                        </CardContent>
+                    </Card>
+                )}
             </div>
         </div>
     )